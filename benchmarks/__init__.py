@@ -0,0 +1,4 @@
+"""Client-side benchmarks for the MeiliSearch python client.
+
+Run them from the repository root, ex: `python -m benchmarks.bench_connection_pool`.
+"""
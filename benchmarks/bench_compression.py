@@ -0,0 +1,54 @@
+"""
+CPU time against bytes sent when compressing document batches.
+
+    python -m benchmarks.bench_compression --documents 1000 --bandwidth 100
+
+The estimated upload time adds the compression time to the transfer time of the
+compressed body at `--bandwidth` megabits per second.
+"""
+
+import argparse
+from meilisearch.compression import ENCODINGS, RequestCompression
+from meilisearch.json_codec import get_codec
+from benchmarks.utils import best_time, load_documents
+
+def run(documents=1000, repeat=5, bandwidth=100, levels=(1, 3, 6, 9)):
+    payload = get_codec().dumps(load_documents(documents))
+    bytes_per_second = bandwidth * 1000000 / 8
+    results = {'none': {
+        'bytes': len(payload),
+        'ratio': 1.0,
+        'compress_ms': 0.0,
+        'upload_ms': len(payload) / bytes_per_second * 1000,
+    }}
+    for encoding in ENCODINGS:
+        for level in levels:
+            compression = RequestCompression(encoding, level=level, min_size=0)
+            size = len(compression.compress(payload))
+            seconds = best_time(lambda compression=compression: compression.compress(payload), repeat)
+            results['{} level {}'.format(encoding, level)] = {
+                'bytes': size,
+                'ratio': size / len(payload),
+                'compress_ms': seconds * 1000,
+                'upload_ms': (seconds + size / bytes_per_second) * 1000,
+            }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Request body compression benchmark')
+    parser.add_argument('--documents', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--bandwidth', type=float, default=100, help='megabits per second')
+    args = parser.parse_args()
+    print('Compression of a batch of {} documents, upload at {} Mbit/s'.format(args.documents, args.bandwidth))
+    for name, result in run(args.documents, args.repeat, args.bandwidth).items():
+        print('  {:<16} {:>10} bytes   ratio {:5.3f}   compress {:8.2f} ms   upload {:8.2f} ms'.format(
+            name,
+            result['bytes'],
+            result['ratio'],
+            result['compress_ms'],
+            result['upload_ms'],
+        ))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Per-request latency with a fresh connection per request versus the pooled
+keep-alive session shared by `Client` and its indexes.
+
+    python -m benchmarks.bench_connection_pool --url http://127.0.0.1:7700 --key masterKey
+"""
+
+import argparse
+import requests
+import meilisearch
+from benchmarks.utils import measure, print_table
+
+def run(url, api_key, iterations=500):
+    client = meilisearch.Client(url, api_key)
+    index = client.get_or_create_index('bench_connection_pool')
+    update = index.add_documents([{'id': 1, 'title': 'Le Petit Prince'}])
+    index.wait_for_pending_update(update['updateId'])
+    search_url = '{}/indexes/{}/search'.format(url, index.uid)
+    headers = {'X-Meili-Api-Key': api_key, 'Content-Type': 'application/json'}
+
+    def unpooled_search():
+        # What every call did before the shared session: a new TCP connection each time
+        requests.post(search_url, headers=headers, json={'q': 'prince'}).raise_for_status()
+
+    def pooled_search():
+        index.search('prince')
+
+    results = {
+        'new connection per request': measure(unpooled_search, iterations),
+        'pooled keep-alive session': measure(pooled_search, iterations),
+    }
+    index.delete()
+    client.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Connection pooling benchmark')
+    parser.add_argument('--url', default='http://127.0.0.1:7700')
+    parser.add_argument('--key', default='masterKey')
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+    print_table('search latency', run(args.url, args.key, args.iterations))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Encode and decode time of the JSON codecs on large document batches.
+
+    python -m benchmarks.bench_json_codec --documents 10000
+"""
+
+import argparse
+from meilisearch.json_codec import CODECS
+from benchmarks.utils import best_time, load_documents
+
+def run(documents=10000, repeat=5):
+    batch = load_documents(documents)
+    results = {}
+    for name, codec_class in CODECS.items():
+        try:
+            codec = codec_class()
+        except ImportError:
+            continue
+        payload = codec.dumps(batch)
+        encode = best_time(lambda codec=codec: codec.dumps(batch), repeat)
+        decode = best_time(lambda codec=codec, payload=payload: codec.loads(payload), repeat)
+        results[name] = {
+            'documents': documents,
+            'bytes': len(payload),
+            'encode_ms': encode * 1000,
+            'decode_ms': decode * 1000,
+            'encode_mb_per_second': len(payload) / 1000000 / encode,
+            'decode_mb_per_second': len(payload) / 1000000 / decode,
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON codec benchmark')
+    parser.add_argument('--documents', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print('JSON codecs, batch of {} documents'.format(args.documents))
+    for name, result in run(args.documents, args.repeat).items():
+        print('  {:<8} {:>10} bytes   encode {:8.2f} ms ({:7.1f} MB/s)   decode {:8.2f} ms ({:7.1f} MB/s)'.format(
+            name,
+            result['bytes'],
+            result['encode_ms'],
+            result['encode_mb_per_second'],
+            result['decode_ms'],
+            result['decode_mb_per_second'],
+        ))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Client-side throughput and latency of the main operations, saved as JSON.
+
+    python -m benchmarks.bench_suite --output results.json
+    python -m benchmarks.bench_suite --baseline results.json
+
+By default the operations run against the stand-in server (benchmarks/stand_in_server.py),
+started in a separate process with `--latency` seconds added to every request, so the
+results measure the client itself. Pass `--url` to run against a MeiliSearch instance.
+With `--baseline`, the results are compared to a previous run, and the operations whose
+p50 latency grew by more than `--threshold` are reported as regressions.
+"""
+
+import argparse
+import json
+import platform
+import socket
+import subprocess
+import sys
+import time
+import requests
+import meilisearch
+from benchmarks.utils import load_documents, measure, print_table
+
+INDEX_UID = 'bench_suite'
+
+def client_version():
+    """Installed version of the client, to tell the results of the releases apart"""
+    try:
+        from importlib import metadata # pylint: disable=import-outside-toplevel
+        return metadata.version('meilisearch')
+    except ImportError: # Python < 3.8
+        return 'unknown'
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_stand_in(api_key, latency, update_latency):
+    """Start the stand-in server in its own process, so it does not share the GIL of the client"""
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, '-m', 'benchmarks.stand_in_server',
+        '--port', str(port),
+        '--master-key', api_key,
+        '--latency', str(latency),
+        '--update-latency', str(update_latency),
+    ], stdout=subprocess.DEVNULL)
+    url = 'http://127.0.0.1:{}'.format(port)
+    for _ in range(100):
+        try:
+            requests.get(url + '/health', timeout=0.1)
+            return process, url
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError('The stand-in server did not start')
+
+def bench_search(index, iterations):
+    queries = ['dragon', 'the', 'prince', 'love', 'war']
+    position = [0]
+    def search():
+        index.search(queries[position[0] % len(queries)], {'limit': 20})
+        position[0] += 1
+    return measure(search, iterations)
+
+def bench_add_documents(index, documents, batch_size, iterations):
+    batches = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+    position = [0]
+    def add():
+        index.add_documents(batches[position[0] % len(batches)])
+        position[0] += 1
+    summary = measure(add, iterations, warmup=1)
+    summary['documents_per_second'] = summary['ops_per_second'] * batch_size
+    return summary
+
+def bench_scan(index, repeat):
+    count = [0]
+    def scan():
+        count[0] = sum(1 for _ in index.iter_documents(batch_size=1000))
+    summary = measure(scan, repeat, warmup=1)
+    summary['documents_per_second'] = summary['ops_per_second'] * count[0]
+    return summary
+
+def bench_wait(index, iterations, interval_in_ms):
+    def add_and_wait():
+        update = index.add_documents([{'id': 'wait', 'title': 'Waiting'}])
+        index.wait_for_pending_update(update['updateId'], timeout_in_ms=60000, interval_in_ms=interval_in_ms)
+    return measure(add_and_wait, iterations, warmup=1)
+
+def run(url, api_key, documents=5000, iterations=200, batch_sizes=(10, 100, 1000), interval_in_ms=50):
+    client = meilisearch.Client(url, api_key)
+    index = client.get_or_create_index(INDEX_UID, {'primaryKey': 'id'})
+    corpus = load_documents(documents)
+    for batch in range(0, len(corpus), 1000):
+        update = index.add_documents(corpus[batch:batch + 1000])
+    index.wait_for_pending_update(update['updateId'], timeout_in_ms=600000)
+    results = {'search': bench_search(index, iterations)}
+    for batch_size in batch_sizes:
+        results['add_documents batch {}'.format(batch_size)] = bench_add_documents(
+            index, corpus, batch_size, max(1, min(iterations, documents // batch_size))
+        )
+    results['get_documents scan'] = bench_scan(index, max(1, iterations // 40))
+    results['wait_for_pending_update'] = bench_wait(index, max(1, iterations // 10), interval_in_ms)
+    index.delete()
+    client.close()
+    return results
+
+def compare(results, baseline, threshold):
+    """Operations whose p50 latency grew by more than `threshold` since the baseline, with the ratio"""
+    regressions = {}
+    for name, summary in results.items():
+        previous = baseline.get(name)
+        if previous and previous['p50_ms'] and summary['p50_ms'] / previous['p50_ms'] > 1 + threshold:
+            regressions[name] = summary['p50_ms'] / previous['p50_ms']
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Client benchmark suite')
+    parser.add_argument('--url', default=None, help='MeiliSearch URL, instead of the stand-in server')
+    parser.add_argument('--key', default='masterKey')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added by the stand-in to every request')
+    parser.add_argument('--update-latency', type=float, default=0.01,
+                        help='seconds before the stand-in processes an update')
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--output', default=None, help='JSON file the results are saved to')
+    parser.add_argument('--baseline', default=None, help='JSON file of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1, help='p50 growth reported as a regression')
+    args = parser.parse_args()
+    process = None
+    url = args.url
+    if url is None:
+        process, url = start_stand_in(args.key, args.latency, args.update_latency)
+    try:
+        results = run(url, args.key, args.documents, args.iterations)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    print_table('client operations', results)
+    report = {
+        'meta': {
+            'client': client_version(),
+            'python': platform.python_version(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'server': 'stand-in' if args.url is None else args.url,
+            'latency': args.latency,
+            'updateLatency': args.update_latency,
+            'documents': args.documents,
+            'iterations': args.iterations,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline['results'], args.threshold)
+        for name, ratio in regressions.items():
+            print('  regression: {} p50 x{:.2f} since {}'.format(name, ratio, baseline['meta']['client']))
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
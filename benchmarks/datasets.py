@@ -0,0 +1,169 @@
+"""
+Deterministic synthetic datasets with the schema of datasets/small_movies.json.
+
+    python -m benchmarks.datasets --documents 1000000 --output movies_1m.ndjson.gz
+
+The documents have the fields of the sample movies (id, title, poster, overview,
+release_date, genre). Their words are drawn from the vocabulary of the sample,
+extended to `--vocabulary` words, with a Zipf distribution like natural text;
+`--genres` sets the number of distinct genres and `--overview-words` the size of
+the documents (about 170 bytes of JSON plus 6 bytes per word). The same options and seed
+always produce the same documents, so a dataset can be generated again instead of
+being shipped. The output is NDJSON, or a JSON array for a `.json` path, gzipped
+when the path ends with `.gz`.
+"""
+
+import argparse
+import gzip
+import itertools
+import json
+import random
+import re
+
+SAMPLE_PATH = './datasets/small_movies.json'
+
+POSTER_URL = 'https://image.tmdb.org/t/p/w1280/{}.jpg'
+
+def sample_schema(path=SAMPLE_PATH):
+    """Vocabulary (most frequent words first), genres and release date range of the sample dataset"""
+    with open(path, 'r') as sample_file:
+        movies = json.load(sample_file)
+    counts = {}
+    for movie in movies:
+        for word in re.findall(r"[a-z']+", '{} {}'.format(movie['title'], movie['overview']).lower()):
+            counts[word] = counts.get(word, 0) + 1
+    # Most frequent first, for the Zipf distribution of the generated text
+    words = sorted(counts, key=lambda word: -counts[word])
+    genres = sorted({movie['genre'] for movie in movies if movie.get('genre')})
+    dates = [movie['release_date'] for movie in movies]
+    return {
+        'words': words,
+        'genres': genres,
+        'genreRatio': sum(1 for movie in movies if movie.get('genre')) / len(movies),
+        'releaseDates': (min(dates), max(dates)),
+    }
+
+# pylint: disable=too-many-instance-attributes
+class MovieGenerator:
+    """
+    Lazy generator of synthetic movies
+
+    Iterating over it yields the documents one by one, so datasets of millions of
+    documents can be streamed to a file or to the client without being held in memory.
+    """
+
+    def __init__(
+            self,
+            count,
+            seed=0,
+            vocabulary=5000,
+            genres=20,
+            genre_ratio=None,
+            title_words=3,
+            overview_words=50,
+            schema=None
+        ):
+        """
+        Parameters
+        ----------
+        count: int
+            Number of documents
+        seed (optional): int
+            Seed of the random generator: the same seed gives the same documents
+        vocabulary (optional): int
+            Number of distinct words of the titles and overviews
+        genres (optional): int
+            Number of distinct genres
+        genre_ratio (optional): float
+            Ratio of documents with a genre. Defaults to the ratio of the sample.
+        title_words (optional): int
+            Average number of words of a title
+        overview_words (optional): int
+            Average number of words of an overview, i.e. the size of the documents
+        schema (optional): dict
+            Schema of the sample, see `sample_schema`
+        """
+        schema = schema or sample_schema()
+        self.count = count
+        self.seed = seed
+        self.title_words = title_words
+        self.overview_words = overview_words
+        self.genre_ratio = schema['genreRatio'] if genre_ratio is None else genre_ratio
+        self.release_dates = schema['releaseDates']
+        self.words = extend(schema['words'], vocabulary, 'word')
+        self.genres = extend(schema['genres'], genres, 'genre')
+        # Zipf distribution: the n-th most frequent word is n times rarer than the first
+        self.cumulative_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(self.words) + 1)))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        rng = random.Random(self.seed)
+        for position in range(self.count):
+            yield self.document(rng, position)
+
+    def document(self, rng, position):
+        title = self.sentence(rng, self.title_words).title()
+        movie = {
+            'id': str(position),
+            'title': title,
+            'poster': POSTER_URL.format(format(rng.getrandbits(108), '027x')),
+            'overview': self.sentence(rng, self.overview_words).capitalize() + '.',
+            'release_date': rng.randint(*self.release_dates),
+        }
+        if rng.random() < self.genre_ratio:
+            movie['genre'] = self.genres[min(int(rng.expovariate(4 / len(self.genres))), len(self.genres) - 1)]
+        return movie
+
+    def sentence(self, rng, average_words):
+        words = max(1, int(rng.gauss(average_words, average_words / 4)))
+        return ' '.join(rng.choices(self.words, cum_weights=self.cumulative_weights, k=words))
+
+    def write(self, path):
+        """Write the documents to `path`: NDJSON, or a JSON array for a .json path, gzipped for a .gz path"""
+        opener = gzip.open if path.endswith('.gz') else open
+        array = path[:-3].endswith('.json') if path.endswith('.gz') else path.endswith('.json')
+        with opener(path, 'wt', encoding='utf-8') as output:
+            if array:
+                output.write('[')
+            for position, movie in enumerate(self):
+                if array and position:
+                    output.write(',\n')
+                output.write(json.dumps(movie))
+                if not array:
+                    output.write('\n')
+            if array:
+                output.write(']\n')
+
+def extend(values, count, prefix):
+    """The first `count` values, completed with synthetic ones"""
+    values = list(values[:count])
+    values.extend('{}{}'.format(prefix, position) for position in range(len(values), count))
+    return values
+
+def generate_documents(count, seed=0, **options):
+    """Lazy iterator over `count` synthetic movies, see MovieGenerator"""
+    return iter(MovieGenerator(count, seed, **options))
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic movies dataset generator')
+    parser.add_argument('--documents', type=int, default=10000)
+    parser.add_argument('--output', required=True, help='.ndjson or .json file, optionally .gz')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--vocabulary', type=int, default=5000)
+    parser.add_argument('--genres', type=int, default=20)
+    parser.add_argument('--title-words', type=int, default=3)
+    parser.add_argument('--overview-words', type=int, default=50)
+    args = parser.parse_args()
+    MovieGenerator(
+        args.documents,
+        args.seed,
+        vocabulary=args.vocabulary,
+        genres=args.genres,
+        title_words=args.title_words,
+        overview_words=args.overview_words
+    ).write(args.output)
+
+if __name__ == '__main__':
+    main()
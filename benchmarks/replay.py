@@ -0,0 +1,186 @@
+"""
+Replay of a search capture against a MeiliSearch instance, as a load generator.
+
+    python -m benchmarks.replay searches.ndjson.gz --url http://staging:7700 --key KEY
+    python -m benchmarks.replay searches.ndjson.gz --url http://staging:7700 --qps 500 --duration 60
+    python -m benchmarks.replay searches.ndjson.gz --url http://staging:7700 --workers 16
+
+The capture is written by a meilisearch.capture.SearchRecorder. By default the
+searches are replayed open loop, at the pace they were recorded (`--speed` to
+accelerate it), or at a fixed rate with `--qps`: they are sent on schedule whatever
+the latency of the server, and their latency is measured from their scheduled time,
+so a server falling behind shows in the percentiles instead of slowing the load down.
+With `--workers`, the replay is closed loop: each worker sends its next search once
+the previous one is answered. The report gives the latency percentiles, the error
+rate by error code and the throughput reached, next to the recorded latencies.
+"""
+
+import argparse
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import meilisearch
+from meilisearch.capture import read_capture
+from meilisearch.errors import MeiliSearchError
+from meilisearch.metrics import error_code
+from benchmarks.utils import print_table, summarize
+
+def load_searches(path, index_uid=None, limit=None):
+    """Searches of a capture, sent to `index_uid` instead of their index when given"""
+    searches = []
+    for search in itertools.islice(read_capture(path), limit):
+        if index_uid is not None:
+            search['indexUid'] = index_uid
+        searches.append(search)
+    return searches
+
+def send(client, search):
+    """Send a search, returning its error code or None"""
+    params = dict(search['body'])
+    query = params.pop('q', None)
+    try:
+        client.get_index(search['indexUid']).search(query, params)
+    except MeiliSearchError as err:
+        return error_code(err)
+    return None
+
+def schedule(searches, qps=None, speed=1.0, duration=None):
+    """Offsets in seconds at which the searches are sent open loop, with the searches"""
+    if qps is None:
+        start = searches[0]['time']
+        return [((search['time'] - start) / speed, search) for search in searches]
+    count = int(qps * duration) if duration else len(searches)
+    return [(position / qps, search) for position, search in zip(range(count), itertools.cycle(searches))]
+
+def open_loop(client, searches, qps=None, speed=1.0, duration=None, max_in_flight=256):
+    """Send the searches on schedule, measuring their latency from their scheduled time
+
+    Returns
+    ----------
+    results: list
+        (latency in seconds, error code) of each search
+    elapsed: float
+        Duration of the replay in seconds
+    """
+    results = []
+    lock = threading.Lock()
+    def run(scheduled, search):
+        error = send(client, search)
+        latency = time.perf_counter() - scheduled
+        with lock:
+            results.append((latency, error))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_in_flight) as executor:
+        for offset, search in schedule(searches, qps, speed, duration):
+            scheduled = start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(run, scheduled, search)
+    return results, time.perf_counter() - start
+
+def closed_loop(client, searches, workers, duration=None):
+    """Send the searches from `workers` threads, each waiting for its previous answer
+
+    Without `duration`, the searches are sent once; with it, they are sent again and
+    again for `duration` seconds.
+
+    Returns
+    ----------
+    results: list
+        (latency in seconds, error code) of each search
+    elapsed: float
+        Duration of the replay in seconds
+    """
+    results = []
+    lock = threading.Lock()
+    pending = itertools.cycle(searches) if duration else iter(searches)
+    def work(deadline):
+        while deadline is None or time.perf_counter() < deadline:
+            with lock:
+                search = next(pending, None)
+            if search is None:
+                return
+            started_at = time.perf_counter()
+            error = send(client, search)
+            latency = time.perf_counter() - started_at
+            with lock:
+                results.append((latency, error))
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+    threads = [threading.Thread(target=work, args=(deadline,)) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start
+
+def report(results, elapsed, searches):
+    """Latency percentiles, errors and throughput of a replay, next to the recorded latencies"""
+    errors = {}
+    for _, error in results:
+        if error is not None:
+            errors[error] = errors.get(error, 0) + 1
+    failed = sum(errors.values())
+    recorded = [search['latency'] for search in searches if search['error'] is None]
+    return {
+        'replayed': summarize([latency for latency, _ in results], elapsed) if results else None,
+        'recorded': summarize(recorded) if recorded else None,
+        'searches': len(results),
+        'errors': errors,
+        'errorRate': failed / len(results) if results else 0.0,
+        'recordedErrorRate': sum(1 for search in searches if search['error'] is not None) / len(searches),
+        'elapsed': elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay of a search capture')
+    parser.add_argument('capture', help='capture written by a SearchRecorder')
+    parser.add_argument('--url', default='http://127.0.0.1:7700')
+    parser.add_argument('--key', default='masterKey')
+    parser.add_argument('--index', default=None, help='index searched instead of the recorded ones')
+    parser.add_argument('--limit', type=int, default=None, help='number of searches read from the capture')
+    parser.add_argument('--workers', type=int, default=None, help='closed loop with this many workers')
+    parser.add_argument('--qps', type=float, default=None, help='open loop at this rate of searches per second')
+    parser.add_argument('--speed', type=float, default=1.0, help='open loop at this multiple of the recorded pace')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='seconds of replay, cycling through the capture (with --qps or --workers)')
+    parser.add_argument('--max-in-flight', type=int, default=256, help='searches in flight in open loop')
+    parser.add_argument('--output', default=None, help='JSON file the report is saved to')
+    args = parser.parse_args()
+    try:
+        searches = load_searches(args.capture, args.index, args.limit)
+    except (OSError, ValueError) as err:
+        parser.error(str(err))
+    if not searches:
+        parser.error('{} has no searches'.format(args.capture))
+    concurrency = args.workers or args.max_in_flight
+    client = meilisearch.Client(args.url, args.key, pool_maxsize=concurrency)
+    try:
+        if args.workers:
+            mode = 'closed loop, {} workers'.format(args.workers)
+            results, elapsed = closed_loop(client, searches, args.workers, args.duration)
+        else:
+            mode = 'open loop, {}'.format(
+                '{} qps'.format(args.qps) if args.qps else 'x{} recorded pace'.format(args.speed)
+            )
+            results, elapsed = open_loop(client, searches, args.qps, args.speed, args.duration, args.max_in_flight)
+    finally:
+        client.close()
+    summary = report(results, elapsed, searches)
+    print_table('replay of {} ({})'.format(args.capture, mode), {
+        name: summary[name] for name in ('replayed', 'recorded') if summary[name]
+    })
+    print('  errors: {:.2%} ({}), recorded {:.2%}'.format(
+        summary['errorRate'],
+        ', '.join('{} {}'.format(code, count) for code, count in sorted(summary['errors'].items())) or 'none',
+        summary['recordedErrorRate'],
+    ))
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({'mode': mode, 'url': args.url, **summary}, output_file, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,475 @@
+"""
+A lightweight stand-in for the MeiliSearch HTTP API, for the benchmarks.
+
+It mimics the routes used by the python client (indexes, documents, search,
+updates, settings, dumps, health, keys, stats and version) closely enough to
+exercise the client end to end, with a configurable latency. It does not try
+to reproduce MeiliSearch's ranking: searching is a plain case-insensitive
+substring match over the document values.
+
+    python -m benchmarks.stand_in_server --port 7700 --master-key masterKey --latency 0.001
+
+The test suite also runs against it, when no MeiliSearch instance is at hand.
+"""
+
+import argparse
+import gzip
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_SETTINGS = {
+    'rankingRules': ['typo', 'words', 'proximity', 'attribute', 'wordsPosition', 'exactness'],
+    'distinctAttribute': None,
+    'searchableAttributes': ['*'],
+    'displayedAttributes': ['*'],
+    'stopWords': [],
+    'synonyms': {},
+    'attributesForFaceting': [],
+}
+
+EMPTY = object()
+
+SETTINGS_SUB_ROUTES = {
+    'ranking-rules': 'rankingRules',
+    'distinct-attribute': 'distinctAttribute',
+    'searchable-attributes': 'searchableAttributes',
+    'displayed-attributes': 'displayedAttributes',
+    'stop-words': 'stopWords',
+    'synonyms': 'synonyms',
+    'attributes-for-faceting': 'attributesForFaceting',
+}
+
+class ApiError(Exception):
+
+    def __init__(self, status, message, error_code):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.error_code = error_code
+
+    def body(self):
+        return {
+            'message': self.message,
+            'errorCode': self.error_code,
+            'errorType': 'invalid_request_error',
+            'errorLink': 'https://docs.meilisearch.com/errors#' + self.error_code,
+        }
+
+def _now():
+    return time.strftime('%Y-%m-%dT%H:%M:%S.000000Z', time.gmtime())
+
+class StandInIndex:
+
+    def __init__(self, uid, primary_key=None):
+        self.uid = uid
+        self.primary_key = primary_key
+        self.documents = {}
+        self.updates = []
+        self.settings = json.loads(json.dumps(DEFAULT_SETTINGS))
+        self.created_at = _now()
+        self.updated_at = self.created_at
+
+    def info(self):
+        return {
+            'uid': self.uid,
+            'name': self.uid,
+            'primaryKey': self.primary_key,
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at,
+        }
+
+class StandInState:
+    """In-memory state shared by every request handler."""
+
+    def __init__(self, master_key=None, latency=0.0, update_latency=0.0):
+        self.master_key = master_key
+        self.latency = latency
+        self.update_latency = update_latency
+        self.indexes = {}
+        self.dumps = {}
+        self.healthy = True
+        self.lock = threading.RLock()
+        self.request_count = 0
+
+    def get_index(self, uid):
+        index = self.indexes.get(uid)
+        if index is None:
+            raise ApiError(404, 'Index {} not found'.format(uid), 'index_not_found')
+        return index
+
+    def enqueue(self, index, update_type, apply):
+        """Register an update; it is applied once `update_latency` has elapsed."""
+        update = {
+            'status': 'enqueued',
+            'updateId': len(index.updates),
+            'type': {'name': update_type},
+            'enqueuedAt': _now(),
+        }
+        index.updates.append(update)
+
+        def process():
+            start = time.perf_counter()
+            with self.lock:
+                try:
+                    apply()
+                    update['status'] = 'processed'
+                except ApiError as err:
+                    update['status'] = 'failed'
+                    update['error'] = err.message
+                    update['errorCode'] = err.error_code
+                update['duration'] = time.perf_counter() - start
+                update['processedAt'] = _now()
+                index.updated_at = update['processedAt']
+
+        if self.update_latency:
+            timer = threading.Timer(self.update_latency, process)
+            timer.daemon = True
+            timer.start()
+        else:
+            process()
+        return {'updateId': update['updateId']}
+
+def _documents_update(index, documents, primary_key, replace):
+    def apply():
+        key = index.primary_key or primary_key
+        if key is None and documents:
+            key = next((field for field in documents[0] if field.lower().endswith('id')), None)
+        if key is None:
+            raise ApiError(400, 'Could not infer a primary key', 'missing_primary_key')
+        index.primary_key = key
+        for document in documents:
+            if key not in document:
+                raise ApiError(400, 'Document does not have a primary key', 'missing_document_id')
+            doc_id = str(document[key])
+            if replace or doc_id not in index.documents:
+                index.documents[doc_id] = dict(document)
+            else:
+                index.documents[doc_id].update(document)
+    return apply
+
+def _search(index, body):
+    start = time.perf_counter()
+    query = body.get('q') or ''
+    offset = int(body.get('offset', 0))
+    limit = int(body.get('limit', 20))
+    words = query.lower().split()
+    hits = []
+    for document in index.documents.values():
+        text = ' '.join(str(value) for value in document.values()).lower()
+        if all(word in text for word in words):
+            hits.append(document)
+    retrieve = body.get('attributesToRetrieve')
+    page = hits[offset:offset + limit]
+    if retrieve and retrieve != ['*']:
+        page = [{key: doc[key] for key in retrieve if key in doc} for doc in page]
+    result = {
+        'hits': page,
+        'offset': offset,
+        'limit': limit,
+        'nbHits': len(hits),
+        'exhaustiveNbHits': False,
+        'processingTimeMs': int((time.perf_counter() - start) * 1000),
+        'query': query,
+    }
+    if body.get('facetsDistribution'):
+        facets = body['facetsDistribution']
+        if facets == ['*']:
+            facets = index.settings['attributesForFaceting']
+        distribution = {}
+        for facet in facets:
+            counts = {}
+            for document in hits:
+                values = document.get(facet)
+                for value in values if isinstance(values, list) else [values]:
+                    if value is not None:
+                        counts[str(value)] = counts.get(str(value), 0) + 1
+            distribution[facet] = counts
+        result['facetsDistribution'] = distribution
+        result['exhaustiveFacetsCount'] = True
+    return result
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MeiliSearchStandIn/0.1'
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, *args): # pylint: disable=arguments-differ
+        pass
+
+    def do_GET(self): # pylint: disable=invalid-name
+        self._handle('GET')
+
+    def do_POST(self): # pylint: disable=invalid-name
+        self._handle('POST')
+
+    def do_PUT(self): # pylint: disable=invalid-name
+        self._handle('PUT')
+
+    def do_DELETE(self): # pylint: disable=invalid-name
+        self._handle('DELETE')
+
+    def _read_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip().split(b';')[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            raw = b''.join(chunks)
+        else:
+            raw = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        encoding = self.headers.get('Content-Encoding', '').lower()
+        if encoding == 'gzip':
+            raw = gzip.decompress(raw)
+        elif encoding == 'deflate':
+            raw = zlib.decompress(raw)
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError as err:
+            raise ApiError(400, 'Invalid JSON: {}'.format(err), 'bad_request') from err
+
+    def _send(self, status, body=EMPTY):
+        payload = b'' if body is EMPTY else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        if payload:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self, method):
+        state = self.state
+        state.request_count += 1
+        try:
+            body = self._read_body()
+            if state.latency:
+                time.sleep(state.latency)
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            parts = [part for part in url.path.split('/') if part]
+            if parts != ['health'] and state.master_key is not None \
+                    and self.headers.get('X-Meili-Api-Key') != state.master_key:
+                raise ApiError(403, 'Invalid API key', 'invalid_token')
+            with state.lock:
+                status, response = self._route(state, method, parts, query, body)
+            self._send(status, response)
+        except ApiError as err:
+            self._send(err.status, err.body())
+
+    # pylint: disable=too-many-return-statements,too-many-branches
+    def _route(self, state, method, parts, query, body):
+        if parts == ['health']:
+            if method == 'PUT':
+                state.healthy = bool(body and body.get('health'))
+                return 204, EMPTY
+            if not state.healthy:
+                raise ApiError(503, 'MeiliSearch is not healthy', 'maintenance')
+            return 200, EMPTY
+        if parts == ['version']:
+            return 200, {'pkgVersion': '0.17.0', 'commitSha': 'stand-in', 'buildDate': _now()}
+        if parts == ['keys']:
+            return 200, {'private': 'private-key', 'public': 'public-key'}
+        if parts == ['stats']:
+            return 200, {
+                'databaseSize': 0,
+                'lastUpdate': None,
+                'indexes': {uid: self._index_stats(index) for uid, index in state.indexes.items()},
+            }
+        if parts and parts[0] == 'dumps':
+            return self._dumps(state, method, parts)
+        if parts and parts[0] == 'indexes':
+            return self._indexes(state, method, parts[1:], query, body)
+        raise ApiError(404, 'Not found', 'not_found')
+
+    @staticmethod
+    def _index_stats(index):
+        return {
+            'numberOfDocuments': len(index.documents),
+            'isIndexing': any(update['status'] == 'enqueued' for update in index.updates),
+            'fieldsDistribution': {},
+        }
+
+    @staticmethod
+    def _dumps(state, method, parts):
+        if method == 'POST' and len(parts) == 1:
+            uid = time.strftime('%Y%m%d-%H%M%S') + '-{}'.format(len(state.dumps))
+            state.dumps[uid] = {'uid': uid, 'status': 'done'}
+            return 202, {'uid': uid, 'status': 'processing'}
+        if method == 'GET' and len(parts) == 3 and parts[2] == 'status':
+            if parts[1] not in state.dumps:
+                raise ApiError(404, 'Dump not found', 'dump_not_found')
+            return 200, state.dumps[parts[1]]
+        raise ApiError(404, 'Not found', 'not_found')
+
+    def _indexes(self, state, method, parts, query, body):
+        if not parts:
+            if method == 'GET':
+                return 200, [index.info() for index in state.indexes.values()]
+            if method == 'POST':
+                uid = (body or {}).get('uid')
+                if uid in state.indexes:
+                    raise ApiError(400, 'Index {} already exists'.format(uid), 'index_already_exists')
+                state.indexes[uid] = StandInIndex(uid, (body or {}).get('primaryKey'))
+                return 201, state.indexes[uid].info()
+        index = state.get_index(parts[0])
+        rest = parts[1:]
+        if not rest:
+            if method == 'GET':
+                return 200, index.info()
+            if method == 'PUT':
+                if (body or {}).get('primaryKey') is not None:
+                    index.primary_key = body['primaryKey']
+                return 200, index.info()
+            if method == 'DELETE':
+                del state.indexes[index.uid]
+                return 204, EMPTY
+        elif rest[0] == 'search':
+            if method == 'POST':
+                return 200, _search(index, body or {})
+            return 200, _search(index, query)
+        elif rest[0] == 'documents':
+            return self._documents(state, index, method, rest[1:], query, body)
+        elif rest[0] == 'updates':
+            if len(rest) == 1:
+                return 200, index.updates
+            update_id = int(rest[1])
+            if update_id >= len(index.updates):
+                raise ApiError(404, 'Update {} not found'.format(update_id), 'not_found')
+            return 200, index.updates[update_id]
+        elif rest[0] == 'stats':
+            return 200, self._index_stats(index)
+        elif rest[0] == 'settings':
+            return self._settings(state, index, method, rest[1:], body)
+        raise ApiError(404, 'Not found', 'not_found')
+
+    @staticmethod
+    def _documents(state, index, method, rest, query, body):
+        if not rest:
+            if method == 'GET':
+                offset = int(query.get('offset', 0))
+                limit = int(query.get('limit', 20))
+                page = list(index.documents.values())[offset:offset + limit]
+                retrieve = query.get('attributesToRetrieve')
+                if retrieve and retrieve != '*':
+                    fields = retrieve.split(',')
+                    page = [{key: doc[key] for key in fields if key in doc} for doc in page]
+                return 200, page
+            if method in ('POST', 'PUT'):
+                if not isinstance(body, list):
+                    raise ApiError(400, 'Documents must be a JSON array', 'bad_request')
+                apply = _documents_update(index, body, query.get('primaryKey'), method == 'POST')
+                return 202, state.enqueue(index, 'DocumentsAddition', apply)
+            if method == 'DELETE':
+                return 202, state.enqueue(index, 'ClearAll', index.documents.clear)
+        elif rest == ['delete-batch'] and method == 'POST':
+            def apply():
+                for doc_id in body:
+                    index.documents.pop(str(doc_id), None)
+            return 202, state.enqueue(index, 'DocumentsDeletion', apply)
+        elif len(rest) == 1:
+            if method == 'GET':
+                if rest[0] not in index.documents:
+                    raise ApiError(404, 'Document not found', 'document_not_found')
+                return 200, index.documents[rest[0]]
+            if method == 'DELETE':
+                return 202, state.enqueue(
+                    index, 'DocumentsDeletion', lambda: index.documents.pop(rest[0], None)
+                )
+        raise ApiError(404, 'Not found', 'not_found')
+
+    @staticmethod
+    def _settings(state, index, method, rest, body):
+        if not rest:
+            if method == 'GET':
+                return 200, index.settings
+            if method == 'POST':
+                unknown = set(body or {}) - set(DEFAULT_SETTINGS)
+                if unknown:
+                    raise ApiError(400, 'Unknown setting {}'.format(sorted(unknown)[0]), 'bad_request')
+                return 202, state.enqueue(
+                    index, 'Settings', lambda: index.settings.update(body or {})
+                )
+            if method == 'DELETE':
+                return 202, state.enqueue(
+                    index, 'Settings',
+                    lambda: index.settings.update(json.loads(json.dumps(DEFAULT_SETTINGS)))
+                )
+        elif len(rest) == 1 and rest[0] in SETTINGS_SUB_ROUTES:
+            key = SETTINGS_SUB_ROUTES[rest[0]]
+            if method == 'GET':
+                return 200, index.settings[key]
+            if method == 'POST':
+                return 202, state.enqueue(
+                    index, 'Settings', lambda: index.settings.__setitem__(key, body)
+                )
+            if method == 'DELETE':
+                return 202, state.enqueue(
+                    index, 'Settings',
+                    lambda: index.settings.__setitem__(key, json.loads(json.dumps(DEFAULT_SETTINGS[key])))
+                )
+        raise ApiError(404, 'Not found', 'not_found')
+
+class StandInServer:
+    """Run the stand-in in a background thread.
+
+    Use it as a context manager; `url` is the base url to give to `meilisearch.Client`.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, master_key=None, latency=0.0, update_latency=0.0):
+        self.state = StandInState(master_key, latency, update_latency)
+        handler = type('Handler', (StandInHandler,), {'state': self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7700)
+    parser.add_argument('--master-key', default=None)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds added to every request')
+    parser.add_argument('--update-latency', type=float, default=0.0,
+                        help='seconds before an enqueued update is processed')
+    args = parser.parse_args()
+    server = StandInServer(args.host, args.port, args.master_key, args.latency, args.update_latency)
+    print('MeiliSearch stand-in listening on {}'.format(server.url))
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import meilisearch
+from meilisearch.capture import SearchRecorder
+from meilisearch.tests import BASE_URL, MASTER_KEY
+from benchmarks.replay import closed_loop, load_searches, open_loop, report
+
+class TestReplay:
+
+    """ TESTS: replay of a search capture """
+
+    def setup_class(self):
+        client = meilisearch.Client(BASE_URL, MASTER_KEY)
+        index = client.create_index('replayUID', {'primaryKey': 'id'})
+        index.wait_for_pending_update(index.add_documents([
+            {'id': 1, 'title': 'Kung Fu Panda'},
+            {'id': 2, 'title': 'Dragon Ball'},
+        ])['updateId'])
+
+    def teardown_class(self):
+        meilisearch.Client(BASE_URL, MASTER_KEY).get_index('replayUID').delete()
+
+    @staticmethod
+    def test_replay(tmp_path):
+        """Tests replaying a capture open and closed loop"""
+        path = str(tmp_path / 'searches.ndjson.gz')
+        with SearchRecorder(path) as recorder:
+            client = meilisearch.Client(BASE_URL, MASTER_KEY, search_recorder=recorder)
+            for query in ('panda', 'dragon', 'fu', 'ball'):
+                client.get_index('replayUID').search(query)
+        searches = load_searches(path)
+        client = meilisearch.Client(BASE_URL, MASTER_KEY)
+        results, elapsed = open_loop(client, searches, qps=100, duration=0.2)
+        summary = report(results, elapsed, searches)
+        assert summary['searches'] == 20
+        assert summary['errorRate'] == 0
+        assert summary['replayed']['p50_ms'] > 0
+        assert summary['recorded']['count'] == 4
+        results, elapsed = closed_loop(client, load_searches(path, index_uid='unknownReplayUID'), workers=2)
+        summary = report(results, elapsed, searches)
+        assert summary['searches'] == 4
+        assert summary['errors'] == {'index_not_found': 4}
+        assert summary['errorRate'] == 1
@@ -0,0 +1,66 @@
+import statistics
+import time
+from benchmarks.datasets import generate_documents
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[rank]
+
+def summarize(latencies, elapsed=None):
+    """Summarize latencies (in seconds) as milliseconds"""
+    summary = {
+        'count': len(latencies),
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': max(latencies) * 1000,
+    }
+    if elapsed:
+        summary['ops_per_second'] = len(latencies) / elapsed
+    return summary
+
+def measure(func, iterations, warmup=5):
+    """Call `func` `iterations` times and summarize its latency"""
+    for _ in range(warmup):
+        func()
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, time.perf_counter() - start)
+
+def print_table(title, results):
+    """Print `{name: summary}` results as an aligned table"""
+    print(title)
+    for name, summary in results.items():
+        print('  {:<28} p50 {:8.3f} ms   p95 {:8.3f} ms   p99 {:8.3f} ms   {:10.1f} ops/s'.format(
+            name,
+            summary['p50_ms'],
+            summary['p95_ms'],
+            summary['p99_ms'],
+            summary.get('ops_per_second', 0),
+        ))
+
+def load_documents(count, seed=0):
+    """`count` synthetic movies with the schema of the small movies dataset, see benchmarks.datasets
+
+    Unlike copies of the 30 sample movies, they do not compress nor serialize unrealistically well.
+    """
+    return list(generate_documents(count, seed))
+
+def best_time(func, repeat):
+    """Shortest duration of `repeat` calls of `func`, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
@@ -1 +1,2 @@
 from meilisearch.client import Client
+from meilisearch.async_client import AsyncClient
@@ -0,0 +1,361 @@
+import asyncio
+import json
+from time import monotonic, perf_counter
+from meilisearch import deadline
+from meilisearch.errors import MeiliSearchApiError, MeiliSearchCommunicationError, MeiliSearchTimeoutError
+from meilisearch.replication import is_replicated_write, replicated_response, replication_outcome
+from meilisearch.retry import retry_delay
+from meilisearch._httprequests import FAILOVER_STATUS
+from meilisearch._payload import aiter_chunks, is_buffered, is_file_like, raw_payload, Serialized
+from meilisearch._routes import index_uid, is_replica_read, is_upload, operation_class, route_template
+from meilisearch.search_cache import invalidate_search_cache
+
+try:
+    import aiohttp
+except ImportError: # pragma: no cover
+    aiohttp = None
+
+class AsyncResponse:
+    """Body and status of an aiohttp response, read before the connection is released
+
+    It exposes the attributes of `requests.Response` used by MeiliSearchApiError and
+    returned to the caller when MeiliSearch answers without a body (ex: health).
+    """
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+async def connection_create_start(session, context, params): # pylint: disable=unused-argument
+    context.connect_started_at = perf_counter()
+
+async def connection_create_end(session, context, params): # pylint: disable=unused-argument
+    if context.trace_request_ctx is not None:
+        context.trace_request_ctx.connect += perf_counter() - context.connect_started_at
+
+def connect_trace():
+    """aiohttp tracing of the time spent connecting, for the request hooks"""
+    trace = aiohttp.TraceConfig()
+    trace.on_connection_create_start.append(connection_create_start)
+    trace.on_connection_create_end.append(connection_create_end)
+    return trace
+
+class AsyncHttpRequests:
+
+    config = None
+    headers = {}
+
+    def __init__(self, config):
+        if aiohttp is None:
+            raise ImportError(
+                'The asyncio client requires aiohttp: pip install meilisearch[async]'
+            )
+        self.config = config
+        self.headers = {
+            'X-Meili-Api-Key': self.config.api_key,
+            'Content-Type': 'application/json'
+        }
+
+    @property
+    def session(self):
+        """The aiohttp session shared by every AsyncHttpRequests built from the config
+
+        It is created on first use, from within the running event loop, and created
+        again when the client is used from another event loop once the first one is
+        closed (ex: a client used in several `asyncio.run`).
+        """
+        loop = asyncio.get_running_loop()
+        session = self.config.async_session
+        if session is not None and not session.closed and self.config.async_session_loop is not loop:
+            if not self.config.async_session_loop.is_closed():
+                raise RuntimeError(
+                    'The AsyncClient is bound to another event loop, close it before using it from this one'
+                )
+            # Its connections were left open by the closed event loop, they cannot be reused
+            session.detach()
+        if self.config.async_session is None or self.config.async_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.pool_maxsize,
+                force_close=not self.config.keep_alive
+            )
+            self.config.async_session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=[connect_trace()]
+            )
+            self.config.async_session_loop = loop
+        return self.config.async_session
+
+    async def send_request(self, http_method, path, body=None, timeout=None, node=None):
+        if (
+                node is None
+                and self.config.replication is not None
+                and len(self.config.nodes) > 1
+                and is_replicated_write(http_method, path)
+            ):
+            return await self.replicated_request(http_method, path, body, timeout)
+        limiter = self.config.limiter
+        if limiter is None:
+            return await self.send_to_nodes(http_method, path, body, timeout, node)
+        operation = operation_class(http_method, path)
+        await limiter.acquire_async(operation)
+        try:
+            return await self.send_to_nodes(http_method, path, body, timeout, node)
+        finally:
+            limiter.release(operation)
+
+    async def send_to_nodes(self, http_method, path, body=None, timeout=None, node=None):
+        """Send a request, reporting it to the request hooks of the client"""
+        hooks = self.config.hooks
+        if not hooks:
+            return await self.send_attempts(http_method, path, body, timeout, node)
+        info = hooks.start(http_method, path, route_template(path), index_uid(path))
+        try:
+            response = await self.send_attempts(http_method, path, body, timeout, node, info)
+        except BaseException as err:
+            hooks.finish(info, err)
+            raise
+        hooks.finish(info)
+        return response
+
+    async def send_attempts(self, http_method, path, body=None, timeout=None, node=None, info=None): # pylint: disable=too-many-arguments
+        """Send a request to a node, failing over to another one and retrying according to the policies"""
+        body = self.encode_body(body)
+        if body is not None and self.config.compression is not None and is_upload(http_method, path):
+            body = await self.compress_body(body)
+        nodes = self.config.nodes
+        replica_read = is_replica_read(http_method, path)
+        policy = self.config.retry_policy
+        backoff = policy.backoff() if policy is not None else None
+        attempt = 1
+        tried = []
+        # A request pinned to a node (ex: one write of a replicated write) is retried on that node only
+        pinned = node
+        while True:
+            node = pinned or nodes.select(replica_read, tried)
+            client_timeout = self.client_timeout(self.config.timeout if timeout is None else timeout)
+            if info is not None:
+                info.attempt(node.url, body)
+            started_at = nodes.start(node)
+            try:
+                async with self.session.request(
+                        http_method,
+                        node.url + '/' + path,
+                        headers=self.request_headers(body),
+                        data=body,
+                        timeout=client_timeout,
+                        trace_request_ctx=info
+                    ) as response:
+                    if info is not None:
+                        info.headers_received()
+                    content = await response.read()
+                    if info is not None:
+                        info.body_received(response.status, content)
+                    reason = response.reason
+                    response = AsyncResponse(response.status, response.headers, content)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                nodes.finish(node, started_at, failed=True)
+                tried.append(node)
+                if pinned is None and is_buffered(body) and nodes.can_fail_over(replica_read, tried):
+                    continue
+                delay = retry_delay(
+                    policy, backoff, attempt, http_method, path, body,
+                    sent=not isinstance(err, aiohttp.ClientConnectorError)
+                )
+                if delay is None:
+                    if isinstance(err, asyncio.TimeoutError):
+                        raise MeiliSearchTimeoutError(err) from err
+                    raise MeiliSearchCommunicationError(err) from err
+                await asyncio.sleep(delay)
+                attempt += 1
+                tried = []
+                continue
+            except BaseException:
+                nodes.finish(node, started_at, failed=False)
+                raise
+            nodes.finish(node, started_at, failed=response.status_code >= 500)
+            if response.status_code in FAILOVER_STATUS:
+                tried.append(node)
+                if pinned is None and is_buffered(body) and nodes.can_fail_over(replica_read, tried):
+                    continue
+            if policy is not None and response.status_code in policy.retry_on_status:
+                delay = retry_delay(
+                    policy, backoff, attempt, http_method, path, body,
+                    retry_after=response.headers.get('Retry-After')
+                )
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    tried = []
+                    continue
+            break
+        if policy is not None:
+            policy.record_request(retried=attempt > 1)
+        if info is None:
+            result = self.__validate(response, reason)
+        else:
+            decode_started_at = perf_counter()
+            result = self.__validate(response, reason)
+            info.decoded(result, decode_started_at)
+        invalidate_search_cache(self.config, http_method, path)
+        return result
+
+    async def replicated_request(self, http_method, path, body=None, timeout=None):
+        """Send a write to every node concurrently, see ReplicationPolicy
+
+        A streamed body is read once, and compressed once, then sent to each node.
+        """
+        data = self.encode_body(body)
+        if not is_buffered(data):
+            data = b''.join([chunk async for chunk in data])
+        if data is not None and self.config.compression is not None and is_upload(http_method, path):
+            data = await self.compress_body(data)
+        tasks = [
+            (node.url, asyncio.ensure_future(self.send_request(http_method, path, Serialized(data), timeout, node)))
+            for node in self.config.nodes.nodes
+        ]
+        try:
+            await asyncio.wait([task for _, task in tasks])
+        finally:
+            for _, task in tasks:
+                task.cancel()
+        return replicated_response(
+            self.config.replication,
+            [replication_outcome(url, task) for url, task in tasks]
+        )
+
+    async def hedged_post(self, path, body=None, timeout=None):
+        """Send a read, and the same read to another node if the first is slow to answer
+
+        The first answer is returned and the slower request is cancelled, see HedgePolicy.
+        """
+        policy = self.config.hedge_policy
+        nodes = self.config.nodes
+        if policy is None or len(nodes) == 1:
+            return await self.send_request('POST', path, body, timeout)
+        data = self.encode_body(body)
+        started_at = monotonic()
+        first_node = nodes.select(True)
+        first = asyncio.ensure_future(self.send_request('POST', path, Serialized(data), timeout, first_node))
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=policy.delay())
+            if done or not nodes.can_fail_over(True, [first_node]) or not policy.acquire():
+                result = await first
+                policy.record(monotonic() - started_at)
+                return result
+            second = asyncio.ensure_future(
+                self.send_request('POST', path, Serialized(data), timeout, nodes.select(True, [first_node]))
+            )
+            pending = {first, second}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # The first success wins; an error is only raised once both requests failed
+                for task in done:
+                    if task.exception() is None or not pending:
+                        policy.record(monotonic() - started_at, hedge_won=task is second)
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def client_timeout(timeout):
+        """aiohttp timeouts of one request
+
+        Within a deadline, the total duration of the request is capped as well.
+        """
+        connect_and_read = deadline.attempt_timeout(timeout)
+        if connect_and_read is None:
+            return aiohttp.ClientTimeout(total=None)
+        connect, read = connect_and_read
+        return aiohttp.ClientTimeout(total=deadline.remaining(), sock_connect=connect, sock_read=read)
+
+    def encode_body(self, body):
+        """Serialize a body once, see HttpRequests.encode_body"""
+        if body is None:
+            return None
+        if not isinstance(body, Serialized):
+            return self.config.json_codec.dumps(body)
+        payload = raw_payload(body.body)
+        if is_file_like(payload):
+            return aiter_chunks(payload)
+        return payload
+
+    async def compress_body(self, body):
+        """Compress a body, in the default executor so the event loop is not blocked"""
+        compression = self.config.compression
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            if len(body) < compression.min_size:
+                return body
+            return await asyncio.get_event_loop().run_in_executor(None, compression.compress, body)
+        return compression.compress_stream(body)
+
+    def request_headers(self, body):
+        """Headers of a request, with the Content-Encoding of a compressed body"""
+        content_encoding = getattr(body, 'content_encoding', None)
+        if content_encoding is None:
+            return self.headers
+        return {**self.headers, 'Content-Encoding': content_encoding}
+
+    async def get(self, path, timeout=None):
+        return await self.send_request('GET', path, timeout=timeout)
+
+    async def post(self, path, body=None, timeout=None):
+        return await self.send_request('POST', path, body, timeout)
+
+    async def put(self, path, body=None, timeout=None):
+        return await self.send_request('PUT', path, body, timeout)
+
+    async def delete(self, path, body=None, timeout=None):
+        return await self.send_request('DELETE', path, body, timeout)
+
+    async def close(self):
+        """Close the shared session and every pooled connection"""
+        if self.config.async_session is not None:
+            if self.config.async_session_loop is asyncio.get_running_loop():
+                await self.config.async_session.close()
+            else:
+                self.config.async_session.detach()
+            self.config.async_session = None
+            self.config.async_session_loop = None
+
+    def __validate(self, response, reason):
+        if response.status_code >= 400:
+            raise MeiliSearchApiError(
+                '{} Error: {}'.format(response.status_code, reason),
+                response
+            )
+        if response.content == b'':
+            return response
+        return self.config.json_codec.loads(response.content)
+
+async def bounded_gather(awaitables, concurrency):
+    """Await `awaitables` with at most `concurrency` of them running at once
+
+    Results are returned in the order of `awaitables`, like `asyncio.gather`.
+    Coroutines are only started once a slot is free, so a generator of coroutines
+    is consumed lazily.
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(awaitable):
+        try:
+            return await awaitable
+        finally:
+            semaphore.release()
+
+    tasks = []
+    for awaitable in awaitables:
+        await semaphore.acquire()
+        tasks.append(asyncio.ensure_future(run(awaitable)))
+    return await asyncio.gather(*tasks)
@@ -0,0 +1,91 @@
+class EncodedBatch(bytes):
+    """JSON array of a batch of documents, with the number of `documents` it holds"""
+
+    documents = 0
+
+def document_batches(documents, batch_size=1000):
+    """Split an iterable of documents into lists of documents
+
+    The iterable is consumed lazily: a batch is yielded as soon as it is full, so
+    it can be sent before the rest of the input is read.
+
+    Parameters
+    ----------
+    documents: iterable
+        Iterable of dicts, each containing a document
+    batch_size (optional): int
+        Maximum number of documents in a batch
+    Returns
+    ----------
+    batches: generator
+        Generator of lists of documents
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def encoded_batches(documents, dumps, batch_size=1000, max_batch_bytes=None):
+    """Split an iterable of documents into batches serialized to JSON arrays
+
+    Each document is serialized once, with `dumps`, and the batches are built from
+    the serialized documents: the size checked against `max_batch_bytes` is the
+    exact size of the body sent, at no extra cost.
+
+    Parameters
+    ----------
+    documents: iterable
+        Iterable of dicts, each containing a document, consumed lazily
+    dumps: callable
+        Serialization of a document to JSON bytes (ex: the `dumps` of the JSON codec of the client)
+    batch_size (optional): int
+        Maximum number of documents in a batch
+    max_batch_bytes (optional): int
+        Maximum size of a batch. A document bigger than this limit is sent in a batch of its own.
+    Returns
+    ----------
+    batches: generator
+        Generator of EncodedBatch, to be sent as is by `add_documents`
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    parts = []
+    batch_bytes = 2 # the enclosing brackets
+    for document in documents:
+        part = dumps(document)
+        part_bytes = len(part) + (1 if parts else 0) # with the ',' separator
+        if parts and max_batch_bytes is not None and batch_bytes + part_bytes > max_batch_bytes:
+            yield _encoded_batch(parts)
+            parts = []
+            batch_bytes = 2
+            part_bytes -= 1
+        parts.append(part)
+        batch_bytes += part_bytes
+        if len(parts) >= batch_size:
+            yield _encoded_batch(parts)
+            parts = []
+            batch_bytes = 2
+    if parts:
+        yield _encoded_batch(parts)
+
+def _encoded_batch(parts):
+    batch = EncodedBatch(b'[' + b','.join(parts) + b']')
+    batch.documents = len(parts)
+    return batch
+
+def document_page_parameters(batch_size, attributes_to_retrieve=None):
+    """Parameters of the get documents route used to fetch an index page by page"""
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    parameters = {'limit': batch_size}
+    if attributes_to_retrieve is not None:
+        if not isinstance(attributes_to_retrieve, str):
+            attributes_to_retrieve = ','.join(attributes_to_retrieve)
+        parameters['attributesToRetrieve'] = attributes_to_retrieve
+    return parameters
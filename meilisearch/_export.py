@@ -0,0 +1,57 @@
+import gzip
+import io
+import json
+
+EXPORT_FORMATS = ('ndjson', 'json')
+
+class DocumentWriter:
+    """Write pages of documents to a path or a file object, as NDJSON or as a JSON array"""
+
+    def __init__(self, path_or_fileobj, export_format='ndjson', compression=None):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError('Unsupported export format {!r}, expected one of {}'.format(
+                export_format, ', '.join(EXPORT_FORMATS)
+            ))
+        if compression not in (None, 'gzip'):
+            raise ValueError('Unsupported compression {!r}, expected gzip or None'.format(compression))
+        self.export_format = export_format
+        self.documents = 0
+        self.__owned = []
+        if isinstance(path_or_fileobj, (str, bytes)) or hasattr(path_or_fileobj, '__fspath__'):
+            fileobj = open(path_or_fileobj, 'wb') # pylint: disable=consider-using-with
+            self.__owned.append(fileobj)
+        else:
+            fileobj = path_or_fileobj
+        self.__text = isinstance(fileobj, io.TextIOBase)
+        if compression == 'gzip':
+            if self.__text:
+                raise ValueError('gzip compression requires a binary file object')
+            fileobj = gzip.GzipFile(fileobj=fileobj, mode='wb')
+            self.__owned.insert(0, fileobj)
+        self.__fileobj = fileobj
+        if export_format == 'json':
+            self.__write('[')
+
+    def write_page(self, page):
+        """Write a page of documents, and return the number of documents written so far"""
+        if self.export_format == 'ndjson':
+            lines = ''.join(json.dumps(document, ensure_ascii=False) + '\n' for document in page)
+        else:
+            lines = ','.join(json.dumps(document, ensure_ascii=False) for document in page)
+            if self.documents and page:
+                lines = ',' + lines
+        self.__write(lines)
+        self.documents += len(page)
+        return self.documents
+
+    def close(self):
+        """Terminate the export, and close the files opened by the writer"""
+        if self.export_format == 'json':
+            self.__write(']\n')
+        for fileobj in self.__owned:
+            fileobj.close()
+        if not self.__owned:
+            self.__fileobj.flush()
+
+    def __write(self, text):
+        self.__fileobj.write(text if self.__text else text.encode('utf-8'))
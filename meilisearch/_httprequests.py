@@ -1,10 +1,60 @@
+import functools
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
+from time import monotonic, perf_counter, sleep
 import requests
-from meilisearch.errors import MeiliSearchApiError, MeiliSearchCommunicationError
+import urllib3
+from requests.adapters import HTTPAdapter
+from meilisearch.deadline import attempt_timeout
+from meilisearch.errors import MeiliSearchApiError, MeiliSearchCommunicationError, MeiliSearchTimeoutError
+from meilisearch.replication import is_replicated_write, replicated_response
+from meilisearch.retry import retry_delay
+from meilisearch._payload import is_buffered, is_file_like, iter_chunks, raw_payload, Serialized
+from meilisearch._routes import index_uid, is_replica_read, is_upload, operation_class, route_template
+from meilisearch.search_cache import invalidate_search_cache
+
+# Statuses of a read sent again to another node, when there is one
+FAILOVER_STATUS = (502, 503, 504)
+
+_connect_time = threading.local()
+
+def connect_time():
+    """Seconds spent opening connections by the current thread"""
+    return getattr(_connect_time, 'seconds', 0.0)
+
+class TimedHTTPConnection(urllib3.connection.HTTPConnection):
+    """Connection recording the time spent connecting, for the request hooks"""
+
+    def connect(self):
+        started_at = perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_time.seconds = connect_time() + perf_counter() - started_at
+
+class TimedHTTPSConnection(urllib3.connection.HTTPSConnection):
+    """Connection recording the time spent connecting and in the TLS handshake"""
+
+    def connect(self):
+        started_at = perf_counter()
+        try:
+            super().connect() # pylint: disable=no-member
+        finally:
+            _connect_time.seconds = connect_time() + perf_counter() - started_at
+
+class TimedHTTPConnectionPool(urllib3.HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
 
 class HttpRequests:
 
     config = None
     headers = {}
+    session = None
+
+    __session_lock = threading.Lock()
 
     def __init__(self, config):
         self.config = config
@@ -12,40 +62,265 @@ class HttpRequests:
             'X-Meili-Api-Key': self.config.api_key,
             'Content-Type': 'application/json'
         }
+        if not self.config.keep_alive:
+            self.headers['Connection'] = 'close'
+        self.session = self.get_session(config)
+
+    @staticmethod
+    def get_session(config):
+        """Get the pooled session shared by every HttpRequests built from `config`
+
+        The session is created on first use and stored on the config, so the Client
+        and all the Index instances it creates reuse the same keep-alive connections.
+        """
+        with HttpRequests.__session_lock:
+            if config.session is None:
+                config.session = HttpRequests.create_session(config)
+            return config.session
 
-    def send_request(self, http_method, path, body=None):
+    @staticmethod
+    def create_session(config):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block
+        )
+        adapter.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def send_request(self, http_method, path, body=None, timeout=None, node=None):
+        if (
+                node is None
+                and self.config.replication is not None
+                and len(self.config.nodes) > 1
+                and is_replicated_write(http_method, path)
+            ):
+            return self.replicated_request(http_method, path, body, timeout)
+        limiter = self.config.limiter
+        if limiter is None:
+            return self.send_to_nodes(http_method, path, body, timeout, node)
+        operation = operation_class(http_method, path)
+        limiter.acquire(operation)
+        try:
+            return self.send_to_nodes(http_method, path, body, timeout, node)
+        finally:
+            limiter.release(operation)
+
+    def send_to_nodes(self, http_method, path, body=None, timeout=None, node=None):
+        """Send a request, reporting it to the request hooks of the client"""
+        hooks = self.config.hooks
+        if not hooks:
+            return self.send_attempts(http_method, path, body, timeout, node)
+        info = hooks.start(http_method, path, route_template(path), index_uid(path))
         try:
-            request_path = self.config.url + '/' + path
-            if body is None:
-                request = http_method(request_path, headers=self.headers)
-            else:
-                request = http_method(request_path, headers=self.headers, json=body)
-            return self.__validate(request)
-        except requests.exceptions.ConnectionError as err:
-            raise MeiliSearchCommunicationError(err) from err
+            response = self.send_attempts(http_method, path, body, timeout, node, info)
+        except BaseException as err:
+            hooks.finish(info, err)
+            raise
+        hooks.finish(info)
+        return response
 
-    def get(self, path):
-        return self.send_request(requests.get, path)
+    def send_attempts(self, http_method, path, body=None, timeout=None, node=None, info=None): # pylint: disable=too-many-arguments
+        """Send a request to a node, failing over to another one and retrying according to the policies"""
+        data = self.encode_body(body)
+        if data is not None and self.config.compression is not None and is_upload(http_method, path):
+            data = self.config.compression.compress_body(data)
+        nodes = self.config.nodes
+        replica_read = is_replica_read(http_method, path)
+        policy = self.config.retry_policy
+        backoff = policy.backoff() if policy is not None else None
+        attempt = 1
+        tried = []
+        # A request pinned to a node (ex: one write of a replicated write) is retried on that node only
+        pinned = node
+        while True:
+            node = pinned or nodes.select(replica_read, tried)
+            attempt_timeouts = attempt_timeout(self.config.timeout if timeout is None else timeout)
+            if info is not None:
+                info.attempt(node.url, data)
+                connect_baseline = connect_time()
+            started_at = nodes.start(node)
+            try:
+                request = self.session.request(
+                    http_method,
+                    node.url + '/' + path,
+                    headers=self.request_headers(data),
+                    data=data,
+                    timeout=attempt_timeouts,
+                    stream=info is not None
+                )
+                if info is not None:
+                    # Streamed, so the body is read here and timed apart from the headers
+                    info.connect = connect_time() - connect_baseline
+                    info.headers_received()
+                    info.body_received(request.status_code, request.content)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+                nodes.finish(node, started_at, failed=True)
+                tried.append(node)
+                if pinned is None and is_buffered(data) and nodes.can_fail_over(replica_read, tried):
+                    continue
+                delay = retry_delay(
+                    policy, backoff, attempt, http_method, path, data, sent=not connection_failed(err)
+                )
+                if delay is None:
+                    if isinstance(err, requests.exceptions.Timeout):
+                        raise MeiliSearchTimeoutError(err) from err
+                    raise MeiliSearchCommunicationError(err) from err
+                sleep(delay)
+                attempt += 1
+                tried = []
+                continue
+            except BaseException:
+                nodes.finish(node, started_at, failed=False)
+                raise
+            nodes.finish(node, started_at, failed=request.status_code >= 500)
+            if request.status_code in FAILOVER_STATUS:
+                tried.append(node)
+                if pinned is None and is_buffered(data) and nodes.can_fail_over(replica_read, tried):
+                    continue
+            if policy is not None and request.status_code in policy.retry_on_status:
+                delay = retry_delay(
+                    policy, backoff, attempt, http_method, path, data,
+                    retry_after=request.headers.get('Retry-After')
+                )
+                if delay is not None:
+                    sleep(delay)
+                    attempt += 1
+                    tried = []
+                    continue
+            break
+        if policy is not None:
+            policy.record_request(retried=attempt > 1)
+        if info is None:
+            response = self.__validate(request)
+        else:
+            decode_started_at = perf_counter()
+            response = self.__validate(request)
+            info.decoded(response, decode_started_at)
+        invalidate_search_cache(self.config, http_method, path)
+        return response
 
-    def post(self, path, body=None):
-        return self.send_request(requests.post, path, body)
+    def replicated_request(self, http_method, path, body=None, timeout=None):
+        """Send a write to every node in parallel, see ReplicationPolicy
 
-    def put(self, path, body=None):
-        return self.send_request(requests.put, path, body)
+        A streamed body is read once, and compressed once, then sent to each node.
+        """
+        policy = self.config.replication
+        nodes = self.config.nodes.nodes
+        data = self.encode_body(body)
+        if not is_buffered(data):
+            data = b''.join(data)
+        if data is not None and self.config.compression is not None and is_upload(http_method, path):
+            data = self.config.compression.compress(data)
+        outcomes = policy.run_all([
+            functools.partial(self.send_request, http_method, path, Serialized(data), timeout, node)
+            for node in nodes
+        ])
+        return replicated_response(
+            policy, [(node.url, response, error) for node, (response, error) in zip(nodes, outcomes)]
+        )
 
-    def delete(self, path, body=None):
-        return self.send_request(requests.delete, path, body)
+    def hedged_post(self, path, body=None, timeout=None):
+        """Send a read, and the same read to another node if the first is slow to answer
 
-    @staticmethod
-    def __to_json(request):
+        The first answer is returned, see HedgePolicy. Requests run in the threads of
+        the policy, or in the calling thread, unhedged, when they are all busy. The
+        slower request cannot be interrupted, so it is abandoned, holding its thread
+        until it is answered or times out.
+        """
+        policy = self.config.hedge_policy
+        nodes = self.config.nodes
+        if policy is None or len(nodes) == 1 or not policy.reserve_worker():
+            return self.send_request('POST', path, body, timeout)
+        data = self.encode_body(body)
+        started_at = monotonic()
+        first_node = nodes.select(True)
+        first = policy.submit(self.send_request, 'POST', path, Serialized(data), timeout, first_node)
+        done, _ = wait([first], timeout=policy.delay())
+        hedged = not done and nodes.can_fail_over(True, [first_node]) and policy.reserve_worker()
+        if hedged and not policy.acquire():
+            policy.release_worker()
+            hedged = False
+        if not hedged:
+            result = first.result()
+            policy.record(monotonic() - started_at)
+            return result
+        second = policy.submit(
+            self.send_request, 'POST', path, Serialized(data), timeout, nodes.select(True, [first_node])
+        )
+        pending = {first, second}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # The first success wins; an error is only raised once both requests failed
+            for future in done:
+                if future.exception() is None or not pending:
+                    for other in pending:
+                        other.cancel()
+                    policy.record(monotonic() - started_at, hedge_won=future is second)
+                    return future.result()
+
+    def encode_body(self, body):
+        """Serialize a body once, with the JSON codec of the config
+
+        Bodies wrapped as Serialized (documents given as bytes, memoryview, str or a
+        file object) are sent as is, file objects with chunked transfer encoding.
+        """
+        if body is None:
+            return None
+        if not isinstance(body, Serialized):
+            return self.config.json_codec.dumps(body)
+        payload = raw_payload(body.body)
+        if is_file_like(payload):
+            return iter_chunks(payload)
+        return payload
+
+    def request_headers(self, data):
+        """Headers of a request, with the Content-Encoding of a compressed body"""
+        content_encoding = getattr(data, 'content_encoding', None)
+        if content_encoding is None:
+            return self.headers
+        return {**self.headers, 'Content-Encoding': content_encoding}
+
+    def get(self, path, timeout=None):
+        return self.send_request('GET', path, timeout=timeout)
+
+    def post(self, path, body=None, timeout=None):
+        return self.send_request('POST', path, body, timeout)
+
+    def put(self, path, body=None, timeout=None):
+        return self.send_request('PUT', path, body, timeout)
+
+    def delete(self, path, body=None, timeout=None):
+        return self.send_request('DELETE', path, body, timeout)
+
+    def close(self):
+        """Close every pooled connection of the shared session
+
+        The session stays usable: new connections are opened on the next request.
+        """
+        self.session.close()
+
+    def __to_json(self, request):
         if request.content == b'':
             return request
-        return request.json()
+        return self.config.json_codec.loads(request.content)
 
-    @staticmethod
-    def __validate(request):
+    def __validate(self, request):
         try:
             request.raise_for_status()
-            return HttpRequests.__to_json(request)
+            return self.__to_json(request)
         except requests.exceptions.HTTPError as err:
             raise MeiliSearchApiError(err, request) from err
+
+def connection_failed(err):
+    """Whether a connection error happened before the request could be sent"""
+    if isinstance(err, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(err.args[0], 'reason', None) if err.args else None
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
@@ -0,0 +1,66 @@
+import asyncio
+
+CHUNK_SIZE = 1 << 16
+
+def is_file_like(body):
+    return hasattr(body, 'read') and callable(body.read)
+
+class Serialized:
+    """Body already serialized to JSON by the caller, to be sent as is
+
+    Only document payloads are wrapped (see `documents_body`): any other body, a str
+    included, is serialized to JSON.
+    """
+
+    __slots__ = ('body',)
+
+    def __init__(self, body):
+        self.body = body
+
+def documents_body(documents):
+    """Documents wrapped as Serialized when given as a str, bytes, memoryview or file object"""
+    return Serialized(documents) if raw_payload(documents) is not None else documents
+
+def raw_payload(body):
+    """Body already serialized by the caller, to be sent as is
+
+    Returns bytes, a byte memoryview, or the file object itself, and None when
+    `body` has to be serialized to JSON.
+    """
+    if isinstance(body, (bytes, bytearray)):
+        return body
+    if isinstance(body, memoryview):
+        # Sized in bytes whatever the item format, without copying the buffer
+        return body if body.format == 'B' and body.ndim == 1 else body.cast('B')
+    if isinstance(body, str):
+        return body.encode('utf-8')
+    if is_file_like(body):
+        return body
+    return None
+
+def is_buffered(data):
+    """Whether an encoded body is held in memory, and can be sent again"""
+    return data is None or isinstance(data, (bytes, bytearray, memoryview))
+
+def _encode_chunk(chunk):
+    return chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+
+def iter_chunks(fileobj, chunk_size=CHUNK_SIZE):
+    """Read a file object chunk by chunk, sent with chunked transfer encoding
+
+    Text files are encoded to UTF-8 as they are read.
+    """
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return
+        yield _encode_chunk(chunk)
+
+async def aiter_chunks(fileobj, chunk_size=CHUNK_SIZE):
+    """Like iter_chunks, reading the file in the default executor"""
+    loop = asyncio.get_event_loop()
+    while True:
+        chunk = await loop.run_in_executor(None, fileobj.read, chunk_size)
+        if not chunk:
+            return
+        yield _encode_chunk(chunk)
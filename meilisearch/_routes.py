@@ -0,0 +1,64 @@
+from meilisearch.config import Config
+
+PATHS = Config.Paths()
+
+def path_segments(path):
+    """Segments of a route path, without its query string"""
+    return path.split('?', 1)[0].strip('/').split('/')
+
+def index_uid(path):
+    """UID of the index targeted by a route, or None for the other routes"""
+    segments = path_segments(path)
+    if len(segments) >= 2 and segments[0] == PATHS.index:
+        return segments[1]
+    return None
+
+def is_search(path):
+    segments = path_segments(path)
+    return len(segments) == 3 and segments[0] == PATHS.index and segments[2] == PATHS.search
+
+def is_replica_read(http_method, path):
+    """Whether a request can be served by a read replica: searches, reads of documents and settings"""
+    segments = path_segments(path)
+    if len(segments) < 3 or segments[0] != PATHS.index:
+        return False
+    if http_method == 'POST':
+        return is_search(path)
+    return http_method == 'GET' and segments[2] in (PATHS.search, PATHS.document, PATHS.setting)
+
+def is_read(http_method, path):
+    """Whether a request only reads data: any GET, and searches"""
+    return http_method == 'GET' or (http_method == 'POST' and is_search(path))
+
+def is_upload(http_method, path):
+    """Whether a request uploads documents or settings to an index"""
+    segments = path_segments(path)
+    return (
+        http_method in ('POST', 'PUT')
+        and len(segments) >= 3
+        and segments[0] == PATHS.index
+        and segments[2] in (PATHS.document, PATHS.setting)
+    )
+
+def operation_class(http_method, path):
+    """Class of a request for the RequestLimiter: 'search', 'read', 'write' or 'admin'"""
+    if http_method == 'POST' and is_search(path):
+        return 'search'
+    if index_uid(path) is None:
+        return 'admin'
+    if http_method == 'GET':
+        return 'search' if is_search(path) else 'read'
+    return 'write'
+
+def route_template(path):
+    """Route of a request without its identifiers, ex: 'indexes/{index_uid}/documents/{document_id}'"""
+    segments = path_segments(path)
+    if segments[0] == PATHS.index and len(segments) >= 2:
+        segments[1] = '{index_uid}'
+        if len(segments) >= 4 and segments[2] == PATHS.document and segments[3] != 'delete-batch':
+            segments[3] = '{document_id}'
+        elif len(segments) >= 4 and segments[2] == PATHS.update:
+            segments[3] = '{update_id}'
+    elif segments[0] == PATHS.dumps and len(segments) >= 2:
+        segments[1] = '{dump_uid}'
+    return '/'.join(segments)
@@ -0,0 +1,81 @@
+import asyncio
+import copy
+import threading
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SearchCoalescer:
+    """
+    Single-flight execution of identical searches
+
+    While a search is in flight, callers asking for the same key wait for its
+    result instead of sending their own request. Nothing is kept once the request
+    completes, so coalescing never serves stale results.
+    Each waiting caller gets its own copy of the result.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self.__calls = {}
+        self.__tasks = {}
+        self.__lock = threading.Lock()
+
+    def run(self, key, func):
+        """Call `func`, or wait for the identical call already in flight"""
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.__calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+        try:
+            call.result = func()
+            return call.result
+        except Exception as err:
+            call.error = err
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.done.set()
+
+    async def run_async(self, key, coroutine_function):
+        """Await `coroutine_function()`, or the identical coroutine already in flight
+
+        The request runs in its own task: cancelling one of the waiting callers
+        does not cancel it for the others.
+        """
+        task_key = (id(asyncio.get_running_loop()), key)
+        with self.__lock:
+            task = self.__tasks.get(task_key)
+            leader = task is None
+            if leader:
+                task = self.__tasks[task_key] = asyncio.ensure_future(coroutine_function())
+                task.add_done_callback(lambda _: self.__forget_task(task_key))
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        result = await asyncio.shield(task)
+        return result if leader else copy.deepcopy(result)
+
+    def __forget_task(self, task_key):
+        with self.__lock:
+            self.__tasks.pop(task_key, None)
+
+    def stats(self):
+        """Number of searches sent (leaders) and of callers that joined one (coalesced)"""
+        with self.__lock:
+            return {'leaders': self.leaders, 'coalesced': self.coalesced}
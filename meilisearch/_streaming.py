@@ -0,0 +1,214 @@
+import csv
+import gzip
+import io
+import json
+import math
+import re
+from time import monotonic
+
+FILE_FORMATS = ('json', 'ndjson', 'csv')
+
+# Escapes (including a backslash ending a chunk), quotes and brackets of a JSON text
+JSON_STRUCTURE = re.compile(r'\\.|\\\Z|["\[\]{}]', re.DOTALL)
+
+def csv_number(value):
+    """Integer or float of a CSV value, refusing inf and nan, which JSON cannot represent"""
+    try:
+        return int(value)
+    except ValueError:
+        number = float(value)
+    if not math.isfinite(number):
+        raise ValueError('{!r} is not a finite number'.format(value))
+    return number
+
+CSV_HEADER_TYPES = {
+    'string': str,
+    'number': csv_number,
+    'boolean': lambda value: value.strip().lower() in ('true', '1', 'yes'),
+}
+
+class JsonObjectScanner:
+    """Find the end of a JSON object split over several chunks, each chunk being scanned once"""
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text, start=0):
+        """Position after the end of the object in `text`, or None when it continues in the next chunk"""
+        if self.escaped:
+            start += 1
+            self.escaped = False
+        for match in JSON_STRUCTURE.finditer(text, start):
+            token = match.group()
+            if token[0] == '\\':
+                self.escaped = len(token) == 1
+            elif self.in_string:
+                self.in_string = token != '"'
+            elif token == '"':
+                self.in_string = True
+            elif token in '{[':
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if not self.depth:
+                    return match.end()
+        return None
+
+def iter_json_array(text_file, chunk_size=1 << 16):
+    """Parse a JSON array of objects incrementally
+
+    Only the current chunk and the document being decoded are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    in_array = False
+    while True:
+        while position < len(buffer) and (buffer[position].isspace() or (in_array and buffer[position] == ',')):
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                raise ValueError('Unterminated JSON array' if in_array else 'Expected a JSON array of documents')
+            chunk = text_file.read(chunk_size)
+            buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+            continue
+        if not in_array:
+            if buffer[position] != '[':
+                raise ValueError('Expected a JSON array of documents')
+            in_array = True
+            position += 1
+            continue
+        if buffer[position] == ']':
+            return
+        if buffer[position] != '{':
+            raise ValueError('Expected a JSON object, found {!r}'.format(buffer[position]))
+        try:
+            document, position = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise
+            # The document continues in the next chunks: they are kept apart and
+            # scanned once for its end, then decoded together
+            parts = []
+            scanner = JsonObjectScanner()
+            end = scanner.feed(buffer, position)
+            while end is None and buffer:
+                parts.append(buffer[position:])
+                buffer, position = text_file.read(chunk_size), 0
+                end = scanner.feed(buffer)
+            parts.append(buffer[position:end])
+            document, _ = decoder.raw_decode(''.join(parts))
+            position = len(buffer) if end is None else end
+        yield document
+
+def iter_ndjson(text_file):
+    """Parse newline-delimited JSON, one document per line"""
+    for line in text_file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def iter_csv(text_file, csv_types=None, delimiter=','):
+    """Parse CSV rows into documents
+
+    Values are strings unless typed, either by `csv_types` ({column: callable}) or by
+    the header, with the `column:type` notation of MeiliSearch (string, number, boolean).
+    Empty typed values become None.
+    """
+    reader = csv.reader(text_file, delimiter=delimiter)
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    columns = []
+    for name in header:
+        field, _, type_hint = name.partition(':')
+        if type_hint and type_hint not in CSV_HEADER_TYPES:
+            raise ValueError('Unknown CSV type {!r} for column {!r}'.format(type_hint, field))
+        converter = (csv_types or {}).get(field) or CSV_HEADER_TYPES.get(type_hint)
+        columns.append((field, converter))
+    for row in reader:
+        if not row:
+            continue
+        document = {}
+        for (field, converter), value in zip(columns, row):
+            if converter is None:
+                document[field] = value
+            elif value == '':
+                document[field] = None
+            else:
+                try:
+                    document[field] = converter(value)
+                except ValueError as err:
+                    raise ValueError('Invalid value {!r} in CSV column {!r}: {}'.format(value, field, err)) from err
+        yield document
+
+class DocumentFileReader:
+    """Iterate over the documents of a JSON, NDJSON or CSV file (optionally gzipped)
+
+    The reader keeps track of the bytes read, to report the throughput.
+    """
+
+    def __init__(self, path, file_format=None, csv_types=None):
+        self.path = str(path)
+        name = self.path[:-3] if self.path.endswith('.gz') else self.path
+        if file_format is None:
+            file_format = name.rsplit('.', 1)[-1].lower()
+            if file_format == 'jsonl':
+                file_format = 'ndjson'
+        if file_format not in FILE_FORMATS:
+            raise ValueError('Unsupported file format {!r}, expected one of {}'.format(
+                file_format, ', '.join(FILE_FORMATS)
+            ))
+        self.file_format = file_format
+        self.csv_types = csv_types
+        self.documents = 0
+        self.started_at = None
+        self.__bytes_read = 0
+        self.__binary = None
+
+    def __iter__(self):
+        if self.path.endswith('.gz'):
+            self.__binary = gzip.open(self.path, 'rb')
+        else:
+            self.__binary = open(self.path, 'rb') # pylint: disable=consider-using-with
+        self.started_at = monotonic()
+        try:
+            text_file = io.TextIOWrapper(self.__binary, encoding='utf-8', newline='')
+            if self.file_format == 'json':
+                documents = iter_json_array(text_file)
+            elif self.file_format == 'ndjson':
+                documents = iter_ndjson(text_file)
+            else:
+                documents = iter_csv(text_file, self.csv_types)
+            for document in documents:
+                self.documents += 1
+                yield document
+        finally:
+            self.__bytes_read = self.bytes_read
+            self.__binary.close()
+
+    @property
+    def bytes_read(self):
+        """Bytes read from the file so far (uncompressed for gzipped files)"""
+        if self.__binary is not None and not self.__binary.closed:
+            self.__bytes_read = self.__binary.tell()
+        return self.__bytes_read
+
+    @property
+    def elapsed(self):
+        return monotonic() - self.started_at if self.started_at else 0.0
+
+    def progress(self):
+        """Documents and bytes read so far, and the throughput in MB/s"""
+        bytes_read = self.bytes_read
+        elapsed = self.elapsed
+        return {
+            'documents': self.documents,
+            'bytes': bytes_read,
+            'elapsed': elapsed,
+            'megabytesPerSecond': bytes_read / 1000000 / elapsed if elapsed else 0.0,
+        }
@@ -0,0 +1,28 @@
+import random
+
+class UpdateBackoff:
+    """Polling intervals growing exponentially, with jitter, while nothing changes"""
+
+    def __init__(self, interval_in_ms, max_interval_in_ms):
+        self.interval_in_ms = interval_in_ms
+        self.max_interval_in_ms = max(interval_in_ms, max_interval_in_ms)
+        self.attempt = 0
+
+    def next_interval(self, progressed):
+        """Seconds to wait before the next poll
+
+        The interval goes back to its initial value when the last poll made progress.
+        """
+        if progressed:
+            self.attempt = 0
+        ceiling = min(self.max_interval_in_ms, self.interval_in_ms * 2 ** self.attempt)
+        self.attempt += 1
+        # "Equal jitter": at least half of the interval, so polling never spins
+        return random.uniform(ceiling / 2, ceiling) / 1000
+
+def completed_updates(all_update_status, update_ids):
+    """Statuses of `update_ids` that are no longer enqueued, in update order"""
+    return [
+        update for update in all_update_status
+        if update['updateId'] in update_ids and update['status'] != 'enqueued'
+    ]
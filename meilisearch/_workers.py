@@ -0,0 +1,49 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 32
+
+class WorkerPool:
+    """
+    Threads running calls on behalf of the synchronous client
+
+    The threads are started on first use, and stopped by `shutdown` (ex: when the
+    client is closed). A pool shut down starts new threads if it is used again.
+    """
+
+    def __init__(self, name, max_workers=None):
+        """
+        Parameters
+        ----------
+        name: str
+            Suffix of the name of the threads (ex: hedging)
+        max_workers (optional): int
+            Number of threads, 32 by default
+        """
+        self.name = name
+        self.max_workers = max_workers or DEFAULT_WORKERS
+        self.__lock = threading.Lock()
+        self.__executor = None
+
+    def submit(self, func, *args):
+        """Run `func(*args)` in a thread, in a copy of the current context (ex: its deadline)
+
+        Returns
+        ----------
+        future: concurrent.futures.Future
+        """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='meilisearch-{}'.format(self.name)
+                )
+            return self.__executor.submit(contextvars.copy_context().run, func, *args)
+
+    def shutdown(self):
+        """Stop the threads once the calls they are running return"""
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,142 @@
+from meilisearch.client import Client
+from meilisearch.config import Config
+from meilisearch.async_index import AsyncIndex
+from meilisearch._async_httprequests import AsyncHttpRequests, bounded_gather
+from meilisearch.errors import MeiliSearchApiError
+
+# pylint: disable=invalid-overridden-method
+class AsyncClient(Client):
+    """
+    An asyncio client for the MeiliSearch API
+
+    AsyncClient exposes the same methods as Client, as coroutines, and creates
+    AsyncIndex instances. Requests are sent through an aiohttp session with its own
+    connection pool, shared by the client and its indexes.
+    It requires aiohttp: pip install meilisearch[async]
+    """
+
+    def __init__(self, url, apiKey=None, **options):
+        """
+        Parameters
+        ----------
+        url : str
+            The url to the MeiliSearch API (ex: http://localhost:7700)
+        apiKey : str
+            The optional API key for MeiliSearch
+        options : **kwargs
+            Optional configuration parameters passed to Config
+            (ex: pool_maxsize, keep_alive)
+        """
+        # pylint: disable=super-init-not-called
+        self.config = Config(url, apiKey, **options)
+        self.http = AsyncHttpRequests(self.config)
+
+    def __enter__(self):
+        raise TypeError('AsyncClient is an asynchronous context manager: use `async with AsyncClient(...)`')
+
+    def __exit__(self, *exc_info):
+        pass # never entered
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the aiohttp session of the client and its indexes"""
+        await self.http.close()
+        self.config.nodes.close()
+
+    async def create_index(self, uid, options=None):
+        """Create an index.
+
+        Parameters
+        ----------
+        uid: str
+            UID of the index
+        options: dict, optional
+            Options passed during index creation (ex: primaryKey)
+
+        Returns
+        -------
+        index : AsyncIndex
+            an instance of AsyncIndex containing the information of the newly created index
+        Raises
+        ------
+        HTTPError
+            In case of any other error found here https://docs.meilisearch.com/references/#errors-status-code
+        """
+        index = AsyncIndex(self.config, uid)
+        await index.create(self.config, uid, options)
+        return index
+
+    async def get_indexes(self):
+        """Get all indexes.
+
+        Raises
+        ------
+        HTTPError
+            In case of any error found here https://docs.meilisearch.com/references/#errors-status-code
+        Returns
+        -------
+        list
+            List of indexes in dictionnary format. (e.g [{ 'uid': 'movies' 'primaryKey': 'objectID' }])
+        """
+        return await AsyncIndex.get_indexes(self.config)
+
+    def get_index(self, uid):
+        """Get an index.
+
+        No request is sent: the returned AsyncIndex is used to call the index routes.
+
+        Returns
+        -------
+        index : AsyncIndex
+            an instance of AsyncIndex for the given uid
+        """
+        return AsyncIndex.get_index(self.config, uid=uid)
+
+    async def get_or_create_index(self, uid, options=None):
+        """Get an index, or create it if it doesn't exist.
+
+        Parameters
+        ----------
+        uid: str
+            UID of the index
+        options: dict, optional
+            Options passed during index creation (ex: primaryKey)
+
+        Returns
+        -------
+        index : AsyncIndex
+            an instance of AsyncIndex containing the information of the retrieved or newly created index
+        Raises
+        ------
+        HTTPError
+            In case of any other error found here https://docs.meilisearch.com/references/#errors-status-code
+        """
+        index = self.get_index(uid)
+        try:
+            await index.create(self.config, uid, options)
+        except MeiliSearchApiError as err:
+            if err.error_code != 'index_already_exists':
+                raise err
+        return index
+
+    async def gather(self, awaitables, concurrency=None):
+        """Await many requests with a bounded number of them in flight
+
+        Parameters
+        ----------
+        awaitables: iterable
+            Coroutines to await (ex: searches on several indexes)
+        concurrency (optional): int
+            Maximum number of coroutines running at once, defaults to the connection pool size
+
+        Returns
+        ----------
+        results: list
+            Results of the coroutines, in the order of `awaitables`
+        """
+        return await bounded_gather(awaitables, concurrency or self.config.pool_maxsize)
@@ -0,0 +1,480 @@
+import asyncio
+from collections import deque
+from time import monotonic, perf_counter
+from meilisearch.deadline import expires_at
+from meilisearch.index import Index
+from meilisearch._async_httprequests import AsyncHttpRequests, bounded_gather
+from meilisearch._batching import document_page_parameters, encoded_batches
+from meilisearch.search_cache import canonical_key
+from meilisearch._export import DocumentWriter
+from meilisearch.errors import MeiliSearchError
+from meilisearch.replication import ReplicatedResponse, UpdatePoll
+from meilisearch._streaming import DocumentFileReader
+from meilisearch._updates import UpdateBackoff, completed_updates
+
+# pylint: disable=invalid-overridden-method
+class AsyncIndex(Index):
+    """
+    Indexes routes wrapper for asyncio
+
+    AsyncIndex exposes the same methods as Index, as coroutines: every call to the
+    MeiliSearch API has to be awaited (ex: `await index.search('prince')`).
+    The requests are sent through the aiohttp session of the AsyncClient.
+    """
+
+    def __init__(self, config, uid):
+        """
+        Parameters
+        ----------
+        config : Config
+            Config object containing permission and location of meilisearch
+        uid: str
+            Uid of the index on which to perform the index actions.
+        """
+        # pylint: disable=super-init-not-called
+        self.config = config
+        self.uid = uid
+        self.http = AsyncHttpRequests(config)
+
+    async def get_primary_key(self):
+        """Get the primary key
+
+        Returns
+        ----------
+        primary_key: str
+            String containing primary key.
+        """
+        return (await self.info())['primaryKey']
+
+    @staticmethod
+    async def create(config, uid, options=None):
+        """Create an index.
+
+        Parameters
+        ----------
+        uid: str
+            UID of the index
+        options: dict, optional
+            Options passed during index creation (ex: primaryKey)
+
+        Returns
+        -------
+        index : dict
+            Information of the newly created index
+        Raises
+        ------
+        HTTPError
+            In case of any error found here https://docs.meilisearch.com/references/#errors-status-code
+        """
+        if options is None:
+            options = {}
+        payload = {**options, 'uid': uid}
+        return await AsyncHttpRequests(config).post(config.paths.index, payload)
+
+    @staticmethod
+    async def get_indexes(config):
+        """Get all indexes from meilisearch.
+
+        Returns
+        -------
+        indexes : list
+            List of indexes (dict)
+        Raises
+        ------
+        HTTPError
+            In case of any error found here https://docs.meilisearch.com/references/#errors-status-code
+        """
+        return await AsyncHttpRequests(config).get(config.paths.index)
+
+    @staticmethod
+    def get_index(config, uid):
+        """Get AsyncIndex instance from given index
+
+        If the argument `uid` aren't passed in, it will raise an exception.
+
+        Returns
+        -------
+        index : AsyncIndex
+            Instance of AsyncIndex with the given index.
+        Raises
+        ------
+        Exception
+            If index UID is missing.
+        """
+        if uid is not None:
+            return AsyncIndex(config, uid=uid)
+        raise Exception('Uid is needed to find index')
+
+    async def search(self, query, opt_params=None, timeout=None):
+        """Search in meilisearch
+
+        Parameters
+        ----------
+        query: str
+            String containing the searched word(s)
+        opt_params: dict
+            Dictionnary containing optional query parameters
+            https://docs.meilisearch.com/references/search.html#search-in-an-index
+        timeout (optional): float or tuple
+            Timeout of the request, overriding the timeout of the client
+        Returns
+        ----------
+        results: `dict`
+            Dictionnary with hits, offset, limit, processingTime and initial query.
+            Served from the search cache of the client when it is enabled, or shared
+            with an identical search in flight when searches are coalesced.
+            Recorded by the search recorder of the client, when it has one.
+        """
+        if opt_params is None:
+            opt_params = {}
+        body = {
+            'q': query,
+            **opt_params
+        }
+        recorder = self.config.search_recorder
+        if recorder is None:
+            return await self._search(body, timeout)
+        started_at = perf_counter()
+        try:
+            results = await self._search(body, timeout)
+        except Exception as err:
+            recorder.record(self.uid, body, started_at, perf_counter() - started_at, err)
+            raise
+        recorder.record(self.uid, body, started_at, perf_counter() - started_at)
+        return results
+
+    async def _search(self, body, timeout):
+        cache = self.config.search_cache
+        if cache is not None:
+            results = cache.get(self.uid, body)
+            if results is not None:
+                return results
+        search_path = '{}/{}/{}'.format(
+            self.config.paths.index,
+            self.uid,
+            self.config.paths.search
+        )
+        # Hedged over several nodes when the client has a hedge policy
+        post = self.http.post if self.config.hedge_policy is None else self.http.hedged_post
+        coalescer = self.config.search_coalescer
+        if coalescer is None:
+            results = await post(search_path, body=body, timeout=timeout)
+        else:
+            results = await coalescer.run_async(
+                canonical_key(self.uid, body),
+                lambda: post(search_path, body=body, timeout=timeout)
+            )
+        if cache is not None:
+            cache.set(self.uid, body, results)
+        return results
+
+    async def wait_for_pending_update(self, update_id, timeout_in_ms=5000, interval_in_ms=50):
+        """Wait until MeiliSearch processes an update, and get its status
+
+        The event loop is free to run other tasks between two status requests.
+
+        Parameters
+        ----------
+        update_id: int or ReplicatedResponse
+            identifier of the update to retrieve, or the response of a replicated write
+        timeout_in_ms (optional): int
+            time the method should wait before rising a TimeoutError, capped by the deadline of the client
+        interval_in_ms (optional): int
+            time interval the method should wait (sleep) between requests
+        Returns
+        ----------
+        update: `dict`
+            Dictionary containing the details of the processed update status,
+            or a ReplicatedResponse for the response of a replicated write.
+        """
+        if isinstance(update_id, ReplicatedResponse):
+            return await self._wait_for_replicated_update(update_id, timeout_in_ms, interval_in_ms)
+        deadline = expires_at(timeout_in_ms)
+        while monotonic() < deadline:
+            get_update = await self.get_update_status(update_id)
+            if get_update['status'] != 'enqueued':
+                self._invalidate_search_cache()
+                return get_update
+            await asyncio.sleep(max(0, min(interval_in_ms / 1000, deadline - monotonic())))
+        raise TimeoutError
+
+    async def _wait_for_replicated_update(self, update, timeout_in_ms, interval_in_ms):
+        nodes = self.config.nodes
+        poll = UpdatePoll(self.config.replication, update)
+        deadline = expires_at(timeout_in_ms)
+        while True:
+            urls = list(poll.pending)
+            polled = await asyncio.gather(*[
+                self.http.send_request('GET', self._update_path(poll.pending[url]), node=nodes.node(url))
+                for url in urls
+            ], return_exceptions=True)
+            for url, status in zip(urls, polled):
+                if not isinstance(status, BaseException):
+                    poll.record(url, status, None)
+                elif isinstance(status, MeiliSearchError):
+                    poll.record(url, None, status)
+                else:
+                    raise status
+            if poll.done():
+                break
+            if monotonic() >= deadline:
+                raise TimeoutError
+            await asyncio.sleep(max(0, min(interval_in_ms / 1000, deadline - monotonic())))
+        self._invalidate_search_cache()
+        return poll.response()
+
+    async def wait_for_updates(self, update_ids, timeout_in_ms=5000, interval_in_ms=50, max_interval_in_ms=1000):
+        """Wait until MeiliSearch processes several updates, yielding each one once processed
+
+        Asynchronous generator, to be used with `async for`. See Index.wait_for_updates.
+
+        Parameters
+        ----------
+        update_ids: iterable
+            identifiers of the updates to wait for (ex: the `updateId` of each batch)
+        timeout_in_ms (optional): int
+            time the method should wait before rising a TimeoutError, capped by the deadline of the client
+        interval_in_ms (optional): int
+            initial time interval the method should wait (sleep) between requests
+        max_interval_in_ms (optional): int
+            maximum time interval between requests
+        Returns
+        ----------
+        updates: async generator
+            Update status dictionaries, yielded as soon as each update completes.
+        """
+        waiting = set(update_ids)
+        deadline = expires_at(timeout_in_ms)
+        backoff = UpdateBackoff(interval_in_ms, max_interval_in_ms)
+        while waiting:
+            completed = completed_updates(await self.get_all_update_status(), waiting)
+            if completed:
+                self._invalidate_search_cache()
+            for update in completed:
+                waiting.discard(update['updateId'])
+                yield update
+            if not waiting:
+                return
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                raise TimeoutError
+            await asyncio.sleep(min(backoff.next_interval(bool(completed)), remaining))
+
+    async def iter_documents(self, batch_size=1000, attributes_to_retrieve=None, prefetch=1):
+        """Iterate over all the documents of the index
+
+        Asynchronous generator, to be used with `async for`. While a page is being
+        consumed, the next `prefetch` pages are fetched concurrently.
+
+        Parameters
+        ----------
+        batch_size (optional): int
+            Number of documents fetched per request
+        attributes_to_retrieve (optional): list
+            Attributes of the documents to retrieve, all of them by default
+        prefetch (optional): int
+            Number of pages fetched ahead
+        Returns
+        ----------
+        documents: async generator
+            Dictionnaries, each containing a document
+        """
+        async for page in self._document_pages(batch_size, attributes_to_retrieve, prefetch):
+            for document in page:
+                yield document
+
+    async def export(
+            self,
+            path_or_fileobj,
+            format='ndjson', # pylint: disable=redefined-builtin
+            workers=4,
+            batch_size=1000,
+            attributes_to_retrieve=None,
+            compression=None,
+            progress=None
+        ):
+        """Export all the documents of the index to a file
+
+        See Index.export. The pages are fetched by concurrent tasks.
+
+        Returns
+        ----------
+        documents: int
+            Number of documents exported
+        """
+        writer = DocumentWriter(path_or_fileobj, format, compression)
+        try:
+            async for page in self._document_pages(batch_size, attributes_to_retrieve, workers):
+                exported = writer.write_page(page)
+                if progress is not None:
+                    progress(exported)
+        finally:
+            writer.close()
+        return writer.documents
+
+    async def _document_pages(self, batch_size, attributes_to_retrieve=None, prefetch=1):
+        """Asynchronous generator of the pages of documents of the index, in order"""
+        parameters = document_page_parameters(batch_size, attributes_to_retrieve)
+        pages = deque()
+        try:
+            for page_number in range(max(prefetch, 0) + 1):
+                pages.append(asyncio.ensure_future(
+                    self.get_documents({**parameters, 'offset': page_number * batch_size})
+                ))
+            next_offset = len(pages) * batch_size
+            while pages:
+                page = await pages.popleft()
+                if page:
+                    yield page
+                if len(page) < batch_size:
+                    return
+                pages.append(asyncio.ensure_future(
+                    self.get_documents({**parameters, 'offset': next_offset})
+                ))
+                next_offset += batch_size
+        finally:
+            for task in pages:
+                task.cancel()
+
+    async def add_documents_concurrently(self, batches, primary_key=None, concurrency=None):
+        """Add several batches of documents, sending up to `concurrency` of them at once
+
+        Parameters
+        ----------
+        batches: iterable
+            Iterable of batches, each batch being a list of documents or their JSON array
+        primary_key (optional): string
+            The primary-key used in MeiliSearch index. Ignored if already set up.
+        concurrency (optional): int
+            Maximum number of batches in flight, defaults to the connection pool size
+        Returns
+        ----------
+        updates: `list`
+            List of dictionaries containing the update id of each batch, in order
+        """
+        return await bounded_gather(
+            (self.add_documents(batch, primary_key) for batch in batches),
+            concurrency or self.config.pool_maxsize
+        )
+
+    async def update_documents_concurrently(self, batches, primary_key=None, concurrency=None):
+        """Update several batches of documents, sending up to `concurrency` of them at once
+
+        Parameters
+        ----------
+        batches: iterable
+            Iterable of batches, each batch being a list of documents or their JSON array
+        primary_key (optional): string
+            The primary-key used in MeiliSearch index. Ignored if already set up.
+        concurrency (optional): int
+            Maximum number of batches in flight, defaults to the connection pool size
+        Returns
+        ----------
+        updates: `list`
+            List of dictionaries containing the update id of each batch, in order
+        """
+        return await bounded_gather(
+            (self.update_documents(batch, primary_key) for batch in batches),
+            concurrency or self.config.pool_maxsize
+        )
+
+    async def add_documents_in_batches(
+            self,
+            documents,
+            batch_size=1000,
+            primary_key=None,
+            max_batch_bytes=None,
+            concurrency=1
+        ):
+        """Add documents to the index, split in several updates
+
+        Parameters
+        ----------
+        documents: iterable
+            Iterable of dicts containing each a document (ex: a list or a generator)
+        batch_size (optional): int
+            Maximum number of documents sent in one update
+        primary_key (optional): string
+            The primary-key used in MeiliSearch index. Ignored if already set up.
+        max_batch_bytes (optional): int
+            Maximum size of one update once serialized to JSON (ex: the payload limit of the server)
+        concurrency (optional): int
+            Maximum number of batches in flight. Keep 1 to enqueue the updates in order.
+        Returns
+        ----------
+        updates: `list`
+            List of dictionnaries, each containing the update id of one batch
+        """
+        return await self.add_documents_concurrently(
+            encoded_batches(documents, self.config.json_codec.dumps, batch_size, max_batch_bytes),
+            primary_key,
+            concurrency
+        )
+
+    async def update_documents_in_batches(
+            self,
+            documents,
+            batch_size=1000,
+            primary_key=None,
+            max_batch_bytes=None,
+            concurrency=1
+        ):
+        """Update documents in the index, split in several updates
+
+        Parameters
+        ----------
+        documents: iterable
+            Iterable of dicts containing each a document (ex: a list or a generator)
+        batch_size (optional): int
+            Maximum number of documents sent in one update
+        primary_key (optional): string
+            The primary-key used in MeiliSearch index. Ignored if already set up.
+        max_batch_bytes (optional): int
+            Maximum size of one update once serialized to JSON (ex: the payload limit of the server)
+        concurrency (optional): int
+            Maximum number of batches in flight. Keep 1 to enqueue the updates in order.
+        Returns
+        ----------
+        updates: `list`
+            List of dictionnaries, each containing the update id of one batch
+        """
+        return await self.update_documents_concurrently(
+            encoded_batches(documents, self.config.json_codec.dumps, batch_size, max_batch_bytes),
+            primary_key,
+            concurrency
+        )
+
+    async def add_documents_from_file(
+            self,
+            path,
+            format=None, # pylint: disable=redefined-builtin
+            batch_size=1000,
+            primary_key=None,
+            max_batch_bytes=None,
+            csv_types=None,
+            progress=None
+        ):
+        """Add the documents of a JSON, NDJSON or CSV file, in several updates
+
+        See Index.add_documents_from_file. Each batch is read and parsed in the
+        default executor, so the event loop is not blocked by the parsing.
+
+        Returns
+        ----------
+        updates: `list`
+            List of dictionnaries, each containing the update id of one batch
+        """
+        loop = asyncio.get_running_loop()
+        reader = DocumentFileReader(path, format, csv_types)
+        batches = encoded_batches(reader, self.config.json_codec.dumps, batch_size, max_batch_bytes)
+        updates = []
+        try:
+            while True:
+                batch = await loop.run_in_executor(None, next, batches, None)
+                if batch is None:
+                    return updates
+                updates.append(await self.add_documents(batch, primary_key))
+                if progress is not None:
+                    progress(reader.progress())
+        finally:
+            batches.close()
@@ -0,0 +1,208 @@
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
+from meilisearch._batching import document_batches, encoded_batches
+from meilisearch.errors import MeiliSearchError
+
+class BulkIndexerStats:
+    """Progress of a BulkIndexer run"""
+
+    def __init__(self):
+        self.documents = 0
+        self.batches = 0
+        self.bytes = 0
+        self.bytes_sent = 0
+        self.failed_batches = 0
+        self.errors = []
+        self.started_at = monotonic()
+        self.finished_at = None
+
+    @property
+    def elapsed(self):
+        """Seconds elapsed since the start of the run (until its end once finished)"""
+        return (self.finished_at or monotonic()) - self.started_at
+
+    @property
+    def documents_per_second(self):
+        return self.documents / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self):
+        return {
+            'documents': self.documents,
+            'batches': self.batches,
+            'bytes': self.bytes,
+            'bytesSent': self.bytes_sent,
+            'failedBatches': self.failed_batches,
+            'errors': list(self.errors),
+            'elapsed': self.elapsed,
+            'documentsPerSecond': self.documents_per_second,
+            'bytesPerSecond': self.bytes_per_second,
+        }
+
+# pylint: disable=too-many-instance-attributes
+class BulkIndexer:
+    """
+    Parallel ingestion of large document sets into an index
+
+    Batches are serialized and uploaded by a pool of threads, while the number of
+    updates still waiting to be processed by MeiliSearch is capped: the producer
+    pauses as long as `max_pending_updates` of its updates are enqueued, so the
+    update queue of the server never grows unbounded.
+
+    Since the batches are uploaded concurrently, their updates may be enqueued in a
+    different order than the input. Use `workers=1` when a later document must
+    overwrite an earlier one with the same id.
+    """
+
+    def __init__(
+            self,
+            index,
+            batch_size=1000,
+            max_batch_bytes=None,
+            workers=4,
+            max_pending_updates=8,
+            primary_key=None,
+            update=False,
+            interval_in_ms=100
+        ):
+        """
+        Parameters
+        ----------
+        index : Index
+            Index receiving the documents
+        batch_size (optional): int
+            Maximum number of documents sent in one update
+        max_batch_bytes (optional): int
+            Maximum size of one update once serialized to JSON. The worker serializing
+            a batch splits it in several updates when it exceeds this size.
+        workers (optional): int
+            Number of threads serializing and uploading batches
+        max_pending_updates (optional): int
+            Maximum number of updates sent by this indexer and not yet processed by MeiliSearch
+        primary_key (optional): string
+            The primary-key used in MeiliSearch index. Ignored if already set up.
+        update (optional): bool
+            Update the documents (partial update) instead of replacing them
+        interval_in_ms (optional): int
+            Time interval between two update status requests while the update queue is full
+        """
+        self.index = index
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.workers = workers
+        self.max_pending_updates = max_pending_updates
+        self.primary_key = primary_key
+        self.update = update
+        self.interval_in_ms = interval_in_ms
+        self.stats = BulkIndexerStats()
+        self.__pending = []
+        self.__in_flight = 0
+        self.__exception = None
+        self.__lock = threading.Lock()
+
+    def index_documents(self, documents, wait=True, timeout_in_ms=None):
+        """Send all the documents of an iterable
+
+        Parameters
+        ----------
+        documents: iterable
+            Iterable of dicts containing each a document, consumed lazily
+        wait (optional): bool
+            Wait until MeiliSearch has processed every update before returning
+        timeout_in_ms (optional): int
+            Maximum time to wait for the last updates, when `wait` is True
+        Returns
+        ----------
+        stats: BulkIndexerStats
+            Documents and bytes sent, throughput and failed batches
+        """
+        self.stats = BulkIndexerStats()
+        self.__pending = []
+        self.__exception = None
+        uploads = threading.BoundedSemaphore(self.workers * 2)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for batch in document_batches(documents, self.batch_size):
+                uploads.acquire() # pylint: disable=consider-using-with
+                self.__wait_for_pending_updates(self.max_pending_updates - 1)
+                if self.__exception is not None:
+                    break
+                with self.__lock:
+                    self.__in_flight += 1
+                future = executor.submit(self.__upload, batch)
+                future.add_done_callback(lambda future: self.__upload_done(future, uploads))
+        if self.__exception is not None:
+            raise self.__exception
+        if wait:
+            self.__wait_for_pending_updates(0, timeout_in_ms)
+        self.stats.finished_at = monotonic()
+        return self.stats
+
+    def __upload(self, batch):
+        # Serialized and compressed here, in the worker thread. Bounded by size, a
+        # batch is split in as many updates as its documents need.
+        dumps = self.index.config.json_codec.dumps
+        if self.max_batch_bytes is None:
+            self.__send(dumps(batch), len(batch))
+            return
+        for payload in encoded_batches(batch, dumps, self.batch_size, self.max_batch_bytes):
+            self.__send(payload, payload.documents)
+
+    def __send(self, payload, documents):
+        body = payload
+        if self.index.config.compression is not None:
+            body = self.index.config.compression.compress(payload)
+        try:
+            if self.update:
+                response = self.index.update_documents(body, self.primary_key)
+            else:
+                response = self.index.add_documents(body, self.primary_key)
+        except MeiliSearchError as err:
+            self.__record_failure(str(err))
+            return
+        with self.__lock:
+            heapq.heappush(self.__pending, response['updateId'])
+            self.stats.documents += documents
+            self.stats.batches += 1
+            self.stats.bytes += len(payload)
+            self.stats.bytes_sent += len(body)
+
+    def __upload_done(self, future, uploads):
+        with self.__lock:
+            self.__in_flight -= 1
+            if future.exception() is not None and self.__exception is None:
+                self.__exception = future.exception()
+        uploads.release()
+
+    def __record_failure(self, error):
+        with self.__lock:
+            self.stats.failed_batches += 1
+            self.stats.errors.append(error)
+
+    def __wait_for_pending_updates(self, max_pending, timeout_in_ms=None):
+        """Block until at most `max_pending` updates are uploading or enqueued
+
+        MeiliSearch processes the updates of an index in order, so only the oldest
+        pending update is polled.
+        """
+        deadline = None if timeout_in_ms is None else monotonic() + timeout_in_ms / 1000
+        while True:
+            with self.__lock:
+                if len(self.__pending) + self.__in_flight <= max_pending:
+                    return
+                oldest = self.__pending[0] if self.__pending else None
+            if oldest is not None:
+                update = self.index.get_update_status(oldest)
+                if update['status'] != 'enqueued':
+                    with self.__lock:
+                        heapq.heappop(self.__pending)
+                    if update['status'] == 'failed':
+                        self.__record_failure(update.get('error', 'update {} failed'.format(oldest)))
+                    continue
+            if deadline is not None and monotonic() >= deadline:
+                raise TimeoutError
+            sleep(self.interval_in_ms / 1000)
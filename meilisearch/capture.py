@@ -0,0 +1,141 @@
+import gzip
+import json
+import random
+import threading
+import time
+import zlib
+from time import perf_counter
+from meilisearch.metrics import error_code
+
+CAPTURE_FORMAT = 'meilisearch-search-capture'
+CAPTURE_VERSION = 1
+
+class SearchRecorder:
+    """
+    Capture of the searches sent by a client, to replay them later
+
+    Pass an instance to a client to record each call of `Index.search` (its index,
+    body, start time, latency and error code, cache hits included) to a gzipped
+    NDJSON file: `Client(url, apiKey, search_recorder=SearchRecorder('searches.ndjson.gz'))`.
+    The capture is read back by `read_capture`, ex: by the replay load generator
+    of the benchmarks (benchmarks/replay.py).
+
+    Recording a search costs a JSON serialization and a compressed write under a
+    lock; use `sample_rate` to record only a part of heavy traffic.
+    """
+
+    def __init__(self, path, sample_rate=1.0, max_records=None):
+        """
+        Parameters
+        ----------
+        path: str
+            File the capture is written to, overwritten if it exists
+        sample_rate (optional): float
+            Ratio of the searches recorded, picked at random
+        max_records (optional): int
+            Number of searches after which the recording stops
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_records = max_records
+        self.records = 0
+        self.__lock = threading.Lock()
+        self.__started_at = perf_counter()
+        self.__file = gzip.open(path, 'wt', encoding='utf-8')
+        self.__write({
+            'format': CAPTURE_FORMAT,
+            'version': CAPTURE_VERSION,
+            'startedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'sampleRate': sample_rate,
+        })
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, uid, body, started_at, latency, error=None):
+        """Record a search
+
+        Parameters
+        ----------
+        uid: str
+            UID of the searched index
+        body: dict
+            Body of the search, with the query under 'q'
+        started_at: float
+            `perf_counter()` when the search started
+        latency: float
+            Duration of the search in seconds
+        error (optional): Exception
+            Error raised by the search
+        """
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        record = {
+            't': round(started_at - self.__started_at, 6),
+            'i': uid,
+            'b': body,
+            'l': round(latency * 1000, 3),
+        }
+        if error is not None:
+            record['e'] = error_code(error)
+        with self.__lock:
+            if self.__file is None or (self.max_records is not None and self.records >= self.max_records):
+                return
+            self.records += 1
+            self.__write(record)
+
+    def flush(self):
+        """Write the buffered searches to the file, so they survive a crash of the process"""
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.flush()
+
+    def close(self):
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+
+    def __write(self, record):
+        self.__file.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+def read_capture(path):
+    """Read the searches of a capture written by a SearchRecorder
+
+    A capture cut short (ex: the process was killed before closing the recorder) is
+    read up to its last complete search.
+
+    Parameters
+    ----------
+    path: str
+        Path of the capture
+    Returns
+    ----------
+    searches: generator
+        Generator of dicts with the 'time' of each search in seconds since the start
+        of the capture, its 'indexUid', 'body', 'latency' in seconds and 'error' code
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as capture_file:
+        try:
+            try:
+                header = json.loads(capture_file.readline())
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or header.get('format') != CAPTURE_FORMAT:
+                raise ValueError('{} is not a search capture'.format(path))
+            for line in capture_file:
+                if not line.endswith('\n'):
+                    return
+                record = json.loads(line)
+                yield {
+                    'time': record['t'],
+                    'indexUid': record['i'],
+                    'body': record['b'],
+                    'latency': record['l'] / 1000,
+                    'error': record.get('e'),
+                }
+        except (EOFError, zlib.error):
+            return
@@ -1,6 +1,7 @@
 from meilisearch.index import Index
 from meilisearch.config import Config
 from meilisearch._httprequests import HttpRequests
+from meilisearch.deadline import Deadline
 from meilisearch.errors import MeiliSearchApiError
 
 class Client():
@@ -14,18 +15,69 @@ class Client():
     config = None
     http = None
 
-    def __init__(self, url, apiKey=None):
+    def __init__(self, url, apiKey=None, **options):
         """
         Parameters
         ----------
-        url : str
-            The url to the MeiliSearch API (ex: http://localhost:7700)
+        url : str or list
+            The url to the MeiliSearch API (ex: http://localhost:7700), or a list of
+            urls: the primary, receiving every write, then read replicas
         apiKey : str
             The optional API key for MeiliSearch
+        options : **kwargs
+            Optional configuration parameters passed to Config
+            (ex: pool_maxsize, keep_alive, load_balancing)
         """
-        self.config = Config(url, apiKey)
+        self.config = Config(url, apiKey, **options)
         self.http = HttpRequests(self.config)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the connections pooled by the client and its indexes
+
+        The client and its indexes share a single HTTP session: its connections are
+        kept alive between requests until this method is called. The background
+        health probes of the nodes, and the threads of the hedging and replication
+        policies, are stopped as well.
+        """
+        self.http.close()
+        self.config.nodes.close()
+        for policy in (self.config.hedge_policy, self.config.replication):
+            if policy is not None:
+                policy.close()
+
+    @staticmethod
+    def deadline(seconds):
+        """Time budget shared by every request sent within a `with` block
+
+        Retries, polling loops (ex: `wait_for_pending_update`) and every request of
+        the block stop once `seconds` have elapsed, raising MeiliSearchTimeoutError
+        (or TimeoutError for the polling loops). It works the same with `AsyncClient`,
+        which also caps the total duration of the request in flight. With Client, the
+        time left bounds each read from the socket of that request, so a server
+        answering slowly in several chunks can overrun the deadline.
+
+        ```
+        with client.deadline(0.2):
+            index.search('shifu')
+        ```
+
+        Parameters
+        ----------
+        seconds: float
+            Time budget of the block
+        Returns
+        -------
+        deadline: Deadline
+            Context manager
+        """
+        return Deadline(seconds)
+
     def create_index(self, uid, options=None):
         """Create an index.
 
@@ -0,0 +1,144 @@
+import threading
+import zlib
+from time import perf_counter
+
+ENCODINGS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+class CompressedPayload(bytes):
+    """Compressed request body, carrying its Content-Encoding
+
+    A compressed payload is sent as is: it is not compressed a second time.
+    """
+
+    content_encoding = None
+
+class CompressedStream:
+    """Iterable of compressed chunks of a streamed body"""
+
+    def __init__(self, chunks, compression):
+        self.chunks = chunks
+        self.compression = compression
+        self.content_encoding = compression.encoding
+
+    def __iter__(self):
+        compressor = self.compression.compressor()
+        for chunk in self.chunks:
+            data = self.__compress(compressor, chunk)
+            if data:
+                yield data
+        yield self.__compress(compressor, None)
+
+    async def __aiter__(self):
+        compressor = self.compression.compressor()
+        async for chunk in self.chunks:
+            data = self.__compress(compressor, chunk)
+            if data:
+                yield data
+        yield self.__compress(compressor, None)
+
+    def __compress(self, compressor, chunk):
+        """Compress a chunk, or flush the compressor at the end of the stream (chunk is None)"""
+        start = perf_counter()
+        data = compressor.compress(chunk) if chunk is not None else compressor.flush()
+        self.compression.record(
+            len(chunk) if chunk is not None else 0,
+            len(data),
+            perf_counter() - start,
+            bodies=int(chunk is None)
+        )
+        return data
+
+# pylint: disable=too-many-instance-attributes
+class RequestCompression:
+    """
+    Compression of the bodies of document and settings uploads
+
+    Pass an instance (or just the encoding name) to the client to enable it:
+    `Client(url, apiKey, compression=RequestCompression('gzip', level=6, min_size=1024))`.
+    Bodies smaller than `min_size` are sent uncompressed, as the saving would not
+    be worth the CPU time; streamed file objects are always compressed.
+    The counters show the trade-off between the CPU time and the bytes saved.
+    """
+
+    def __init__(self, encoding='gzip', level=6, min_size=1024):
+        """
+        Parameters
+        ----------
+        encoding (optional): str
+            Content-Encoding of the compressed bodies: gzip or deflate
+        level (optional): int
+            zlib compression level, from 1 (fastest) to 9 (smallest)
+        min_size (optional): int
+            Minimum size in bytes of a body to compress
+        """
+        if encoding not in ENCODINGS:
+            raise ValueError('Unsupported encoding {!r}, expected one of {}'.format(
+                encoding, ', '.join(ENCODINGS)
+            ))
+        if not 0 <= level <= 9:
+            raise ValueError('level must be between 0 and 9')
+        self.encoding = encoding
+        self.level = level
+        self.min_size = min_size
+        self.bodies = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self.__lock = threading.Lock()
+
+    def compressor(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, ENCODINGS[self.encoding])
+
+    def compress(self, payload):
+        """Compress a serialized body, or return it unchanged when smaller than min_size
+
+        zlib releases the GIL, so bodies compressed in worker threads (ex: by the
+        BulkIndexer) are compressed in parallel.
+        """
+        if isinstance(payload, CompressedPayload) or len(payload) < self.min_size:
+            return payload
+        start = perf_counter()
+        compressor = self.compressor()
+        compressed = CompressedPayload(compressor.compress(payload) + compressor.flush())
+        compressed.content_encoding = self.encoding
+        self.record(len(payload), len(compressed), perf_counter() - start, bodies=1)
+        return compressed
+
+    def compress_body(self, data):
+        """Compress an encoded body: bytes-like objects at once, iterables of chunks as a stream"""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return self.compress(data)
+        return self.compress_stream(data)
+
+    def compress_stream(self, chunks):
+        """Compress a streamed body chunk by chunk (an iterable or an async iterable)"""
+        return CompressedStream(chunks, self)
+
+    def record(self, bytes_in, bytes_out, seconds, bodies=0):
+        with self.__lock:
+            self.bodies += bodies
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.seconds += seconds
+
+    def stats(self):
+        """Bodies compressed so far, their sizes before and after, and the CPU time spent"""
+        with self.__lock:
+            return {
+                'encoding': self.encoding,
+                'level': self.level,
+                'bodies': self.bodies,
+                'bytesIn': self.bytes_in,
+                'bytesOut': self.bytes_out,
+                'seconds': self.seconds,
+                'ratio': self.bytes_out / self.bytes_in if self.bytes_in else 1.0,
+            }
+
+def get_compression(compression=None):
+    """A RequestCompression instance from the compression option of the client"""
+    if compression is None or isinstance(compression, RequestCompression):
+        return compression
+    return RequestCompression(compression)
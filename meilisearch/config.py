@@ -1,4 +1,10 @@
-class Config:
+from meilisearch._singleflight import SearchCoalescer
+from meilisearch.compression import get_compression
+from meilisearch.instrumentation import RequestHooks
+from meilisearch.json_codec import get_codec
+from meilisearch.nodes import NodePool
+
+class Config: # pylint: disable=too-many-instance-attributes
     """
     A client's credentials and configuration parameters
     """
@@ -23,16 +29,102 @@ class Config:
         attributes_for_faceting = 'attributes-for-faceting'
         dumps = 'dumps'
 
-    def __init__(self, url, api_key=None):
+    def __init__( # pylint: disable=too-many-arguments
+            self,
+            url,
+            api_key=None,
+            pool_connections=10,
+            pool_maxsize=10,
+            pool_block=False,
+            keep_alive=True,
+            search_cache=None,
+            coalesce_searches=False,
+            json_codec=None,
+            compression=None,
+            retry_policy=None,
+            timeout=None,
+            load_balancing='ewma',
+            hedge_policy=None,
+            replication=None,
+            limiter=None,
+            hooks=None,
+            search_recorder=None,
+        ):
         """
         Parameters
         ----------
-        url : str
-            The url to the MeiliSearch API (ex: http://localhost:7700)
+        url : str, list or NodePool
+            The url to the MeiliSearch API (ex: http://localhost:7700), or the urls of
+            several nodes: the primary first, then read replicas
         api_key : str
             The optional API key to access MeiliSearch
+        pool_connections (optional): int
+            Number of connection pools (one per host) kept by the shared HTTP session
+        pool_maxsize (optional): int
+            Maximum number of connections kept open to a host, i.e. the number of
+            requests that can run concurrently without opening a new connection
+        pool_block (optional): bool
+            When True, a request waits for a free connection instead of opening
+            an extra (non-pooled) one when the pool is exhausted
+        keep_alive (optional): bool
+            Keep the connections open between requests. When False, every
+            request asks the server to close its connection.
+        search_cache (optional): SearchCache
+            Cache of search results, disabled when None
+        coalesce_searches (optional): bool
+            When True, identical searches sent while one of them is in flight wait
+            for its result instead of sending their own request
+        json_codec (optional): JsonCodec or str
+            Codec serializing request bodies and parsing responses (ex: 'orjson').
+            Defaults to the fastest installed among orjson, ujson and the standard library.
+        compression (optional): RequestCompression or str
+            Compression of the document and settings uploads ('gzip' or 'deflate'),
+            disabled when None
+        retry_policy (optional): RetryPolicy
+            Retries of the requests failing on a connection error or a transient
+            status (ex: 503 during a restart), disabled when None
+        timeout (optional): float or tuple
+            Seconds to wait for a connection and for the server to answer before
+            raising MeiliSearchTimeoutError: one number for both, or a (connect, read)
+            tuple. None waits forever. The read timeout of Client applies to each read
+            from the socket, not to the whole answer: a server answering slowly in
+            several chunks can take longer. `search`, `get_documents`, `add_documents`
+            and `update_documents` take a `timeout` overriding it per call; use
+            `client.deadline` to bound the other methods.
+        load_balancing (optional): str
+            Selection of the node serving a read among several: 'ewma' or 'least_outstanding'
+        hedge_policy (optional): HedgePolicy
+            Hedging of the searches over several nodes, disabled when None
+        replication (optional): ReplicationPolicy
+            Replication of the writes to every node, disabled when None
+        limiter (optional): RequestLimiter
+            Client-side rate and concurrency limits of the requests, disabled when None
+        hooks (optional): RequestHooks
+            Functions called before and after each request. Hooks can also be
+            registered later on `config.hooks`.
+        search_recorder (optional): SearchRecorder
+            Capture of the searches, to replay them later, disabled when None
         """
 
-        self.url = url
+        self.nodes = url if isinstance(url, NodePool) else NodePool(url, load_balancing)
+        self.url = self.nodes.primary.url
         self.api_key = api_key
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.search_cache = search_cache
+        self.search_coalescer = SearchCoalescer() if coalesce_searches else None
+        self.json_codec = get_codec(json_codec)
+        self.compression = get_compression(compression)
+        self.retry_policy = retry_policy
+        self.timeout = timeout
+        self.hedge_policy = hedge_policy
+        self.replication = replication
+        self.limiter = limiter
+        self.hooks = hooks if hooks is not None else RequestHooks()
+        self.search_recorder = search_recorder
+        self.session = None
+        self.async_session = None
+        self.async_session_loop = None
         self.paths = self.Paths()
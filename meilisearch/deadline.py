@@ -0,0 +1,92 @@
+import contextvars
+from time import monotonic
+from meilisearch.errors import MeiliSearchTimeoutError
+
+_expires_at = contextvars.ContextVar('meilisearch_deadline', default=None)
+
+class Deadline:
+    """
+    Time budget shared by every request sent within a `with` block
+
+    All the attempts of a request (retries included), the polling loops such as
+    `wait_for_pending_update`, and the requests sent from the block run within the
+    budget: once it is spent, the next request fails with MeiliSearchTimeoutError.
+    Deadlines nest, the earliest one wins. The budget is bound to the current thread
+    or asyncio task (and the tasks it creates). The request in flight when the budget
+    runs out is stopped by its timeouts: in total with AsyncClient, per read from the
+    socket with Client.
+
+    ```
+    with client.deadline(0.2):
+        index.search('shifu')
+    ```
+    """
+
+    def __init__(self, seconds):
+        """
+        Parameters
+        ----------
+        seconds: float
+            Time budget of the block
+        """
+        self.seconds = seconds
+        self.expires_at = None
+        self.__token = None
+
+    def __enter__(self):
+        own = monotonic() + self.seconds
+        outer = _expires_at.get()
+        self.expires_at = own if outer is None else min(own, outer)
+        self.__token = _expires_at.set(self.expires_at)
+        return self
+
+    def __exit__(self, *exc_info):
+        _expires_at.reset(self.__token)
+
+    def remaining(self):
+        """Seconds left before the deadline"""
+        return max(0.0, self.expires_at - monotonic())
+
+def remaining():
+    """Seconds left before the current deadline, or None outside of a deadline"""
+    current = _expires_at.get()
+    return None if current is None else current - monotonic()
+
+def expires_at(timeout_in_ms):
+    """Monotonic time at which an operation of `timeout_in_ms` has to stop, capped by the current deadline"""
+    own = monotonic() + timeout_in_ms / 1000
+    current = _expires_at.get()
+    return own if current is None else min(own, current)
+
+def allows(seconds):
+    """Whether `seconds` can still be spent (ex: waiting before a retry) before the deadline"""
+    left = remaining()
+    return left is None or seconds < left
+
+def attempt_timeout(timeout):
+    """Connect and read timeouts of one request, capped by the time left before the deadline
+
+    Parameters
+    ----------
+    timeout: float, tuple or None
+        The timeout of the request: a number for both connecting and reading,
+        a (connect, read) tuple, or None to wait forever
+    Returns
+    ----------
+    timeout: tuple or None
+        The (connect, read) timeouts, or None without timeout nor deadline
+    """
+    if timeout is not None and not isinstance(timeout, tuple):
+        timeout = (timeout, timeout)
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise MeiliSearchTimeoutError('deadline exceeded')
+    if timeout is None:
+        return (left, left)
+    connect, read = timeout
+    return (
+        left if connect is None else min(connect, left),
+        left if read is None else min(read, left),
+    )
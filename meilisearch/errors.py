@@ -15,10 +15,13 @@ class MeiliSearchApiError(MeiliSearchError):
 
     def __init__(self, error, request):
         self.status_code = request.status_code
+        self.error_code = None
+        self.error_link = None
         if request.text:
-            self.message = f'{json.loads(request.text)["message"]}'
-            self.error_code = f'{json.loads(request.text)["errorCode"]}'
-            self.error_link = f'{json.loads(request.text)["errorLink"]}'
+            body = json.loads(request.text)
+            self.message = f'{body["message"]}'
+            self.error_code = f'{body["errorCode"]}'
+            self.error_link = f'{body["errorLink"]}'
         else:
             self.message = error
         super().__init__(self.message)
@@ -31,3 +34,19 @@ class MeiliSearchCommunicationError(MeiliSearchError):
 
     def __str__(self):
         return f'MeiliSearchCommunicationError, {self.message}'
+
+class MeiliSearchTimeoutError(MeiliSearchCommunicationError, TimeoutError):
+    """Request timed out, or deadline exceeded"""
+
+    def __str__(self):
+        return f'MeiliSearchTimeoutError, {self.message}'
+
+class MeiliSearchReplicationError(MeiliSearchError):
+    """Write accepted by fewer nodes than the quorum"""
+
+    def __init__(self, message, errors):
+        self.errors = errors
+        super().__init__(message)
+
+    def __str__(self):
+        return f'MeiliSearchReplicationError, {self.message}'
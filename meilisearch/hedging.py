@@ -0,0 +1,141 @@
+import threading
+from collections import deque
+from meilisearch._workers import DEFAULT_WORKERS, WorkerPool
+
+# Number of latency samples recorded between two computations of the adaptive delay
+RECOMPUTE_EVERY = 16
+
+# pylint: disable=too-many-instance-attributes
+class HedgePolicy:
+    """
+    Hedging of the searches, to cut the tail latency caused by a slow node
+
+    Pass an instance to a client with several nodes to enable it:
+    `Client([primary_url, replica_url], apiKey, hedge_policy=HedgePolicy())`.
+    When a search has not been answered after the hedging delay, the same search is
+    sent to another node, and the first answer wins. The delay is either fixed, or
+    the `percentile` of the latencies observed over the last `window` searches.
+
+    The extra load is capped by a budget: each search adds `max_extra_load` token,
+    each hedge spends one, and no hedge is sent while the budget is empty, so at most
+    `max_extra_load` of the searches are hedged on average (ex: 0.05 for 5%).
+
+    The synchronous client runs the searches it may hedge, and their hedges, in a
+    pool of `max_workers` threads shared by the callers of the client. A search is
+    only handed to the pool when a thread is free, so it never waits in a queue (the
+    wait would count toward the hedging delay); once the threads are busy, searches
+    are sent from the calling thread, without hedging. Size it to the number of
+    searches expected in flight at once, like the connection pool (`pool_maxsize`).
+    """
+
+    def __init__(
+            self,
+            delay_in_ms=None,
+            percentile=0.95,
+            max_extra_load=0.05,
+            window=1000,
+            min_samples=20,
+            initial_delay_in_ms=50,
+            max_workers=DEFAULT_WORKERS
+        ):
+        """
+        Parameters
+        ----------
+        delay_in_ms (optional): int
+            Fixed hedging delay. When None, the delay adapts to the observed latencies.
+        percentile (optional): float
+            Percentile of the recent search latencies used as adaptive delay (ex: 0.95)
+        max_extra_load (optional): float
+            Maximum ratio of hedged searches, i.e. of extra searches sent to the nodes
+        window (optional): int
+            Number of recent search latencies the adaptive delay is computed from
+        min_samples (optional): int
+            Number of latencies to observe before using the adaptive delay
+        initial_delay_in_ms (optional): int
+            Adaptive delay used until `min_samples` latencies are observed
+        max_workers (optional): int
+            Threads of the synchronous client running the searches and their hedges;
+            the searches sent while they are all busy are not hedged
+        """
+        if not 0 < percentile < 1:
+            raise ValueError('percentile must be between 0 and 1')
+        self.delay_in_ms = delay_in_ms
+        self.percentile = percentile
+        self.max_extra_load = max_extra_load
+        self.min_samples = min_samples
+        self.searches = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+        self.saturated = 0
+        self.max_workers = max_workers
+        self.__max_tokens = max(1.0, max_extra_load * 100)
+        self.__tokens = 1.0
+        self.__latencies = deque(maxlen=window)
+        self.__delay = initial_delay_in_ms / 1000
+        self.__lock = threading.Lock()
+        self.__pool = WorkerPool('hedging', max_workers)
+        self.__workers = threading.BoundedSemaphore(max_workers)
+
+    def delay(self):
+        """Seconds to wait for an answer before hedging a search"""
+        if self.delay_in_ms is not None:
+            return self.delay_in_ms / 1000
+        return self.__delay
+
+    def acquire(self):
+        """Whether the budget allows hedging a search, spending a token if so"""
+        with self.__lock:
+            if self.__tokens < 1:
+                self.budget_exhausted += 1
+                return False
+            self.__tokens -= 1
+            self.hedges += 1
+            return True
+
+    def record(self, latency, hedge_won=False):
+        """Record the latency of a search in seconds, refilling the budget"""
+        with self.__lock:
+            self.searches += 1
+            self.__tokens = min(self.__max_tokens, self.__tokens + self.max_extra_load)
+            if hedge_won:
+                self.hedge_wins += 1
+            self.__latencies.append(latency)
+            if len(self.__latencies) >= self.min_samples and self.searches % RECOMPUTE_EVERY == 0:
+                ordered = sorted(self.__latencies)
+                self.__delay = ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+
+    def reserve_worker(self):
+        """Whether a thread of the executor is free, reserving it if so"""
+        if self.__workers.acquire(blocking=False): # pylint: disable=consider-using-with
+            return True
+        with self.__lock:
+            self.saturated += 1
+        return False
+
+    def release_worker(self):
+        self.__workers.release()
+
+    def submit(self, func, *args):
+        """Run `func(*args)` in a thread reserved with `reserve_worker`, in the current context"""
+        def run():
+            try:
+                return func(*args)
+            finally:
+                self.release_worker()
+        return self.__pool.submit(run)
+
+    def close(self):
+        """Stop the threads of the synchronous client, see Client.close"""
+        self.__pool.shutdown()
+
+    def stats(self):
+        with self.__lock:
+            return {
+                'searches': self.searches,
+                'hedges': self.hedges,
+                'hedgeWins': self.hedge_wins,
+                'budgetExhausted': self.budget_exhausted,
+                'saturated': self.saturated,
+                'delayMs': self.delay() * 1000,
+            }
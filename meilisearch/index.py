@@ -1,7 +1,18 @@
+import contextvars
+import functools
 import urllib
-from datetime import datetime
-from time import sleep
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, perf_counter, sleep
 from meilisearch._httprequests import HttpRequests
+from meilisearch._payload import documents_body
+from meilisearch.deadline import expires_at
+from meilisearch.replication import ReplicatedResponse, UpdatePoll
+from meilisearch._batching import document_page_parameters, encoded_batches
+from meilisearch.search_cache import canonical_key
+from meilisearch._export import DocumentWriter
+from meilisearch._streaming import DocumentFileReader
+from meilisearch._updates import UpdateBackoff, completed_updates
 
 # pylint: disable=too-many-public-methods
 class Index():
@@ -169,42 +180,117 @@ class Index():
         update: `list`
             List containing the details of the update status.
         """
-        return self.http.get(
-            '{}/{}/{}/{}'.format(
-                self.config.paths.index,
-                self.uid,
-                self.config.paths.update,
-                update_id
-            )
-        )
+        return self.http.get(self._update_path(update_id))
 
     def wait_for_pending_update(self, update_id, timeout_in_ms=5000, interval_in_ms=50):
         """Wait until MeiliSearch processes an update, and get its status
 
         Parameters
         ----------
-        update_id: int
-            identifier of the update to retrieve
+        update_id: int or ReplicatedResponse
+            identifier of the update to retrieve, or the response of a replicated write
         timeout_in_ms (optional): int
-            time the method should wait before rising a TimeoutError
+            time the method should wait before rising a TimeoutError, capped by the deadline of the client
         interval_in_ms (optional): int
             time interval the method should wait (sleep) between requests
         Returns
         ----------
         update: `dict`
             Dictionary containing the details of the processed update status.
+            For an update sent to every node (see ReplicationPolicy), the statuses
+            are returned as a ReplicatedResponse once a quorum of nodes processed it.
         """
-        start_time = datetime.now()
-        elapsed_time = 0
-        while elapsed_time < timeout_in_ms:
+        if isinstance(update_id, ReplicatedResponse):
+            return self._wait_for_replicated_update(update_id, timeout_in_ms, interval_in_ms)
+        deadline = expires_at(timeout_in_ms)
+        while monotonic() < deadline:
             get_update = self.get_update_status(update_id)
             if get_update['status'] != 'enqueued':
+                self._invalidate_search_cache()
                 return get_update
-            sleep(interval_in_ms / 1000)
-            time_delta = datetime.now() - start_time
-            elapsed_time = time_delta.seconds * 1000 + time_delta.microseconds / 1000
+            sleep(max(0, min(interval_in_ms / 1000, deadline - monotonic())))
         raise TimeoutError
 
+    def _wait_for_replicated_update(self, update, timeout_in_ms, interval_in_ms):
+        """Poll the update of each node concurrently until a quorum of nodes processed it, see UpdatePoll"""
+        nodes = self.config.nodes
+        poll = UpdatePoll(self.config.replication, update)
+        deadline = expires_at(timeout_in_ms)
+        while True:
+            urls = list(poll.pending)
+            outcomes = self.config.replication.run_all([
+                functools.partial(
+                    self.http.send_request, 'GET', self._update_path(poll.pending[url]), node=nodes.node(url)
+                )
+                for url in urls
+            ])
+            for url, (status, error) in zip(urls, outcomes):
+                poll.record(url, status, error)
+            if poll.done():
+                break
+            if monotonic() >= deadline:
+                raise TimeoutError
+            sleep(max(0, min(interval_in_ms / 1000, deadline - monotonic())))
+        self._invalidate_search_cache()
+        return poll.response()
+
+    def _update_path(self, update_id):
+        return '{}/{}/{}/{}'.format(
+            self.config.paths.index,
+            self.uid,
+            self.config.paths.update,
+            update_id
+        )
+
+    def wait_for_updates(self, update_ids, timeout_in_ms=5000, interval_in_ms=50, max_interval_in_ms=1000):
+        """Wait until MeiliSearch processes several updates, yielding each one once processed
+
+        The status of all the updates of the index is fetched once per tick, whatever
+        the number of updates waited for. The interval between two ticks doubles
+        (with jitter) while no update completes, up to `max_interval_in_ms`.
+
+        Parameters
+        ----------
+        update_ids: iterable
+            identifiers of the updates to wait for (ex: the `updateId` of each batch)
+        timeout_in_ms (optional): int
+            time the method should wait before rising a TimeoutError, capped by the deadline of the client
+        interval_in_ms (optional): int
+            initial time interval the method should wait (sleep) between requests
+        max_interval_in_ms (optional): int
+            maximum time interval between requests
+        Returns
+        ----------
+        updates: generator
+            Generator of the update status dictionaries (with `status` processed or
+            failed, and `duration`), yielded as soon as each update completes.
+        Raises
+        ----------
+        TimeoutError
+            If some updates are still enqueued after `timeout_in_ms`
+        """
+        waiting = set(update_ids)
+        deadline = expires_at(timeout_in_ms)
+        backoff = UpdateBackoff(interval_in_ms, max_interval_in_ms)
+        while waiting:
+            completed = completed_updates(self.get_all_update_status(), waiting)
+            if completed:
+                self._invalidate_search_cache()
+            for update in completed:
+                waiting.discard(update['updateId'])
+                yield update
+            if not waiting:
+                return
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                raise TimeoutError
+            sleep(min(backoff.next_interval(bool(completed)), remaining))
+
+    def _invalidate_search_cache(self):
+        """Drop the cached searches of the index, once one of its updates is processed"""
+        if self.config.search_cache is not None:
+            self.config.search_cache.invalidate(self.uid)
+
     def get_stats(self):
         """Get stats of an index
 
@@ -223,7 +309,7 @@ class Index():
             )
         )
 
-    def search(self, query, opt_params=None):
+    def search(self, query, opt_params=None, timeout=None):
         """Search in meilisearch
 
         Parameters
@@ -233,10 +319,15 @@ class Index():
         opt_params: dict
             Dictionnary containing optional query parameters
             https://docs.meilisearch.com/references/search.html#search-in-an-index
+        timeout (optional): float or tuple
+            Timeout of the request, overriding the timeout of the client
         Returns
         ----------
         results: `dict`
-            Dictionnary with hits, offset, limit, processingTime and initial query
+            Dictionnary with hits, offset, limit, processingTime and initial query.
+            Served from the search cache of the client when it is enabled, or shared
+            with an identical search in flight when searches are coalesced.
+            Recorded by the search recorder of the client, when it has one.
         """
         if opt_params is None:
             opt_params = {}
@@ -244,13 +335,42 @@ class Index():
             'q': query,
             **opt_params
         }
-        return self.http.post(
-            '{}/{}/{}'.format(
-                self.config.paths.index,
-                self.uid,
-                self.config.paths.search),
-            body=body
+        recorder = self.config.search_recorder
+        if recorder is None:
+            return self._search(body, timeout)
+        started_at = perf_counter()
+        try:
+            results = self._search(body, timeout)
+        except Exception as err:
+            recorder.record(self.uid, body, started_at, perf_counter() - started_at, err)
+            raise
+        recorder.record(self.uid, body, started_at, perf_counter() - started_at)
+        return results
+
+    def _search(self, body, timeout):
+        cache = self.config.search_cache
+        if cache is not None:
+            results = cache.get(self.uid, body)
+            if results is not None:
+                return results
+        search_path = '{}/{}/{}'.format(
+            self.config.paths.index,
+            self.uid,
+            self.config.paths.search
         )
+        # Hedged over several nodes when the client has a hedge policy
+        post = self.http.post if self.config.hedge_policy is None else self.http.hedged_post
+        coalescer = self.config.search_coalescer
+        if coalescer is None:
+            results = post(search_path, body=body, timeout=timeout)
+        else:
+            results = coalescer.run(
+                canonical_key(self.uid, body),
+                lambda: post(search_path, body=body, timeout=timeout)
+            )
+        if cache is not None:
+            cache.set(self.uid, body, results)
+        return results
 
     def get_document(self, document_id):
         """Get one document with given document identifier
@@ -273,13 +393,15 @@ class Index():
             )
         )
 
-    def get_documents(self, parameters=None):
+    def get_documents(self, parameters=None, timeout=None):
         """Get a set of documents from the index
 
         Parameters
         ----------
         parameters (optional): dict
             parameters accepted by the get documents route: https://docs.meilisearch.com/references/documents.html#get-all-documents
+        timeout (optional): float or tuple
+            Timeout of the request, overriding the timeout of the client
         Returns
         ----------
         document: `dict`
@@ -293,18 +415,133 @@ class Index():
                 self.config.paths.index,
                 self.uid,
                 self.config.paths.document,
-                urllib.parse.urlencode(parameters))
+                urllib.parse.urlencode(parameters)),
+            timeout=timeout
             )
 
-    def add_documents(self, documents, primary_key=None):
+    def iter_documents(self, batch_size=1000, attributes_to_retrieve=None, prefetch=1):
+        """Iterate over all the documents of the index
+
+        Documents are fetched page by page. While a page is being consumed, the next
+        `prefetch` pages are fetched in the background, so at most `prefetch + 1`
+        pages are held in memory whatever the size of the index.
+
+        Parameters
+        ----------
+        batch_size (optional): int
+            Number of documents fetched per request
+        attributes_to_retrieve (optional): list
+            Attributes of the documents to retrieve, all of them by default
+        prefetch (optional): int
+            Number of pages fetched ahead, 0 to fetch each page when it is needed
+        Returns
+        ----------
+        documents: generator
+            Generator of dictionnaries, each containing a document
+        """
+        for page in self._document_pages(batch_size, attributes_to_retrieve, prefetch):
+            yield from page
+
+    def export(
+            self,
+            path_or_fileobj,
+            format='ndjson', # pylint: disable=redefined-builtin
+            workers=4,
+            batch_size=1000,
+            attributes_to_retrieve=None,
+            compression=None,
+            progress=None
+        ):
+        """Export all the documents of the index to a file
+
+        `workers` pages of documents are fetched concurrently and written in order as
+        soon as they arrive, so at most `workers + 1` pages of `batch_size` documents
+        are held in memory whatever the size of the index.
+
+        Parameters
+        ----------
+        path_or_fileobj: str or file object
+            Path of the file to write, or file object opened for writing
+        format (optional): str
+            `ndjson` (one document per line) or `json` (a single JSON array)
+        workers (optional): int
+            Number of pages fetched concurrently
+        batch_size (optional): int
+            Number of documents fetched per request
+        attributes_to_retrieve (optional): list
+            Attributes of the documents to export, all of them by default
+        compression (optional): str
+            `gzip` to compress the output, None to write it as is
+        progress (optional): callable
+            Called with the number of documents exported so far after each page
+        Returns
+        ----------
+        documents: int
+            Number of documents exported
+        """
+        writer = DocumentWriter(path_or_fileobj, format, compression)
+        try:
+            for page in self._document_pages(batch_size, attributes_to_retrieve, workers):
+                exported = writer.write_page(page)
+                if progress is not None:
+                    progress(exported)
+        finally:
+            writer.close()
+        return writer.documents
+
+    def _document_pages(self, batch_size, attributes_to_retrieve=None, prefetch=1):
+        """Generator of the pages of documents of the index, in order"""
+        parameters = document_page_parameters(batch_size, attributes_to_retrieve)
+        if prefetch < 1:
+            offset = 0
+            while True:
+                page = self.get_documents({**parameters, 'offset': offset})
+                if page:
+                    yield page
+                if len(page) < batch_size:
+                    return
+                offset += batch_size
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+        pages = deque()
+        try:
+            for page_number in range(prefetch + 1):
+                # The pages are fetched within the deadline of the caller, if any
+                pages.append(executor.submit(
+                    contextvars.copy_context().run,
+                    self.get_documents,
+                    {**parameters, 'offset': page_number * batch_size}
+                ))
+            next_offset = (prefetch + 1) * batch_size
+            while pages:
+                page = pages.popleft().result()
+                if page:
+                    yield page
+                if len(page) < batch_size:
+                    return
+                pages.append(executor.submit(
+                    contextvars.copy_context().run,
+                    self.get_documents,
+                    {**parameters, 'offset': next_offset}
+                ))
+                next_offset += batch_size
+        finally:
+            for future in pages:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def add_documents(self, documents, primary_key=None, timeout=None):
         """Add documents to the index
 
         Parameters
         ----------
-        documents: list
-            List of dics containing each a document, or json string
+        documents: list, str, bytes, memoryview or file object
+            List of dicts containing each a document, or the JSON array of the documents
+            already serialized, sent as is. A file object opened in binary mode is streamed
+            with chunked transfer encoding, without being loaded in memory.
         primary_key: string
             The primary-key used in MeiliSearch index. Ignored if already set up.
+        timeout (optional): float or tuple
+            Timeout of the request, overriding the timeout of the client
         Returns
         ----------
         update: `dict`
@@ -324,17 +561,21 @@ class Index():
                 self.config.paths.document,
                 urllib.parse.urlencode({'primaryKey': primary_key})
             )
-        return self.http.post(url, documents)
+        return self.http.post(url, documents_body(documents), timeout)
 
-    def update_documents(self, documents, primary_key=None):
+    def update_documents(self, documents, primary_key=None, timeout=None):
         """Update documents in the index
 
         Parameters
         ----------
-        documents: list
-            List of dics containing each a document, or json string
+        documents: list, str, bytes, memoryview or file object
+            List of dicts containing each a document, or the JSON array of the documents
+            already serialized, sent as is. A file object opened in binary mode is streamed
+            with chunked transfer encoding, without being loaded in memory.
         primary_key: string
             The primary-key used in MeiliSearch index. Ignored if already set up.
+        timeout (optional): float or tuple
+            Timeout of the request, overriding the timeout of the client
         Returns
         ----------
         update: `dict`
@@ -354,8 +595,108 @@ class Index():
                 self.config.paths.document,
                 urllib.parse.urlencode({'primaryKey': primary_key})
             )
-        return self.http.put(url, documents)
+        return self.http.put(url, documents_body(documents), timeout)
+
+    def add_documents_in_batches(self, documents, batch_size=1000, primary_key=None, max_batch_bytes=None):
+        """Add documents to the index, split in several updates
+
+        The documents are consumed lazily: each batch is sent as soon as it is full,
+        so MeiliSearch starts indexing before the whole input has been read.
+
+        Parameters
+        ----------
+        documents: iterable
+            Iterable of dicts containing each a document (ex: a list or a generator)
+        batch_size (optional): int
+            Maximum number of documents sent in one update
+        primary_key (optional): string
+            The primary-key used in MeiliSearch index. Ignored if already set up.
+        max_batch_bytes (optional): int
+            Maximum size of one update once serialized to JSON (ex: the payload limit of the server)
+        Returns
+        ----------
+        updates: `list`
+            List of dictionnaries, each containing the update id of one batch:
+            https://docs.meilisearch.com/references/updates.html#get-an-update-status
+        """
+        return [
+            self.add_documents(batch, primary_key)
+            for batch in encoded_batches(documents, self.config.json_codec.dumps, batch_size, max_batch_bytes)
+        ]
+
+    def update_documents_in_batches(self, documents, batch_size=1000, primary_key=None, max_batch_bytes=None):
+        """Update documents in the index, split in several updates
+
+        The documents are consumed lazily: each batch is sent as soon as it is full,
+        so MeiliSearch starts indexing before the whole input has been read.
+
+        Parameters
+        ----------
+        documents: iterable
+            Iterable of dicts containing each a document (ex: a list or a generator)
+        batch_size (optional): int
+            Maximum number of documents sent in one update
+        primary_key (optional): string
+            The primary-key used in MeiliSearch index. Ignored if already set up.
+        max_batch_bytes (optional): int
+            Maximum size of one update once serialized to JSON (ex: the payload limit of the server)
+        Returns
+        ----------
+        updates: `list`
+            List of dictionnaries, each containing the update id of one batch:
+            https://docs.meilisearch.com/references/updates.html#get-an-update-status
+        """
+        return [
+            self.update_documents(batch, primary_key)
+            for batch in encoded_batches(documents, self.config.json_codec.dumps, batch_size, max_batch_bytes)
+        ]
+
+    def add_documents_from_file(
+            self,
+            path,
+            format=None, # pylint: disable=redefined-builtin
+            batch_size=1000,
+            primary_key=None,
+            max_batch_bytes=None,
+            csv_types=None,
+            progress=None
+        ):
+        """Add the documents of a JSON, NDJSON or CSV file, in several updates
+
+        The file is parsed incrementally and each batch is sent as soon as it is full,
+        so the memory used is proportional to one batch, not to the file.
 
+        Parameters
+        ----------
+        path: str
+            Path of the file, optionally gzipped (ex: movies.ndjson.gz)
+        format (optional): str
+            `json` (an array of documents), `ndjson` or `csv`. Guessed from the file extension by default.
+        batch_size (optional): int
+            Maximum number of documents sent in one update
+        primary_key (optional): string
+            The primary-key used in MeiliSearch index. Ignored if already set up.
+        max_batch_bytes (optional): int
+            Maximum size of one update once serialized to JSON
+        csv_types (optional): dict
+            Callables converting the CSV values of some columns (ex: {'price': float}).
+            Column types can also be given in the CSV header (ex: `price:number`).
+        progress (optional): callable
+            Called after each batch with a dictionnary of documents, bytes read,
+            elapsed time and throughput (megabytesPerSecond)
+        Returns
+        ----------
+        updates: `list`
+            List of dictionnaries, each containing the update id of one batch:
+            https://docs.meilisearch.com/references/updates.html#get-an-update-status
+        """
+        reader = DocumentFileReader(path, format, csv_types)
+        updates = []
+        for batch in encoded_batches(reader, self.config.json_codec.dumps, batch_size, max_batch_bytes):
+            updates.append(self.add_documents(batch, primary_key))
+            if progress is not None:
+                progress(reader.progress())
+        return updates
 
     def delete_document(self, document_id):
         """Add documents to the index
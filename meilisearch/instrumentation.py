@@ -0,0 +1,145 @@
+from time import perf_counter
+
+# pylint: disable=too-many-instance-attributes
+class RequestInfo:
+    """
+    Route, sizes and timing of a request, passed to the request hooks
+
+    The wall time of the last attempt is split into `connect` (opening a new
+    connection, 0 when a pooled one is reused), `ttfb` (sending the request and
+    waiting for the first byte of the answer), `download` (reading the body) and
+    `decode` (parsing the JSON). `total` covers the whole request, the failovers
+    and retries included. Times are in seconds.
+    """
+
+    def __init__(self, method, path, route, index_uid):
+        self.method = method
+        self.path = path
+        self.route = route
+        self.index_uid = index_uid
+        self.node = None
+        self.attempts = 0
+        self.status = None
+        self.bytes_out = None
+        self.bytes_in = None
+        self.connect = 0.0
+        self.ttfb = None
+        self.download = None
+        self.decode = None
+        self.total = None
+        self.processing_time_ms = None
+        self.error = None
+        self.started_at = perf_counter()
+        self.__attempt_at = self.started_at
+        self.__headers_at = None
+
+    @property
+    def client_overhead_ms(self):
+        """Time spent outside of the search engine (network, queuing, decoding), when the server reports its own"""
+        if self.total is None or self.processing_time_ms is None:
+            return None
+        return self.total * 1000 - self.processing_time_ms
+
+    def attempt(self, node, data):
+        """Record the start of an attempt to send the request to `node`"""
+        self.attempts += 1
+        self.node = node
+        self.bytes_out = len(data) if isinstance(data, (bytes, bytearray, memoryview)) else None
+        self.connect = 0.0
+        self.__attempt_at = perf_counter()
+
+    def headers_received(self):
+        self.__headers_at = perf_counter()
+        self.ttfb = self.__headers_at - self.__attempt_at - self.connect
+
+    def body_received(self, status, content):
+        self.download = perf_counter() - self.__headers_at
+        self.status = status
+        self.bytes_in = len(content)
+
+    def decoded(self, response, started_at):
+        """Record the time spent decoding `response`, and the processing time reported in it"""
+        self.decode = perf_counter() - started_at
+        if isinstance(response, dict):
+            self.processing_time_ms = response.get('processingTimeMs')
+
+    def finish(self, error=None):
+        self.total = perf_counter() - self.started_at
+        self.error = error
+
+    def to_dict(self):
+        return {
+            'method': self.method,
+            'route': self.route,
+            'indexUid': self.index_uid,
+            'node': self.node,
+            'attempts': self.attempts,
+            'status': self.status,
+            'bytesOut': self.bytes_out,
+            'bytesIn': self.bytes_in,
+            'connect': self.connect,
+            'ttfb': self.ttfb,
+            'download': self.download,
+            'decode': self.decode,
+            'total': self.total,
+            'processingTimeMs': self.processing_time_ms,
+            'clientOverheadMs': self.client_overhead_ms,
+            'error': None if self.error is None else str(self.error),
+        }
+
+class RequestHooks:
+    """
+    Functions called before and after each request sent by a client
+
+    A hook receives the RequestInfo of the request: before sending it, its method,
+    route template (ex: 'indexes/{index_uid}/search') and index uid; after, the
+    node, status, sizes, timing breakdown and processing time reported by
+    MeiliSearch, or the error raised. The hooks run in the thread or asyncio task
+    sending the request, so they have to be quick; an error raised by a hook is
+    raised by the request.
+
+    ```
+    client.config.hooks.register(after=lambda info: print(info.route, info.total))
+    ```
+
+    Without hooks, requests are sent without being timed.
+    """
+
+    def __init__(self, before=None, after=None):
+        """
+        Parameters
+        ----------
+        before (optional): list
+            Functions called with the RequestInfo of each request, before sending it
+        after (optional): list
+            Functions called with the RequestInfo of each request, once answered or failed
+        """
+        self.before = list(before or [])
+        self.after = list(after or [])
+
+    def __bool__(self):
+        return bool(self.before or self.after)
+
+    def register(self, before=None, after=None):
+        """Add a hook called before each request, and/or a hook called after"""
+        if before is not None:
+            self.before.append(before)
+        if after is not None:
+            self.after.append(after)
+
+    def unregister(self, hook):
+        """Remove a hook added by `register`"""
+        for hooks in (self.before, self.after):
+            if hook in hooks:
+                hooks.remove(hook)
+
+    def start(self, method, path, route, index_uid):
+        info = RequestInfo(method, path, route, index_uid)
+        for hook in self.before:
+            hook(info)
+        return info
+
+    def finish(self, info, error=None):
+        info.finish(error)
+        for hook in self.after:
+            hook(info)
@@ -0,0 +1,81 @@
+import json
+
+class JsonCodec:
+    """
+    JSON codec used for request and response bodies, based on the standard library
+
+    Subclass it and override `dumps` and `loads` to plug another JSON library:
+    `Client(url, apiKey, json_codec=MyCodec())`.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj):
+        """Serialize `obj` to UTF-8 encoded JSON bytes"""
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data):
+        """Deserialize JSON bytes or str"""
+        return json.loads(data)
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec based on orjson (https://github.com/ijl/orjson)"""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson # pylint: disable=import-outside-toplevel
+        self.orjson = orjson
+
+    def dumps(self, obj):
+        return self.orjson.dumps(obj) # pylint: disable=no-member
+
+    def loads(self, data):
+        return self.orjson.loads(data) # pylint: disable=no-member
+
+class UjsonCodec(JsonCodec):
+    """JSON codec based on ujson (https://github.com/ultrajson/ultrajson)"""
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson # pylint: disable=import-outside-toplevel,import-error
+        self.ujson = ujson
+
+    def dumps(self, obj):
+        return self.ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data):
+        return self.ujson.loads(data)
+
+CODECS = {
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec,
+    'json': JsonCodec,
+}
+
+def get_codec(codec=None):
+    """Get a JSON codec
+
+    Parameters
+    ----------
+    codec (optional): JsonCodec or str
+        A codec instance, returned as is, or the name of a codec (orjson, ujson or json).
+        By default, the fastest installed library is used: orjson, then ujson,
+        then the standard library.
+    Returns
+    ----------
+    codec: JsonCodec
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec is not None:
+        if codec not in CODECS:
+            raise ValueError('Unknown JSON codec {!r}, expected one of {}'.format(codec, ', '.join(CODECS)))
+        return CODECS[codec]()
+    for codec_class in (OrjsonCodec, UjsonCodec):
+        try:
+            return codec_class()
+        except ImportError:
+            pass
+    return JsonCodec()
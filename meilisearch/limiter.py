@@ -0,0 +1,216 @@
+import asyncio
+import threading
+from collections import deque
+from time import monotonic, sleep
+from meilisearch.deadline import remaining
+from meilisearch.errors import MeiliSearchTimeoutError
+
+OPERATION_CLASSES = ('search', 'read', 'write', 'admin')
+
+class Limit:
+    """
+    Rate and concurrency limit of an operation class
+
+    The rate is a token bucket: `rate` requests per second on average, with bursts of
+    up to `burst` requests. `max_in_flight` caps the requests waiting for an answer.
+    """
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None):
+        """
+        Parameters
+        ----------
+        rate (optional): float
+            Requests per second. Unlimited when None.
+        burst (optional): int
+            Requests that can be sent at once after an idle period. Defaults to one second of `rate`.
+        max_in_flight (optional): int
+            Requests sent concurrently. Unlimited when None.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError('rate must be positive')
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError('max_in_flight must be at least 1')
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate or 0)
+        self.max_in_flight = max_in_flight
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.__lock = threading.Lock()
+        self.__tokens = self.burst
+        self.__refilled_at = monotonic()
+        self.__in_flight = 0
+        self.__waiters = deque()
+
+    def reserve(self):
+        """Take a token from the bucket, returning the seconds to wait before sending the request
+
+        The token is taken even when the bucket is empty, so the concurrent callers
+        wait in turn rather than all at once.
+        """
+        if self.rate is None:
+            return 0.0
+        with self.__lock:
+            now = monotonic()
+            self.__tokens = min(self.burst, self.__tokens + (now - self.__refilled_at) * self.rate)
+            self.__refilled_at = now
+            self.__tokens -= 1
+            return max(0.0, -self.__tokens / self.rate)
+
+    def refund(self):
+        """Give back a token taken by `reserve`, for a request that was not sent"""
+        if self.rate is not None:
+            with self.__lock:
+                self.__tokens += 1
+
+    def try_enter(self, waiter):
+        """Take an in-flight slot, or queue `waiter` to be woken up with one by `leave`"""
+        with self.__lock:
+            if self.max_in_flight is None or (self.__in_flight < self.max_in_flight and not self.__waiters):
+                self.__in_flight += 1
+                return True
+            self.__waiters.append(waiter)
+            return False
+
+    def leave(self):
+        """Release an in-flight slot, handing it over to the first waiter"""
+        if self.max_in_flight is None:
+            return
+        with self.__lock:
+            if not self.__waiters:
+                self.__in_flight -= 1
+                return
+            waiter = self.__waiters.popleft()
+        waiter.wake()
+
+    def give_up(self, waiter):
+        """Stop waiting for a slot, releasing it if it was handed over meanwhile"""
+        with self.__lock:
+            if waiter in self.__waiters:
+                self.__waiters.remove(waiter)
+                return
+        self.leave()
+
+    def record(self, waited):
+        with self.__lock:
+            self.requests += 1
+            if waited > 0:
+                self.throttled += 1
+                self.wait_seconds += waited
+
+    def stats(self):
+        with self.__lock:
+            return {
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'waitSeconds': self.wait_seconds,
+                'inFlight': self.__in_flight,
+                'waiting': len(self.__waiters),
+            }
+
+class _ThreadWaiter:
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def wake(self):
+        self.event.set()
+
+class _TaskWaiter:
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.future = self.loop.create_future()
+
+    def wake(self):
+        self.loop.call_soon_threadsafe(self.__set_result)
+
+    def __set_result(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+class RequestLimiter:
+    """
+    Client-side rate and concurrency limits, per operation class
+
+    Pass an instance to a client to throttle its requests before they reach
+    MeiliSearch: `Client(url, apiKey, limiter=RequestLimiter(write=Limit(rate=5, max_in_flight=2)))`.
+    The requests are classified as 'search', 'read' (documents, settings, updates),
+    'write' (any change to an index) and 'admin' (keys, dumps, stats, health...).
+    A request over its limit waits, in the calling thread or asyncio task, for a
+    token and a slot; when the wait would exceed the deadline of the request,
+    MeiliSearchTimeoutError is raised instead.
+
+    A limiter can be shared by several clients (ex: all the clients of a batch job),
+    from threads and event loops alike.
+    """
+
+    def __init__(self, search=None, read=None, write=None, admin=None):
+        """
+        Parameters
+        ----------
+        search (optional): Limit
+            Limit of the searches
+        read (optional): Limit
+            Limit of the reads of documents, settings and updates
+        write (optional): Limit
+            Limit of the writes to the indexes
+        admin (optional): Limit
+            Limit of the other requests
+        """
+        self.limits = {'search': search, 'read': read, 'write': write, 'admin': admin}
+
+    def acquire(self, operation):
+        """Wait until a request of `operation` class can be sent, blocking the thread"""
+        limit = self.limits[operation]
+        if limit is None:
+            return
+        started_at = monotonic()
+        delay = limit.reserve()
+        if delay > 0:
+            self.__check_deadline(limit, delay)
+            sleep(delay)
+        waiter = _ThreadWaiter()
+        if not limit.try_enter(waiter):
+            left = remaining()
+            if not waiter.event.wait(None if left is None else max(0.0, left)):
+                limit.give_up(waiter)
+                raise MeiliSearchTimeoutError('deadline exceeded while waiting for a request slot')
+        limit.record(monotonic() - started_at)
+
+    async def acquire_async(self, operation):
+        """Wait until a request of `operation` class can be sent, without blocking the event loop"""
+        limit = self.limits[operation]
+        if limit is None:
+            return
+        started_at = monotonic()
+        delay = limit.reserve()
+        if delay > 0:
+            self.__check_deadline(limit, delay)
+            await asyncio.sleep(delay)
+        waiter = _TaskWaiter()
+        if not limit.try_enter(waiter):
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), remaining())
+            except (asyncio.TimeoutError, asyncio.CancelledError) as err:
+                limit.give_up(waiter)
+                if isinstance(err, asyncio.CancelledError):
+                    raise
+                raise MeiliSearchTimeoutError('deadline exceeded while waiting for a request slot') from err
+        limit.record(monotonic() - started_at)
+
+    def release(self, operation):
+        """Release the slot taken by `acquire` once the request is answered"""
+        limit = self.limits[operation]
+        if limit is not None:
+            limit.leave()
+
+    def stats(self):
+        return {operation: limit.stats() for operation, limit in self.limits.items() if limit is not None}
+
+    @staticmethod
+    def __check_deadline(limit, delay):
+        left = remaining()
+        if left is not None and delay >= left:
+            limit.refund()
+            raise MeiliSearchTimeoutError('deadline exceeded while waiting for the rate limit')
@@ -0,0 +1,326 @@
+import threading
+import weakref
+from meilisearch.errors import MeiliSearchApiError, MeiliSearchCommunicationError, MeiliSearchTimeoutError
+
+# Sub-buckets per power of two of the histograms: latencies are recorded within 1/64 (1.6%)
+SUB_BUCKET_BITS = 6
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Upper bounds in seconds of the histogram buckets exported in OpenMetrics
+EXPORTED_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+def bucket_index(microseconds):
+    """Bucket of a latency: exact below 128µs, then 64 buckets per power of two"""
+    if microseconds < 2 * SUB_BUCKETS:
+        return microseconds
+    shift = microseconds.bit_length() - SUB_BUCKET_BITS - 1
+    return shift * SUB_BUCKETS + (microseconds >> shift)
+
+def bucket_value(index):
+    """Lowest latency in microseconds of a bucket"""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return (index - shift * SUB_BUCKETS) << shift
+
+def error_code(error):
+    """Code of an error for the error counters: the MeiliSearch errorCode when there is one"""
+    if isinstance(error, MeiliSearchApiError):
+        return error.error_code or 'http_{}'.format(error.status_code)
+    if isinstance(error, MeiliSearchTimeoutError):
+        return 'timeout'
+    if isinstance(error, MeiliSearchCommunicationError):
+        return 'communication'
+    return type(error).__name__
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of latencies, HDR-style
+
+    Memory grows with the number of distinct buckets used, not with the number of
+    samples: about 64 buckets per power of two of the latency, in microseconds.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        index = bucket_index(max(0, int(seconds * 1000000)))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other):
+        for index, count in dict(other.buckets).items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, quantile):
+        """Latency in seconds under which `quantile` of the samples fall"""
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(bucket_value(index) / 1000000, self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds):
+        """Number of samples under each bound in seconds"""
+        counts = []
+        ordered = sorted(self.buckets.items())
+        seen = 0
+        position = 0
+        for bound in bounds:
+            while position < len(ordered) and bucket_value(ordered[position][0]) <= bound * 1000000:
+                seen += ordered[position][1]
+                position += 1
+            counts.append(seen)
+        return counts
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'max': self.max,
+            **{'p{}'.format(int(quantile * 100)): self.quantile(quantile) for quantile in QUANTILES},
+        }
+
+class _Shard:
+    """Metrics recorded by one thread: only this thread writes to them"""
+
+    def __init__(self):
+        self.requests = {}
+        self.errors = {}
+        self.latencies = {}
+        self.bytes_in = {}
+        self.bytes_out = {}
+        self.connections = {'new': 0, 'reused': 0}
+
+class _ShardOwner:
+    """Holder of the shard of a thread in its thread-local storage, freed when the thread exits"""
+
+    def __init__(self, shard):
+        self.shard = shard
+
+class MetricsRegistry:
+    """
+    In-process metrics of the requests sent by one or several clients
+
+    The registry is a request hook: `MetricsRegistry().instrument(client)` records
+    the requests of a client per operation (method and route template): counters,
+    latency histograms with their p50/p95/p99, errors by error code, bytes sent and
+    received, and the reuse of pooled connections. The hit ratio of the search
+    caches of the instrumented clients is read when exporting.
+
+    Each thread records into its own shard, without lock; the shards are merged
+    when exporting, with `snapshot()` (a dict) or `openmetrics()` (a text to be
+    scraped, ex: by Prometheus). The shard of a thread that exits is merged into
+    the totals of the exited threads, so short-lived threads (ex: the pools of
+    `iter_documents`) do not make the registry grow.
+    """
+
+    def __init__(self, prefix='meilisearch_client'):
+        """
+        Parameters
+        ----------
+        prefix (optional): str
+            Prefix of the names of the metrics exported in OpenMetrics
+        """
+        self.prefix = prefix
+        self.__local = threading.local()
+        self.__shards = []
+        self.__retired = _Shard()
+        self.__caches = []
+        self.__lock = threading.Lock()
+
+    def instrument(self, client):
+        """Record the requests of a Client or AsyncClient, and read its search cache"""
+        client.config.hooks.register(after=self.record)
+        if client.config.search_cache is not None:
+            with self.__lock:
+                self.__caches.append(client.config.search_cache)
+        return self
+
+    def record(self, info):
+        """Record a request, from its RequestInfo"""
+        shard = self.__shard()
+        operation = (info.method, info.route)
+        shard.requests[operation] = shard.requests.get(operation, 0) + 1
+        latencies = shard.latencies.get(operation)
+        if latencies is None:
+            latencies = shard.latencies[operation] = LatencyHistogram()
+        latencies.record(info.total)
+        if info.bytes_in is not None:
+            shard.bytes_in[operation] = shard.bytes_in.get(operation, 0) + info.bytes_in
+        if info.bytes_out is not None:
+            shard.bytes_out[operation] = shard.bytes_out.get(operation, 0) + info.bytes_out
+        if info.status is not None:
+            shard.connections['new' if info.connect > 0 else 'reused'] += 1
+        if info.error is not None:
+            key = operation + (error_code(info.error),)
+            shard.errors[key] = shard.errors.get(key, 0) + 1
+
+    def reset(self):
+        """Forget the recorded requests"""
+        previous = self.__local
+        with self.__lock:
+            self.__shards = []
+            self.__retired = _Shard()
+            self.__local = threading.local()
+        # Freed out of the lock: freeing the shard owners of the threads retires their shards
+        del previous
+
+    def snapshot(self):
+        """Metrics recorded so far
+
+        Returns
+        ----------
+        metrics: `dict`
+            'operations' by 'METHOD route', 'errors' by error code, 'connections'
+            and 'searchCache' counters and ratios
+        """
+        merged = self.__merge()
+        operations = {}
+        for operation, requests in sorted(merged.requests.items()):
+            errors = sum(count for key, count in merged.errors.items() if key[:2] == operation)
+            operations['{} {}'.format(*operation)] = {
+                'requests': requests,
+                'errors': errors,
+                'errorRate': errors / requests,
+                'bytesIn': merged.bytes_in.get(operation, 0),
+                'bytesOut': merged.bytes_out.get(operation, 0),
+                'latency': merged.latencies[operation].to_dict(),
+            }
+        errors = {}
+        for key, count in merged.errors.items():
+            errors[key[2]] = errors.get(key[2], 0) + count
+        connections = merged.connections
+        opened = connections['new'] + connections['reused']
+        hits, misses = self.__cache_counts()
+        return {
+            'operations': operations,
+            'errors': errors,
+            'connections': {
+                **connections,
+                'reuseRatio': connections['reused'] / opened if opened else 0.0,
+            },
+            'searchCache': {
+                'hits': hits,
+                'misses': misses,
+                'hitRatio': hits / (hits + misses) if hits + misses else 0.0,
+            },
+        }
+
+    def openmetrics(self):
+        """Metrics recorded so far, in the OpenMetrics text format"""
+        merged = self.__merge()
+        name = self.prefix
+        lines = ['# TYPE {}_requests counter'.format(name)]
+        for operation, count in sorted(merged.requests.items()):
+            lines.append('{}_requests_total{} {}'.format(name, labels(operation), count))
+        lines.append('# TYPE {}_request_errors counter'.format(name))
+        for (method, route, code), count in sorted(merged.errors.items()):
+            lines.append('{}_request_errors_total{} {}'.format(
+                name, labels((method, route), error_code=code), count
+            ))
+        lines.append('# TYPE {}_request_duration_seconds histogram'.format(name))
+        for operation, histogram in sorted(merged.latencies.items()):
+            counts = histogram.cumulative_counts(EXPORTED_BUCKETS)
+            for bound, count in zip(EXPORTED_BUCKETS, counts):
+                lines.append('{}_request_duration_seconds_bucket{} {}'.format(
+                    name, labels(operation, le=repr(bound)), count
+                ))
+            lines.append('{}_request_duration_seconds_bucket{} {}'.format(
+                name, labels(operation, le='+Inf'), histogram.count
+            ))
+            lines.append('{}_request_duration_seconds_count{} {}'.format(name, labels(operation), histogram.count))
+            lines.append('{}_request_duration_seconds_sum{} {!r}'.format(name, labels(operation), histogram.sum))
+        lines.append('# TYPE {}_request_latency_seconds summary'.format(name))
+        for operation, histogram in sorted(merged.latencies.items()):
+            for quantile in QUANTILES:
+                lines.append('{}_request_latency_seconds{} {!r}'.format(
+                    name, labels(operation, quantile=repr(quantile)), histogram.quantile(quantile)
+                ))
+            lines.append('{}_request_latency_seconds_count{} {}'.format(name, labels(operation), histogram.count))
+            lines.append('{}_request_latency_seconds_sum{} {!r}'.format(name, labels(operation), histogram.sum))
+        lines.append('# TYPE {}_request_bytes counter'.format(name))
+        for direction, totals in (('in', merged.bytes_in), ('out', merged.bytes_out)):
+            for operation, total in sorted(totals.items()):
+                lines.append('{}_request_bytes_total{} {}'.format(name, labels(operation, direction=direction), total))
+        lines.append('# TYPE {}_connections counter'.format(name))
+        for state in ('new', 'reused'):
+            lines.append('{}_connections_total{{state="{}"}} {}'.format(name, state, merged.connections[state]))
+        hits, misses = self.__cache_counts()
+        lines.append('# TYPE {}_search_cache_requests counter'.format(name))
+        lines.append('{}_search_cache_requests_total{{result="hit"}} {}'.format(name, hits))
+        lines.append('{}_search_cache_requests_total{{result="miss"}} {}'.format(name, misses))
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def __shard(self):
+        owner = getattr(self.__local, 'owner', None)
+        if owner is None:
+            owner = self.__local.owner = _ShardOwner(_Shard())
+            weakref.finalize(owner, _retire_shard, weakref.ref(self), owner.shard)
+            with self.__lock:
+                self.__shards.append(owner.shard)
+        return owner.shard
+
+    def _retire(self, shard):
+        """Merge the shard of an exited thread into the totals of the exited threads"""
+        with self.__lock:
+            if any(live is shard for live in self.__shards):
+                self.__shards = [live for live in self.__shards if live is not shard]
+                # A new object, so the merges in progress keep reading the previous totals
+                self.__retired = merge_shards([self.__retired, shard])
+
+    def __merge(self):
+        with self.__lock:
+            shards = [self.__retired] + self.__shards
+        return merge_shards(shards)
+
+    def __cache_counts(self):
+        with self.__lock:
+            caches = list(self.__caches)
+        return sum(cache.hits for cache in caches), sum(cache.misses for cache in caches)
+
+def _retire_shard(registry_ref, shard):
+    registry = registry_ref()
+    if registry is not None:
+        registry._retire(shard) # pylint: disable=protected-access
+
+def merge_shards(shards):
+    """Metrics of several shards, in a new shard"""
+    merged = _Shard()
+    for shard in shards:
+        for merged_counts, counts in (
+                (merged.requests, shard.requests),
+                (merged.errors, shard.errors),
+                (merged.bytes_in, shard.bytes_in),
+                (merged.bytes_out, shard.bytes_out),
+                (merged.connections, shard.connections),
+            ):
+            for key, count in dict(counts).items():
+                merged_counts[key] = merged_counts.get(key, 0) + count
+        for operation, histogram in dict(shard.latencies).items():
+            merged.latencies.setdefault(operation, LatencyHistogram()).merge(histogram)
+    return merged
+
+def labels(operation, **extra):
+    """OpenMetrics labels of an operation"""
+    pairs = [('method', operation[0]), ('route', operation[1])] + list(extra.items())
+    return '{' + ','.join('{}="{}"'.format(key, escape(value)) for key, value in pairs) + '}'
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,224 @@
+import math
+import random
+import threading
+from time import monotonic
+import requests
+
+LOAD_BALANCING = ('ewma', 'least_outstanding')
+
+# Latency in seconds recorded for a failed request, so a node failing fast does not attract reads
+FAILURE_PENALTY = 1.0
+
+class Node:
+    """A MeiliSearch instance of a NodePool, and its load and health"""
+
+    def __init__(self, url, primary=False):
+        self.url = url.rstrip('/')
+        self.primary = primary
+        self.outstanding = 0
+        self.ewma = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected = False
+        self.ejections = 0
+        self.last_sample_at = None
+
+    def score(self):
+        """Expected latency of the next request: the latency EWMA weighed by the requests in flight"""
+        return self.ewma * (self.outstanding + 1)
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'primary': self.primary,
+            'outstanding': self.outstanding,
+            'ewmaMs': self.ewma * 1000,
+            'requests': self.requests,
+            'failures': self.failures,
+            'ejected': self.ejected,
+            'ejections': self.ejections,
+        }
+
+# pylint: disable=too-many-instance-attributes
+class NodePool:
+    """
+    The MeiliSearch nodes of a client: a primary receiving every request, and read replicas
+
+    Pass several URLs to the client to spread reads (searches, documents and settings)
+    over the nodes: `Client([primary_url, replica_url], apiKey)`. The other requests
+    (writes, updates, keys, dumps...) are always sent to the primary, the first URL.
+    A NodePool instance can be passed instead of the URLs to tune it.
+
+    A node failing `max_failures` requests in a row (connection error, timeout or
+    5xx status) is ejected: reads avoid it, and fail over to another node. Ejected
+    nodes are probed in the background with the health route, and re-admitted once
+    healthy.
+    """
+
+    def __init__(
+            self,
+            urls,
+            load_balancing='ewma',
+            max_failures=3,
+            probe_interval_in_ms=2000,
+            decay_in_ms=10000
+        ):
+        """
+        Parameters
+        ----------
+        urls: list
+            URLs of the nodes, the primary first
+        load_balancing (optional): str
+            Selection of the node of a read: 'ewma' picks the node with the lowest
+            latency EWMA weighed by its requests in flight, out of two chosen at random;
+            'least_outstanding' picks the node with the fewest requests in flight
+        max_failures (optional): int
+            Consecutive failures after which a node is ejected
+        probe_interval_in_ms (optional): int
+            Time interval between two health probes of the ejected nodes
+        decay_in_ms (optional): int
+            Time after which the weight of a latency sample in the EWMA falls to 1/e
+        """
+        if isinstance(urls, str):
+            urls = [urls]
+        if not urls:
+            raise ValueError('At least one node URL is required')
+        if load_balancing not in LOAD_BALANCING:
+            raise ValueError('Unknown load balancing {!r}, expected one of {}'.format(
+                load_balancing, ', '.join(LOAD_BALANCING)
+            ))
+        self.nodes = [Node(url, primary=i == 0) for i, url in enumerate(urls)]
+        self.primary = self.nodes[0]
+        self.load_balancing = load_balancing
+        self.max_failures = max_failures
+        self.probe_interval_in_ms = probe_interval_in_ms
+        self.decay_in_ms = decay_in_ms
+        self.__lock = threading.Lock()
+        self.__prober = None
+        self.__stopped = threading.Event()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def node(self, url):
+        """Node of a URL"""
+        url = url.rstrip('/')
+        return next(node for node in self.nodes if node.url == url)
+
+    def select(self, replica_read, exclude=()):
+        """Node to send a request to
+
+        Parameters
+        ----------
+        replica_read: bool
+            Whether the request can be served by any node, or only by the primary
+        exclude (optional): list
+            Nodes that already failed this request
+        """
+        if not replica_read or len(self.nodes) == 1:
+            return self.primary
+        with self.__lock:
+            candidates = [node for node in self.nodes if not node.ejected and node not in exclude]
+            if not candidates:
+                # Every node is ejected: fail open rather than fail every read
+                candidates = [node for node in self.nodes if node not in exclude] or self.nodes
+            if self.load_balancing == 'least_outstanding':
+                fewest = min(node.outstanding for node in candidates)
+                return random.choice([node for node in candidates if node.outstanding == fewest])
+            # Power of two choices: no herding on the single fastest node
+            if len(candidates) == 1:
+                return candidates[0]
+            first, second = random.sample(candidates, 2)
+            return first if first.score() <= second.score() else second
+
+    def can_fail_over(self, replica_read, tried):
+        """Whether a failed request can be sent to another healthy node"""
+        if not replica_read:
+            return False
+        with self.__lock:
+            return any(not node.ejected and node not in tried for node in self.nodes)
+
+    def start(self, node):
+        """Count a request sent to `node`, returning its start time"""
+        with self.__lock:
+            node.outstanding += 1
+        return monotonic()
+
+    def finish(self, node, started_at, failed):
+        """Record the latency and outcome of a request started with `start`"""
+        now = monotonic()
+        latency = max(now - started_at, FAILURE_PENALTY) if failed else now - started_at
+        eject = False
+        with self.__lock:
+            node.outstanding -= 1
+            node.requests += 1
+            if node.last_sample_at is None:
+                node.ewma = latency
+            else:
+                weight = math.exp(-(now - node.last_sample_at) * 1000 / self.decay_in_ms)
+                # Peak EWMA: a slower sample is taken at once, recoveries are smoothed
+                node.ewma = max(latency, node.ewma * weight + latency * (1 - weight))
+            node.last_sample_at = now
+            if not failed:
+                node.consecutive_failures = 0
+                return
+            node.failures += 1
+            node.consecutive_failures += 1
+            if not node.ejected and node.consecutive_failures >= self.max_failures and len(self.nodes) > 1:
+                node.ejected = True
+                node.ejections += 1
+                eject = True
+        if eject:
+            self.__start_prober()
+
+    def readmit(self, node):
+        with self.__lock:
+            node.ejected = False
+            node.consecutive_failures = 0
+            node.last_sample_at = None
+
+    def probe(self, node, timeout=1.0):
+        """Whether the health route of a node answers"""
+        try:
+            return requests.get(node.url + '/health', timeout=timeout).status_code < 300
+        except requests.exceptions.RequestException:
+            return False
+
+    def close(self):
+        """Stop the background health probes
+
+        They start again on the next ejection.
+        """
+        with self.__lock:
+            if self.__prober is not None:
+                self.__stopped.set()
+                self.__prober = None
+
+    def stats(self):
+        with self.__lock:
+            return [node.to_dict() for node in self.nodes]
+
+    def __start_prober(self):
+        with self.__lock:
+            if self.__prober is not None:
+                return
+            self.__stopped = threading.Event()
+            self.__prober = threading.Thread(
+                target=self.__probe_ejected_nodes,
+                args=(self.__stopped,),
+                daemon=True
+            )
+            self.__prober.start()
+
+    def __probe_ejected_nodes(self, stopped):
+        while not stopped.wait(self.probe_interval_in_ms / 1000):
+            with self.__lock:
+                ejected = [node for node in self.nodes if node.ejected]
+                if not ejected:
+                    # A later ejection starts a new prober
+                    self.__prober = None
+                    return
+            for node in ejected:
+                if self.probe(node):
+                    self.readmit(node)
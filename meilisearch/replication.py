@@ -0,0 +1,253 @@
+import threading
+from meilisearch.errors import MeiliSearchCommunicationError, MeiliSearchError, MeiliSearchReplicationError
+from meilisearch._routes import PATHS, is_read, path_segments
+from meilisearch._workers import WorkerPool
+
+def is_replicated_write(http_method, path):
+    """Whether a request modifies an index, and is sent to every node in replicated mode"""
+    return not is_read(http_method, path) and path_segments(path)[0] == PATHS.index
+
+class ReplicatedResponse(dict):
+    """
+    Response of a request sent to every node
+
+    The dict holds the response of the primary (or of the first node that answered
+    when the primary failed), so `response['updateId']` keeps working. Pass the
+    whole response to `wait_for_pending_update` to wait for the update on the nodes.
+    """
+
+    def __init__(self, responses, errors):
+        """
+        Parameters
+        ----------
+        responses: dict
+            Response of each node that answered, by node URL, the primary first
+        errors: dict
+            Error raised for each node that failed, by node URL
+        """
+        super().__init__(next(iter(responses.values())))
+        self.responses = responses
+        self.errors = errors
+
+    @property
+    def update_ids(self):
+        """updateId of each node, by node URL"""
+        return {url: response['updateId'] for url, response in self.responses.items()}
+
+    @property
+    def lagging(self):
+        """URLs of the nodes that failed the request, or have not processed the update yet"""
+        return sorted(
+            list(self.errors) + [
+                url for url, response in self.responses.items()
+                if response.get('status', 'processed') != 'processed'
+            ]
+        )
+
+class NodeLag:
+    """Writes missed by a node since its last repair"""
+
+    def __init__(self):
+        self.failed_writes = 0
+        self.unprocessed_updates = 0
+        self.last_error = None
+
+    def to_dict(self):
+        return {
+            'failedWrites': self.failed_writes,
+            'unprocessedUpdates': self.unprocessed_updates,
+            'lastError': self.last_error,
+        }
+
+class ReplicationPolicy:
+    """
+    Replication of the writes over every node of the client
+
+    MeiliSearch does not replicate the indexes itself: with a replication policy,
+    every write to an index (documents, settings, index creation, update and deletion)
+    is sent to all the nodes in parallel:
+    `Client([node_a, node_b, node_c], apiKey, replication=ReplicationPolicy(quorum=2))`.
+    A write succeeds once `quorum` nodes accept it, and `wait_for_pending_update`
+    returns once `quorum` nodes have processed it.
+
+    The nodes that failed a write, or were still processing it, are reported by
+    `lagging()` until `repaired()` is called, ex: once reloaded from a dump.
+
+    The synchronous client sends a write to the first node from the calling thread,
+    and to the other nodes from a pool of `workers` threads shared by the callers.
+    """
+
+    def __init__(self, quorum=None, workers=None):
+        """
+        Parameters
+        ----------
+        quorum (optional): int
+            Number of nodes that must accept a write, and process its update.
+            Defaults to a majority of the nodes.
+        workers (optional): int
+            Number of threads sending the writes of the synchronous client to the nodes
+            other than the first one: size it to the number of concurrent writes times
+            the number of nodes minus one. Defaults to 32.
+        """
+        self.quorum = quorum
+        self.workers = workers
+        self.writes = 0
+        self.__lag = {}
+        self.__lock = threading.Lock()
+        self.__pool = WorkerPool('replication', workers)
+
+    def required(self, nodes):
+        """Number of nodes that must succeed, out of `nodes`"""
+        return min(nodes, self.quorum or nodes // 2 + 1)
+
+    def run_all(self, calls):
+        """Run calls concurrently, the first one from the calling thread
+
+        Parameters
+        ----------
+        calls: list
+            Functions without arguments, one per node
+        Returns
+        ----------
+        outcomes: list
+            (result, error) of each call, the error being a MeiliSearchError
+        """
+        futures = [self.__pool.submit(call) for call in calls[1:]]
+        return [call_outcome(calls[0])] + [call_outcome(future.result) for future in futures]
+
+    def close(self):
+        """Stop the threads of the synchronous client, see Client.close"""
+        self.__pool.shutdown()
+
+    def record_write(self, errors):
+        """Record the nodes that failed a write"""
+        with self.__lock:
+            self.writes += 1
+            for url, error in errors.items():
+                lag = self.__lag.setdefault(url, NodeLag())
+                lag.failed_writes += 1
+                lag.last_error = str(error)
+
+    def record_unprocessed(self, urls):
+        """Record the nodes that had not processed an update once the quorum was reached"""
+        with self.__lock:
+            for url in urls:
+                self.__lag.setdefault(url, NodeLag()).unprocessed_updates += 1
+
+    def lagging(self):
+        """Nodes that missed writes since their last repair, by URL"""
+        with self.__lock:
+            return {url: lag.to_dict() for url, lag in self.__lag.items()}
+
+    def repaired(self, url=None):
+        """Forget the missed writes of a node (or of every node), once it is back in sync"""
+        with self.__lock:
+            if url is None:
+                self.__lag.clear()
+            else:
+                self.__lag.pop(url, None)
+
+def replicated_response(policy, outcomes):
+    """Combine the outcomes of a write sent to every node
+
+    Parameters
+    ----------
+    policy: ReplicationPolicy
+    outcomes: list
+        (node URL, response, error) of each node, the primary first
+    Returns
+    ----------
+    response: ReplicatedResponse
+        Or the response of the first node, when it is not an update (ex: index deletion)
+    """
+    responses = {url: response for url, response, error in outcomes if error is None}
+    errors = {url: error for url, _, error in outcomes if error is not None}
+    policy.record_write(errors)
+    if not responses:
+        # Every node rejected the write: same error as with a single node
+        raise next(iter(errors.values()))
+    required = policy.required(len(outcomes))
+    if len(responses) < required:
+        raise MeiliSearchReplicationError(
+            'write accepted by {} of {} nodes, {} required'.format(len(responses), len(outcomes), required),
+            errors
+        )
+    first = next(iter(responses.values()))
+    if isinstance(first, dict) and 'updateId' in first:
+        return ReplicatedResponse(responses, errors)
+    return first
+
+def replication_outcome(url, future_or_task):
+    """(node URL, response, error) of a finished write, the error being a MeiliSearchError"""
+    return (url,) + call_outcome(future_or_task.result)
+
+def call_outcome(func):
+    """(result, error) of `func()`, the error being a MeiliSearchError"""
+    try:
+        return func(), None
+    except MeiliSearchError as err:
+        return None, err
+
+class UpdatePoll:
+    """
+    Update of a replicated write, polled on each node until a quorum processed it
+
+    A node that cannot be reached is polled again at the next tick, and a node
+    answering with an error is given up on, so the failure of a node does not abort
+    the wait while a quorum can still process the update. The nodes that have not
+    processed it once the quorum is reached are recorded as lagging.
+    """
+
+    def __init__(self, policy, update):
+        """
+        Parameters
+        ----------
+        policy: ReplicationPolicy
+        update: ReplicatedResponse
+            Response of the replicated write
+        """
+        self.policy = policy
+        self.update_ids = update.update_ids
+        self.pending = dict(self.update_ids)
+        self.statuses = {}
+        self.errors = dict(update.errors)
+        self.required = policy.required(len(update.responses) + len(update.errors))
+
+    def record(self, url, status, error):
+        """Record the status of the update on a node, or the error raised polling it"""
+        if error is None:
+            self.statuses[url] = status
+            self.errors.pop(url, None)
+            if status['status'] != 'enqueued':
+                del self.pending[url]
+            return
+        self.errors[url] = error
+        if not isinstance(error, MeiliSearchCommunicationError):
+            del self.pending[url]
+            self.statuses.pop(url, None)
+
+    def processed(self):
+        return sum(1 for url in self.statuses if url not in self.pending)
+
+    def done(self):
+        """Whether a quorum processed the update, raising MeiliSearchReplicationError once it cannot"""
+        processed = self.processed()
+        if processed >= self.required:
+            return True
+        if processed + len(self.pending) < self.required:
+            raise MeiliSearchReplicationError(
+                'update processed by {} of {} nodes, {} required'.format(
+                    processed, len(self.update_ids), self.required
+                ),
+                self.errors
+            )
+        return False
+
+    def response(self):
+        """Statuses of the update, recording the nodes that have not processed it"""
+        self.policy.record_unprocessed([
+            url for url in self.update_ids if url in self.pending or url not in self.statuses
+        ])
+        # In the order of the nodes, so the dict holds the status of the primary
+        statuses = {url: self.statuses[url] for url in self.update_ids if url in self.statuses}
+        return ReplicatedResponse(statuses, self.errors)
@@ -0,0 +1,154 @@
+import threading
+from meilisearch import deadline
+from meilisearch._payload import is_buffered
+from meilisearch._routes import is_read
+from meilisearch._updates import UpdateBackoff
+
+# pylint: disable=too-many-instance-attributes
+class RetryPolicy:
+    """
+    Retries of the requests failing on a connection error or a transient status
+
+    Pass an instance to the client to enable it: `Client(url, apiKey, retry_policy=RetryPolicy())`.
+    Reads (GET requests and searches) are replayed freely. Writes are only replayed
+    when the request could not reach the server (the connection was refused), unless
+    `retry_writes` is True: every replay of a document write enqueues a new update.
+    Streamed bodies (file objects) are never replayed.
+
+    Retries are limited by a budget, so an unavailable server is not flooded with
+    replays: a retry spends one token, a request completed without retry gives back
+    `budget_ratio` token, and retries stop while the budget is empty.
+    """
+
+    def __init__(
+            self,
+            max_attempts=3,
+            backoff_in_ms=50,
+            max_backoff_in_ms=2000,
+            retry_on_status=(502, 503, 504),
+            retry_writes=False,
+            budget=10,
+            budget_ratio=0.1
+        ):
+        """
+        Parameters
+        ----------
+        max_attempts (optional): int
+            Maximum number of times a request is sent, the first attempt included
+        backoff_in_ms (optional): int
+            Delay before the first retry, doubled on each retry, with jitter
+        max_backoff_in_ms (optional): int
+            Maximum delay between two attempts, also capping the Retry-After header
+        retry_on_status (optional): iterable of int
+            HTTP status codes of the responses to retry
+        retry_writes (optional): bool
+            Also replay the writes (documents, settings, index management) that may have
+            reached the server. Each replay may enqueue the same update again.
+        budget (optional): int
+            Maximum number of tokens of the retry budget, i.e. of retries in a burst
+        budget_ratio (optional): float
+            Tokens given back to the budget by each request completed without retry
+        """
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        self.max_attempts = max_attempts
+        self.backoff_in_ms = backoff_in_ms
+        self.max_backoff_in_ms = max_backoff_in_ms
+        self.retry_on_status = frozenset(retry_on_status)
+        self.retry_writes = retry_writes
+        self.budget = budget
+        self.budget_ratio = budget_ratio
+        self.requests = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.budget_exhausted = 0
+        self.__tokens = float(budget)
+        self.__lock = threading.Lock()
+
+    def backoff(self):
+        """Delays between the attempts of one request"""
+        return UpdateBackoff(self.backoff_in_ms, self.max_backoff_in_ms)
+
+    def is_replayable(self, http_method, path, replayable_body=True, sent=True):
+        """Whether a failed request can be sent again
+
+        Parameters
+        ----------
+        http_method: str
+        path: str
+            Route of the request
+        replayable_body (optional): bool
+            False when the body is a stream that was consumed by the first attempt
+        sent (optional): bool
+            False when the request did not reach the server (ex: connection refused)
+        """
+        if not replayable_body:
+            return False
+        return not sent or is_read(http_method, path) or self.retry_writes
+
+    def should_retry(self, attempt, http_method, path, replayable_body=True, sent=True):
+        """Whether to retry a failed attempt, spending a token of the budget if so
+
+        Parameters
+        ----------
+        attempt: int
+            Number of the failed attempt, starting at 1
+        """
+        if not self.is_replayable(http_method, path, replayable_body, sent):
+            return False
+        with self.__lock:
+            if attempt >= self.max_attempts:
+                self.exhausted += 1
+                return False
+            if self.__tokens < 1:
+                self.budget_exhausted += 1
+                return False
+            self.__tokens -= 1
+            self.retries += 1
+            return True
+
+    def delay(self, backoff, retry_after=None):
+        """Seconds to wait before the next attempt, honoring a Retry-After header in seconds"""
+        delay = backoff.next_interval(False)
+        if retry_after is not None:
+            try:
+                delay = max(delay, min(float(retry_after), self.max_backoff_in_ms / 1000))
+            except ValueError:
+                pass # HTTP-date, not supported
+        return delay
+
+    def record_request(self, retried):
+        """Count a completed request, refilling the budget when it needed no retry"""
+        with self.__lock:
+            self.requests += 1
+            if not retried:
+                self.__tokens = min(self.budget, self.__tokens + self.budget_ratio)
+
+    @property
+    def tokens(self):
+        """Tokens left in the retry budget"""
+        return self.__tokens
+
+    def stats(self):
+        with self.__lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'exhausted': self.exhausted,
+                'budgetExhausted': self.budget_exhausted,
+                'tokens': self.__tokens,
+            }
+
+def retry_delay(policy, backoff, attempt, http_method, path, data, sent=True, retry_after=None):
+    """Seconds to wait before the next attempt of a failed request, or None to give up
+
+    No retry is made (nor counted) when the wait would outlast the current deadline.
+    """
+    if policy is None or not policy.is_replayable(http_method, path, is_buffered(data), sent):
+        return None
+    delay = policy.delay(backoff, retry_after)
+    if not deadline.allows(delay):
+        return None
+    if not policy.should_retry(attempt, http_method, path, is_buffered(data), sent):
+        return None
+    return delay
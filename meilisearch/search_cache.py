@@ -0,0 +1,125 @@
+import copy
+import json
+import threading
+from collections import OrderedDict
+from time import monotonic
+from meilisearch._routes import index_uid, is_read
+
+def canonical_key(uid, body):
+    """Key identifying a search: the index and its query body, with sorted keys"""
+    return uid + '\n' + json.dumps(body, sort_keys=True, separators=(',', ':'), default=str)
+
+def invalidate_search_cache(config, http_method, path):
+    """Drop the cached searches of the index modified by a request, if any"""
+    if config.search_cache is None or is_read(http_method, path):
+        return
+    uid = index_uid(path)
+    if uid is not None:
+        config.search_cache.invalidate(uid)
+
+# pylint: disable=too-many-instance-attributes
+class SearchCache:
+    """
+    Bounded LRU cache of search results, with a time to live per entry
+
+    Pass an instance to the client to enable it:
+    `Client(url, apiKey, search_cache=SearchCache(max_entries=1000, ttl_in_ms=30000))`.
+    The cached searches of an index are dropped whenever the same client sends a
+    write to that index (documents, settings, index update or deletion), and again
+    once `wait_for_pending_update` or `wait_for_updates` sees the write processed.
+    Writes sent by other clients are only accounted for by the time to live.
+    """
+
+    def __init__(self, max_entries=1000, ttl_in_ms=60000):
+        """
+        Parameters
+        ----------
+        max_entries (optional): int
+            Maximum number of search results kept; the least recently used is evicted first
+        ttl_in_ms (optional): int
+            Time after which a cached result is considered stale, or None to keep it until evicted
+        """
+        self.max_entries = max_entries
+        self.ttl_in_ms = ttl_in_ms
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, uid, body):
+        """Cached results of a search, or None
+
+        A copy is returned, so the caller can modify it freely.
+        """
+        key = canonical_key(uid, body)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result = entry
+            if expires_at is not None and expires_at <= monotonic():
+                del self.__entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(result)
+
+    def set(self, uid, body, result):
+        """Store the results of a search"""
+        key = canonical_key(uid, body)
+        expires_at = None if self.ttl_in_ms is None else monotonic() + self.ttl_in_ms / 1000
+        result = copy.deepcopy(result)
+        with self.__lock:
+            self.__entries[key] = (expires_at, result)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, uid=None):
+        """Drop the cached searches of an index, or of all indexes when `uid` is None"""
+        prefix = None if uid is None else uid + '\n'
+        with self.__lock:
+            keys = [key for key in self.__entries if prefix is None or key.startswith(prefix)]
+            for key in keys:
+                del self.__entries[key]
+            self.invalidations += 1
+
+    def clear(self):
+        """Drop every cached search and reset the counters"""
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Counters of the cache
+
+        Returns
+        ----------
+        stats: `dict`
+            Dictionnary with hits, misses, evictions, expirations, invalidations, size and hitRatio
+        """
+        with self.__lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'size': len(self.__entries),
+                'hitRatio': self.hit_ratio,
+            }
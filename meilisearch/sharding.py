@@ -0,0 +1,348 @@
+import asyncio
+import hashlib
+from meilisearch._payload import raw_payload
+from meilisearch._workers import WorkerPool
+
+DEFAULT_LIMIT = 20
+
+def shard_position(document_id, shards):
+    """Position of the shard holding a document: a hash of its id, stable across processes and versions"""
+    digest = hashlib.md5(str(document_id).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shards
+
+def shard_search_params(opt_params):
+    """Parameters of the search sent to each shard: the first `offset + limit` hits of every shard"""
+    params = dict(opt_params or {})
+    params['limit'] = params.pop('offset', 0) + params.get('limit', DEFAULT_LIMIT)
+    return params
+
+def merge_search_results(results, offset=0, limit=DEFAULT_LIMIT):
+    """Merge the results of the same search on every shard into one page
+
+    MeiliSearch does not return the relevancy score of the hits, so the ranks are
+    merged: the best hit of each shard first, then the second ones, and so on. As
+    the documents are spread by a hash of their id, the shards hold similar samples
+    of the corpus, and hits of the same rank have a similar relevancy.
+
+    Parameters
+    ----------
+    results: list
+        Results of the search on each shard, with the first `offset + limit` hits
+    offset (optional): int
+        Number of merged hits to skip
+    limit (optional): int
+        Maximum number of merged hits returned
+    Returns
+    ----------
+    results: `dict`
+        Results of the search over the whole corpus
+    """
+    hits = []
+    for rank in range(max((len(result['hits']) for result in results), default=0)):
+        hits.extend(result['hits'][rank] for result in results if rank < len(result['hits']))
+    merged = {
+        'hits': hits[offset:offset + limit],
+        'offset': offset,
+        'limit': limit,
+        'nbHits': sum(result.get('nbHits', 0) for result in results),
+        'exhaustiveNbHits': all(result.get('exhaustiveNbHits', False) for result in results),
+        'processingTimeMs': max((result.get('processingTimeMs', 0) for result in results), default=0),
+        'query': results[0].get('query', '') if results else '',
+    }
+    if any('facetsDistribution' in result for result in results):
+        facets = {}
+        for result in results:
+            for facet, counts in (result.get('facetsDistribution') or {}).items():
+                merged_counts = facets.setdefault(facet, {})
+                for value, count in counts.items():
+                    merged_counts[value] = merged_counts.get(value, 0) + count
+        merged['facetsDistribution'] = facets
+        merged['exhaustiveFacetsCount'] = all(result.get('exhaustiveFacetsCount', False) for result in results)
+    return merged
+
+class ShardedIndex:
+    """
+    An index split into several shards, indexes of one or several MeiliSearch nodes
+
+    Each document is stored on a single shard, chosen by a hash of its primary key,
+    so a corpus too large for one instance can be spread over several ones:
+    `ShardedIndex([client_a.get_index('movies'), client_b.get_index('movies')], 'id')`.
+    The writes are routed to the shards holding the documents, and a search runs on
+    every shard concurrently, its results being merged into one page. The position
+    of the shards is part of the routing: changing the list of shards requires
+    reindexing the documents.
+
+    The settings are applied to every shard, so the shards rank the hits alike.
+    """
+
+    def __init__(self, shards, primary_key, workers=None):
+        """
+        Parameters
+        ----------
+        shards: list
+            Index of each shard. The order matters: it has to be the same for every client.
+        primary_key: str
+            Primary key of the documents, used to route them
+        workers (optional): int
+            Number of threads querying the shards concurrently, shared by the callers of
+            the sharded index. Each call queries one shard from the calling thread and
+            the other ones from these threads, so size it to the number of concurrent
+            calls times the number of shards minus one. Defaults to 32.
+        """
+        if not shards:
+            raise ValueError('At least one shard is required')
+        self.shards = list(shards)
+        self.primary_key = primary_key
+        self.workers = workers
+        self.__pool = WorkerPool('sharding', workers)
+
+    def shard_for(self, document_id):
+        """Index of the shard holding a document"""
+        return self.shards[shard_position(document_id, len(self.shards))]
+
+    def route(self, documents):
+        """Split documents by shard
+
+        Parameters
+        ----------
+        documents: iterable
+            Iterable of dicts, each containing a document and its primary key
+        Returns
+        ----------
+        documents: list
+            List of documents of each shard, aligned with `shards`
+        """
+        if raw_payload(documents) is not None:
+            raise TypeError('A ShardedIndex routes the documents by their primary key: pass them as dicts')
+        routed = [[] for _ in self.shards]
+        for document in documents:
+            if self.primary_key not in document:
+                raise ValueError('Document without primary key {!r}: {!r}'.format(self.primary_key, document))
+            routed[shard_position(document[self.primary_key], len(self.shards))].append(document)
+        return routed
+
+    def search(self, query, opt_params=None, timeout=None):
+        """Search in every shard concurrently
+
+        Parameters
+        ----------
+        query: str
+            String containing the searched word(s)
+        opt_params: dict
+            Dictionnary containing optional query parameters, `offset` and `limit`
+            applying to the merged hits
+        timeout (optional): float or tuple
+            Timeout of the request sent to each shard
+        Returns
+        ----------
+        results: `dict`
+            Merged results: the hits of the page, summed nbHits and facetsDistribution
+        """
+        params = shard_search_params(opt_params)
+        results = self._scatter([
+            (shard.search, query, params, timeout) for shard in self.shards
+        ])
+        return self._merge(results, opt_params)
+
+    def add_documents(self, documents, timeout=None):
+        """Add documents to the shards holding them
+
+        Parameters
+        ----------
+        documents: iterable
+            Iterable of dicts, each containing a document
+        timeout (optional): float or tuple
+            Timeout of the request sent to each shard
+        Returns
+        ----------
+        updates: list
+            Update of each shard (None for the shards receiving no document),
+            to pass to `wait_for_pending_update`
+        """
+        return self._write_routed('add_documents', documents, timeout)
+
+    def update_documents(self, documents, timeout=None):
+        """Add documents to the shards holding them, or update them if they already exist
+
+        See `add_documents`.
+        """
+        return self._write_routed('update_documents', documents, timeout)
+
+    def get_document(self, document_id):
+        """Get one document from the shard holding it"""
+        return self.shard_for(document_id).get_document(document_id)
+
+    def delete_document(self, document_id):
+        """Delete one document from the shard holding it
+
+        Returns
+        ----------
+        updates: list
+            Update of each shard (None for the other shards)
+        """
+        position = shard_position(document_id, len(self.shards))
+        return self._scatter([
+            (shard.delete_document, document_id) if i == position else None
+            for i, shard in enumerate(self.shards)
+        ])
+
+    def delete_documents(self, ids):
+        """Delete several documents from the shards holding them
+
+        Returns
+        ----------
+        updates: list
+            Update of each shard (None for the shards holding none of the documents)
+        """
+        routed = [[] for _ in self.shards]
+        for document_id in ids:
+            routed[shard_position(document_id, len(self.shards))].append(document_id)
+        return self._scatter([
+            (shard.delete_documents, shard_ids) if shard_ids else None
+            for shard, shard_ids in zip(self.shards, routed)
+        ])
+
+    def delete_all_documents(self):
+        """Delete all documents of every shard"""
+        return self._scatter([(shard.delete_all_documents,) for shard in self.shards])
+
+    def update_settings(self, body):
+        """Update the settings of every shard"""
+        return self._scatter([(shard.update_settings, body) for shard in self.shards])
+
+    def get_settings(self):
+        """Get the settings of the first shard, applied to every shard by `update_settings`"""
+        return self.shards[0].get_settings()
+
+    def get_stats(self):
+        """Get the stats of every shard, and their total number of documents
+
+        Returns
+        ----------
+        stats: `dict`
+            Total `numberOfDocuments`, and the stats of each shard under `shards`
+        """
+        stats = self._scatter([(shard.get_stats,) for shard in self.shards])
+        return self._sum_stats(stats)
+
+    def wait_for_pending_update(self, updates, timeout_in_ms=5000, interval_in_ms=50):
+        """Wait until every shard processes its update
+
+        Parameters
+        ----------
+        updates: list
+            Update of each shard, as returned by a write of the ShardedIndex
+        timeout_in_ms (optional): int
+            time the method should wait before rising a TimeoutError, capped by the deadline of the client
+        interval_in_ms (optional): int
+            time interval the method should wait (sleep) between requests
+        Returns
+        ----------
+        updates: list
+            Processed update status of each shard (None for the shards without update)
+        """
+        return self._scatter([
+            (shard.wait_for_pending_update, update['updateId'], timeout_in_ms, interval_in_ms)
+            if update is not None else None
+            for shard, update in zip(self.shards, updates)
+        ])
+
+    def close(self):
+        """Stop the threads querying the shards"""
+        self.__pool.shutdown()
+
+    def _write_routed(self, method, documents, timeout):
+        return self._scatter([
+            (getattr(shard, method), shard_documents, self.primary_key, timeout) if shard_documents else None
+            for shard, shard_documents in zip(self.shards, self.route(documents))
+        ])
+
+    def _scatter(self, calls):
+        """Run a call per shard concurrently, returning their results in the order of the shards
+
+        A call is a tuple (function, *args), or None to skip the shard. The calls keep
+        the deadline of the caller. The first error raised by a call is raised.
+        """
+        if sum(call is not None for call in calls) <= 1:
+            return [None if call is None else call[0](*call[1:]) for call in calls]
+        # The last shard is queried from the calling thread, the other ones from the pool
+        local = max(position for position, call in enumerate(calls) if call is not None)
+        futures = [
+            None if call is None or position == local else self.__pool.submit(*call)
+            for position, call in enumerate(calls)
+        ]
+        local_result = calls[local][0](*calls[local][1:])
+        return [
+            local_result if position == local else None if future is None else future.result()
+            for position, future in enumerate(futures)
+        ]
+
+    @staticmethod
+    def _merge(results, opt_params):
+        opt_params = opt_params or {}
+        return merge_search_results(
+            results,
+            opt_params.get('offset', 0),
+            opt_params.get('limit', DEFAULT_LIMIT)
+        )
+
+    @staticmethod
+    def _sum_stats(stats):
+        return {
+            'numberOfDocuments': sum(shard_stats['numberOfDocuments'] for shard_stats in stats),
+            'isIndexing': any(shard_stats.get('isIndexing', False) for shard_stats in stats),
+            'shards': stats,
+        }
+
+# pylint: disable=invalid-overridden-method
+class AsyncShardedIndex(ShardedIndex):
+    """
+    ShardedIndex over AsyncIndex shards
+
+    The methods sending requests are coroutines, the shards being queried
+    concurrently on the event loop (ex: `await sharded.search('prince')`).
+    """
+
+    async def search(self, query, opt_params=None, timeout=None):
+        params = shard_search_params(opt_params)
+        results = await self._scatter([
+            (shard.search, query, params, timeout) for shard in self.shards
+        ])
+        return self._merge(results, opt_params)
+
+    async def add_documents(self, documents, timeout=None):
+        return await self._write_routed('add_documents', documents, timeout)
+
+    async def update_documents(self, documents, timeout=None):
+        return await self._write_routed('update_documents', documents, timeout)
+
+    async def get_document(self, document_id):
+        return await self.shard_for(document_id).get_document(document_id)
+
+    async def delete_document(self, document_id):
+        return await super().delete_document(document_id)
+
+    async def delete_documents(self, ids):
+        return await super().delete_documents(ids)
+
+    async def delete_all_documents(self):
+        return await super().delete_all_documents()
+
+    async def update_settings(self, body):
+        return await super().update_settings(body)
+
+    async def get_settings(self):
+        return await self.shards[0].get_settings()
+
+    async def get_stats(self):
+        return self._sum_stats(await self._scatter([(shard.get_stats,) for shard in self.shards]))
+
+    async def wait_for_pending_update(self, updates, timeout_in_ms=5000, interval_in_ms=50):
+        return await super().wait_for_pending_update(updates, timeout_in_ms, interval_in_ms)
+
+    async def _scatter(self, calls):
+        async def skip():
+            return None
+        return list(await asyncio.gather(*[
+            skip() if call is None else call[0](*call[1:]) for call in calls
+        ]))
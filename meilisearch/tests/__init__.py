@@ -1,7 +1,11 @@
+import json
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 MASTER_KEY = 'masterKey'
 BASE_URL = 'http://127.0.0.1:7700'
+UNREACHABLE_URL = 'http://127.0.0.1:1'
 
 def clear_all_indexes(client):
     indexes = client.get_indexes()
@@ -13,3 +17,69 @@ def wait_for_dump_creation(client, dump_uid):
     while dump_status['status'] == 'processing':
         time.sleep(0.1)
         dump_status = client.get_dump_status(dump_uid)
+
+class _FakeNodeHandler(BaseHTTPRequestHandler):
+
+    def handle_request(self):
+        node = self.server.node
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        with node.lock:
+            node.requests.append((self.command, self.path))
+            node.in_flight += 1
+            node.peak = max(node.peak, node.in_flight)
+        try:
+            time.sleep(node.delay)
+            answer = node.respond(self.command, self.path)
+        finally:
+            with node.lock:
+                node.in_flight -= 1
+        status, payload = answer[:2]
+        body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        try:
+            self.send_response(status)
+            for header, value in (answer[2] if len(answer) > 2 else {}).items():
+                self.send_header(header, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass # The client gave up on the request (ex: the slower of two hedged requests)
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+    def log_message(self, *args): # pylint: disable=arguments-differ
+        pass
+
+class FakeNode:
+    """
+    Local HTTP server standing in for a MeiliSearch node, for failure and latency scenarios
+
+    Each request is answered after `delay` seconds by `respond(method, path)`, which
+    returns (status, payload) or (status, payload, headers), the payload being sent
+    as JSON (no body when None). The requests received are recorded as (method, path),
+    with the peak number of requests in flight.
+    """
+
+    def __init__(self, respond=None, delay=0.0):
+        self.respond = respond or (lambda method, path: (200, {}))
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _FakeNodeHandler)
+        self.server.daemon_threads = True
+        self.server.node = self
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self):
+        """Forget the recorded requests"""
+        with self.lock:
+            self.requests = []
+            self.peak = 0
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
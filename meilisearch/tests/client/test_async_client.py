@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+import meilisearch
+from meilisearch.async_index import AsyncIndex
+from meilisearch.errors import MeiliSearchApiError
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestAsyncClient:
+
+    """ TESTS: AsyncClient class """
+
+    def setup_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+
+    @staticmethod
+    def test_async_client_health_and_version():
+        """Tests the client routes through the aiohttp session"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                health = await client.health()
+                version = await client.get_version()
+                return health, version
+        health, version = asyncio.run(run())
+        assert health.status_code == 200
+        assert 'pkgVersion' in version
+
+    @staticmethod
+    def test_async_client_index_lifecycle():
+        """Tests creating, listing and deleting an index with the async client"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                index = await client.create_index('asyncUID', {'primaryKey': 'id'})
+                same_index = await client.get_or_create_index('asyncUID')
+                indexes = await client.get_indexes()
+                primary_key = await same_index.get_primary_key()
+                await index.delete()
+                return index, indexes, primary_key
+        index, indexes, primary_key = asyncio.run(run())
+        assert isinstance(index, AsyncIndex)
+        assert 'asyncUID' in [index['uid'] for index in indexes]
+        assert primary_key == 'id'
+
+    @staticmethod
+    def test_async_client_api_error():
+        """Tests that API errors are raised as MeiliSearchApiError"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY + '123') as client:
+                await client.get_indexes()
+        with pytest.raises(MeiliSearchApiError):
+            asyncio.run(run())
+
+    @staticmethod
+    def test_async_client_gather():
+        """Tests running requests with a bounded concurrency"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                return await client.gather((client.get_version() for _ in range(10)), concurrency=2)
+        responses = asyncio.run(run())
+        assert len(responses) == 10
+        assert all('pkgVersion' in response for response in responses)
+
+    @staticmethod
+    def test_async_client_several_event_loops():
+        """Tests using the same client from an event loop after another"""
+        client = meilisearch.AsyncClient(BASE_URL, MASTER_KEY)
+        assert 'pkgVersion' in asyncio.run(client.get_version())
+        assert 'pkgVersion' in asyncio.run(client.get_version())
+        asyncio.run(client.close())
+
+    @staticmethod
+    def test_async_client_sync_context_manager():
+        """Tests that the async client is not usable with a synchronous `with`"""
+        with pytest.raises(TypeError):
+            with meilisearch.AsyncClient(BASE_URL, MASTER_KEY):
+                pass
@@ -0,0 +1,70 @@
+import json
+import pytest
+import meilisearch
+from meilisearch.bulk import BulkIndexer
+from meilisearch.compression import RequestCompression
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestCompression:
+
+    """ TESTS: compression of document and settings uploads """
+
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+        with open('./datasets/small_movies.json', 'r') as dataset_file:
+            self.dataset_json = json.loads(dataset_file.read())
+
+    def teardown_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+
+    @staticmethod
+    def test_unknown_encoding():
+        """Tests that an unsupported encoding is rejected"""
+        with pytest.raises(ValueError):
+            meilisearch.Client(BASE_URL, MASTER_KEY, compression='br')
+
+    def test_add_documents_gzip(self):
+        """Tests adding documents with a gzip compressed body"""
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, compression='gzip')
+        index = client.create_index('gzipUID', {'primaryKey': 'id'})
+        response = index.add_documents(self.dataset_json)
+        index.wait_for_pending_update(response['updateId'])
+        assert index.get_stats()['numberOfDocuments'] == len(self.dataset_json)
+        stats = client.config.compression.stats()
+        assert stats['bodies'] == 1
+        assert stats['bytesOut'] < stats['bytesIn']
+
+    @staticmethod
+    def test_update_settings_deflate():
+        """Tests updating settings with a deflate compressed body, and skipping small bodies"""
+        compression = RequestCompression('deflate', level=1, min_size=64)
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, compression=compression)
+        index = client.create_index('deflateUID')
+        stop_words = ['the', 'a', 'an', 'of', 'to', 'in', 'and', 'or', 'for', 'with', 'on', 'at']
+        response = index.update_settings({'stopWords': stop_words})
+        index.wait_for_pending_update(response['updateId'])
+        assert compression.stats()['bodies'] == 1
+        response = index.update_settings({'stopWords': ['the']})
+        index.wait_for_pending_update(response['updateId'])
+        assert compression.stats()['bodies'] == 1
+        assert index.get_stop_words() == ['the']
+
+    def test_stream_file_gzip(self):
+        """Tests compressing a document file streamed with chunked transfer encoding"""
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, compression='gzip')
+        index = client.create_index('gzipStreamUID', {'primaryKey': 'id'})
+        with open('./datasets/small_movies.json', 'rb') as dataset_file:
+            response = index.add_documents(dataset_file)
+        index.wait_for_pending_update(response['updateId'])
+        assert index.get_stats()['numberOfDocuments'] == len(self.dataset_json)
+        assert client.config.compression.stats()['bodies'] == 1
+
+    def test_bulk_indexer_compression(self):
+        """Tests that the bulk indexer reports the compressed bytes sent"""
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, compression='gzip')
+        index = client.create_index('gzipBulkUID', {'primaryKey': 'id'})
+        stats = BulkIndexer(index, batch_size=10, workers=2).index_documents(self.dataset_json)
+        assert index.get_stats()['numberOfDocuments'] == len(self.dataset_json)
+        assert stats.bytes_sent < stats.bytes
@@ -0,0 +1,43 @@
+import meilisearch
+from meilisearch.tests import BASE_URL, MASTER_KEY
+
+class TestConnectionPool:
+
+    """ TESTS: HTTP session shared by the client and its indexes """
+
+    @staticmethod
+    def test_indexes_share_client_session():
+        """Tests that the indexes reuse the session of the client that created them"""
+        client = meilisearch.Client(BASE_URL, MASTER_KEY)
+        index = client.get_index('indexUID')
+        assert index.http.session is client.http.session
+        assert client.get_index('otherUID').http.session is client.http.session
+
+    @staticmethod
+    def test_clients_do_not_share_session():
+        """Tests that two clients have their own pool"""
+        client = meilisearch.Client(BASE_URL, MASTER_KEY)
+        other_client = meilisearch.Client(BASE_URL, MASTER_KEY)
+        assert client.http.session is not other_client.http.session
+
+    @staticmethod
+    def test_pool_size_options():
+        """Tests that the pool options are applied to the session adapters"""
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, pool_connections=2, pool_maxsize=32)
+        adapter = client.http.session.get_adapter(BASE_URL)
+        assert adapter._pool_connections == 2 # pylint: disable=protected-access
+        assert adapter._pool_maxsize == 32 # pylint: disable=protected-access
+
+    @staticmethod
+    def test_keep_alive_disabled():
+        """Tests that connections are closed after each request when keep_alive is False"""
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, keep_alive=False)
+        assert client.http.headers['Connection'] == 'close'
+        assert client.get_version()
+
+    @staticmethod
+    def test_client_close():
+        """Tests that a closed client reopens its connections on the next request"""
+        with meilisearch.Client(BASE_URL, MASTER_KEY) as client:
+            assert client.get_version()
+        assert client.get_version()
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+import meilisearch
+from meilisearch.errors import MeiliSearchApiError
+from meilisearch.instrumentation import RequestHooks
+from meilisearch._routes import route_template
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestHooks:
+
+    """ TESTS: request instrumentation hooks """
+
+    def setup_class(self):
+        client = meilisearch.Client(BASE_URL, MASTER_KEY)
+        clear_all_indexes(client)
+        index = client.create_index('hooksUID', {'primaryKey': 'id'})
+        index.wait_for_pending_update(index.add_documents([{'id': 1, 'title': 'Kung Fu Panda'}])['updateId'])
+
+    def teardown_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+
+    @staticmethod
+    def test_route_templates():
+        """Tests that the identifiers are removed from the routes"""
+        assert route_template('indexes/movies/search') == 'indexes/{index_uid}/search'
+        assert route_template('indexes/movies/documents/12?x=1') == 'indexes/{index_uid}/documents/{document_id}'
+        assert route_template('indexes/movies/documents/delete-batch') == 'indexes/{index_uid}/documents/delete-batch'
+        assert route_template('indexes/movies/updates/3') == 'indexes/{index_uid}/updates/{update_id}'
+        assert route_template('dumps/20201101-1/status') == 'dumps/{dump_uid}/status'
+        assert route_template('version') == 'version'
+
+    @staticmethod
+    def test_search_timing():
+        """Tests that the hooks receive the route, sizes and timing breakdown of a search"""
+        before, after = [], []
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, hooks=RequestHooks([before.append], [after.append]))
+        results = client.get_index('hooksUID').search('panda')
+        assert len(before) == len(after) == 1
+        info = after[0]
+        assert info is before[0]
+        assert info.method == 'POST'
+        assert info.route == 'indexes/{index_uid}/search'
+        assert info.index_uid == 'hooksUID'
+        assert info.node == BASE_URL
+        assert info.status == 200
+        assert info.attempts == 1
+        assert info.bytes_out > 0
+        assert info.bytes_in > 0
+        assert info.connect > 0
+        assert min(info.ttfb, info.download, info.decode) >= 0
+        assert info.total >= info.connect + info.ttfb + info.download + info.decode
+        assert info.processing_time_ms == results['processingTimeMs']
+        assert info.client_overhead_ms == pytest.approx(info.total * 1000 - results['processingTimeMs'])
+        assert info.to_dict()['indexUid'] == 'hooksUID'
+
+    @staticmethod
+    def test_reused_connection():
+        """Tests that no connect time is reported when a pooled connection is reused"""
+        after = []
+        client = meilisearch.Client(BASE_URL, MASTER_KEY)
+        client.health()
+        client.config.hooks.register(after=after.append)
+        client.get_version()
+        assert after[0].connect == 0
+        assert after[0].processing_time_ms is None
+        assert after[0].client_overhead_ms is None
+
+    @staticmethod
+    def test_failed_request():
+        """Tests that the hooks receive the error and status of a failed request"""
+        after = []
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, hooks=RequestHooks(after=[after.append]))
+        with pytest.raises(MeiliSearchApiError):
+            client.get_index('unknownHooksUID').info()
+        assert after[0].status == 404
+        assert isinstance(after[0].error, MeiliSearchApiError)
+        assert after[0].route == 'indexes/{index_uid}'
+
+    @staticmethod
+    def test_unregister():
+        """Tests that a hook is not called once removed"""
+        after = []
+        client = meilisearch.Client(BASE_URL, MASTER_KEY)
+        assert not client.config.hooks
+        client.config.hooks.register(after=after.append)
+        client.get_version()
+        client.config.hooks.unregister(after.append)
+        client.get_version()
+        assert len(after) == 1
+        assert not client.config.hooks
+
+    @staticmethod
+    def test_async_hooks():
+        """Tests the timing breakdown of the requests of the async client"""
+        after = []
+        async def run():
+            hooks = RequestHooks(after=[after.append])
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY, hooks=hooks) as client:
+                return await client.get_index('hooksUID').search('panda')
+        results = asyncio.run(run())
+        assert after[0].route == 'indexes/{index_uid}/search'
+        assert after[0].connect > 0
+        assert after[0].bytes_in > 0
+        assert after[0].processing_time_ms == results['processingTimeMs']
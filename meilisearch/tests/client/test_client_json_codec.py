@@ -0,0 +1,59 @@
+import pytest
+import meilisearch
+from meilisearch.json_codec import JsonCodec, get_codec
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class CountingCodec(JsonCodec):
+
+    def __init__(self):
+        self.encoded = 0
+        self.decoded = 0
+
+    def dumps(self, obj):
+        self.encoded += 1
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.decoded += 1
+        return super().loads(data)
+
+class TestJsonCodec:
+
+    """ TESTS: JSON codec of request and response bodies """
+
+    def setup_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+
+    @staticmethod
+    def test_default_codec():
+        """Tests that a codec is always available"""
+        codec = get_codec()
+        assert isinstance(codec, JsonCodec)
+        assert codec.loads(codec.dumps({'title': 'Léon'})) == {'title': 'Léon'}
+
+    @staticmethod
+    def test_stdlib_codec_by_name():
+        """Tests selecting the standard library codec by name"""
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, json_codec='json')
+        assert type(client.config.json_codec) is JsonCodec # pylint: disable=unidiomatic-typecheck
+        assert client.get_version()
+
+    @staticmethod
+    def test_unknown_codec():
+        """Tests that an unknown codec name is rejected"""
+        with pytest.raises(ValueError):
+            meilisearch.Client(BASE_URL, MASTER_KEY, json_codec='pickle')
+
+    @staticmethod
+    def test_custom_codec():
+        """Tests that the bodies are encoded and decoded once with a custom codec"""
+        codec = CountingCodec()
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, json_codec=codec)
+        index = client.create_index('codecUID')
+        assert codec.encoded == 1
+        response = index.add_documents([{'id': 1, 'title': 'Léon'}])
+        index.wait_for_pending_update(response['updateId'])
+        assert codec.encoded == 2
+        assert index.get_document(1)['title'] == 'Léon'
+        assert codec.decoded >= 4
+        index.delete()
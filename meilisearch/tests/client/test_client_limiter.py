@@ -0,0 +1,82 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import meilisearch
+from meilisearch.errors import MeiliSearchTimeoutError
+from meilisearch.limiter import Limit, RequestLimiter
+from meilisearch._routes import operation_class
+from meilisearch.tests import BASE_URL, MASTER_KEY, FakeNode
+
+class TestLimiter:
+
+    """ TESTS: client-side rate and concurrency limits """
+
+    node = None
+    url = None
+
+    def setup_class(self):
+        # Answers with an empty search after 50ms, recording the peak of concurrent requests
+        self.node = FakeNode(lambda method, path: (200, {'hits': []}), delay=0.05)
+        self.url = self.node.url
+
+    def teardown_class(self):
+        self.node.close()
+
+    @staticmethod
+    def test_operation_classes():
+        """Tests the classification of the requests"""
+        assert operation_class('POST', 'indexes/movies/search') == 'search'
+        assert operation_class('GET', 'indexes/movies/search?q=x') == 'search'
+        assert operation_class('GET', 'indexes/movies/documents') == 'read'
+        assert operation_class('GET', 'indexes/movies/updates/1') == 'read'
+        assert operation_class('POST', 'indexes/movies/documents') == 'write'
+        assert operation_class('DELETE', 'indexes/movies') == 'write'
+        assert operation_class('GET', 'keys') == 'admin'
+        assert operation_class('POST', 'dumps') == 'admin'
+
+    @staticmethod
+    def test_rate_limit():
+        """Tests that the requests of a class are spread according to its rate"""
+        limiter = RequestLimiter(admin=Limit(rate=20, burst=1))
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, limiter=limiter)
+        start = time.monotonic()
+        for _ in range(6):
+            client.get_version()
+        assert time.monotonic() - start >= 0.2
+        assert limiter.stats()['admin']['requests'] == 6
+        assert limiter.stats()['admin']['throttled'] >= 4
+        assert 'search' not in limiter.stats()
+
+    @staticmethod
+    def test_rate_limit_within_deadline():
+        """Tests that a request is not throttled past its deadline"""
+        limiter = RequestLimiter(admin=Limit(rate=1, burst=1))
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, limiter=limiter)
+        client.get_version()
+        with pytest.raises(MeiliSearchTimeoutError):
+            with client.deadline(0.2):
+                client.get_version()
+
+    def test_max_in_flight(self):
+        """Tests that the requests of a class sent at once, from several threads, are capped"""
+        self.node.reset()
+        limiter = RequestLimiter(search=Limit(max_in_flight=2))
+        index = meilisearch.Client(self.url, MASTER_KEY, limiter=limiter).get_index('indexUID')
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(lambda _: index.search(''), range(6)))
+        assert self.node.peak == 2
+        assert limiter.stats()['search']['inFlight'] == 0
+
+    def test_max_in_flight_async(self):
+        """Tests that the requests of a class sent at once by asyncio tasks are capped"""
+        self.node.reset()
+        limiter = RequestLimiter(search=Limit(max_in_flight=1))
+        async def run():
+            async with meilisearch.AsyncClient(self.url, MASTER_KEY, limiter=limiter) as client:
+                index = client.get_index('indexUID')
+                await asyncio.gather(*[index.search('') for _ in range(4)])
+        asyncio.run(run())
+        assert self.node.peak == 1
+        assert limiter.stats()['search']['requests'] == 4
+        assert limiter.stats()['search']['waiting'] == 0
@@ -0,0 +1,126 @@
+import gc
+import threading
+import pytest
+import meilisearch
+from meilisearch.errors import MeiliSearchApiError
+from meilisearch.instrumentation import RequestInfo
+from meilisearch.metrics import LatencyHistogram, MetricsRegistry, bucket_index, bucket_value
+from meilisearch.search_cache import SearchCache
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+def search_info(total):
+    info = RequestInfo('POST', 'indexes/movies/search', 'indexes/{index_uid}/search', 'movies')
+    info.status = 200
+    info.finish()
+    info.total = total
+    return info
+
+class TestMetrics:
+
+    """ TESTS: in-process metrics registry """
+
+    def setup_class(self):
+        client = meilisearch.Client(BASE_URL, MASTER_KEY)
+        clear_all_indexes(client)
+        index = client.create_index('metricsUID', {'primaryKey': 'id'})
+        index.wait_for_pending_update(index.add_documents([{'id': 1, 'title': 'Kung Fu Panda'}])['updateId'])
+
+    def teardown_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+
+    @staticmethod
+    def test_buckets():
+        """Tests that the histogram buckets are contiguous and precise within 1/64"""
+        previous = -1
+        for microseconds in range(0, 100000, 7):
+            index = bucket_index(microseconds)
+            assert index >= previous
+            assert bucket_value(index) <= microseconds < bucket_value(index) * (1 + 1 / 64) + 1
+            previous = index
+
+    @staticmethod
+    def test_quantiles():
+        """Tests the percentiles of a histogram"""
+        histogram = LatencyHistogram()
+        for milliseconds in range(1, 1001):
+            histogram.record(milliseconds / 1000)
+        stats = histogram.to_dict()
+        assert stats['count'] == 1000
+        assert stats['p50'] == pytest.approx(0.5, rel=0.02)
+        assert stats['p95'] == pytest.approx(0.95, rel=0.02)
+        assert stats['p99'] == pytest.approx(0.99, rel=0.02)
+        assert stats['max'] == 1.0
+
+    @staticmethod
+    def test_client_metrics():
+        """Tests the metrics of the requests of an instrumented client"""
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, search_cache=SearchCache())
+        metrics = MetricsRegistry().instrument(client)
+        index = client.get_index('metricsUID')
+        index.search('panda')
+        index.search('panda')
+        index.search('fu')
+        with pytest.raises(MeiliSearchApiError):
+            client.get_index('unknownMetricsUID').info()
+        snapshot = metrics.snapshot()
+        search = snapshot['operations']['POST indexes/{index_uid}/search']
+        assert search['requests'] == 2
+        assert search['errorRate'] == 0
+        assert search['bytesIn'] > 0
+        assert search['latency']['count'] == 2
+        assert 0 < search['latency']['p50'] <= search['latency']['max']
+        assert snapshot['operations']['GET indexes/{index_uid}']['errorRate'] == 1
+        assert snapshot['errors'] == {'index_not_found': 1}
+        assert snapshot['searchCache'] == {'hits': 1, 'misses': 2, 'hitRatio': 1 / 3}
+        assert snapshot['connections']['new'] == 1
+        assert snapshot['connections']['reuseRatio'] == 2 / 3
+
+    @staticmethod
+    def test_openmetrics():
+        """Tests the OpenMetrics export"""
+        metrics = MetricsRegistry()
+        metrics.record(search_info(0.003))
+        metrics.record(search_info(0.2))
+        text = metrics.openmetrics()
+        labels = 'method="POST",route="indexes/{index_uid}/search"'
+        assert 'meilisearch_client_requests_total{%s} 2' % labels in text
+        assert 'meilisearch_client_request_duration_seconds_bucket{%s,le="0.005"} 1' % labels in text
+        assert 'meilisearch_client_request_duration_seconds_bucket{%s,le="+Inf"} 2' % labels in text
+        assert 'meilisearch_client_request_latency_seconds{%s,quantile="0.99"}' % labels in text
+        assert 'meilisearch_client_connections_total{state="reused"} 2' in text
+        assert text.endswith('# EOF\n')
+
+    @staticmethod
+    def test_concurrent_recording():
+        """Tests that the requests recorded from several threads are all counted"""
+        metrics = MetricsRegistry()
+        def record():
+            for _ in range(500):
+                metrics.record(search_info(0.01))
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        search = metrics.snapshot()['operations']['POST indexes/{index_uid}/search']
+        assert search['requests'] == 4000
+        assert search['latency']['count'] == 4000
+        metrics.reset()
+        assert not metrics.snapshot()['operations']
+
+    @staticmethod
+    def test_exited_threads_retired():
+        """Tests that the metrics of exited threads are kept, without a shard per thread"""
+        metrics = MetricsRegistry()
+        for _ in range(50):
+            thread = threading.Thread(target=metrics.record, args=(search_info(0.01),))
+            thread.start()
+            thread.join()
+        gc.collect()
+        assert not metrics._MetricsRegistry__shards # pylint: disable=protected-access
+        search = metrics.snapshot()['operations']['POST indexes/{index_uid}/search']
+        assert search['requests'] == 50
+        assert search['latency']['count'] == 50
+        metrics.record(search_info(0.01))
+        metrics.reset()
+        assert not metrics.snapshot()['operations']
@@ -0,0 +1,86 @@
+import json
+import time
+import pytest
+import meilisearch
+from meilisearch.nodes import NodePool
+from meilisearch.tests import BASE_URL, MASTER_KEY, UNREACHABLE_URL, FakeNode, clear_all_indexes
+
+class TestNodes:
+
+    """ TESTS: multi-node client """
+
+    replica = None
+    replica_url = None
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+        # Read replica answering every request with an empty search
+        self.replica = FakeNode(lambda method, path: (200, {'hits': [], 'query': ''}))
+        self.replica_url = self.replica.url
+        with open('./datasets/small_movies.json', 'r') as dataset_file:
+            self.dataset_json = json.loads(dataset_file.read())
+
+    def teardown_class(self):
+        self.replica.close()
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+
+    @staticmethod
+    def test_unknown_load_balancing():
+        """Tests that an unknown load balancing is rejected"""
+        with pytest.raises(ValueError):
+            meilisearch.Client([BASE_URL, UNREACHABLE_URL], MASTER_KEY, load_balancing='random')
+
+    def test_writes_go_to_primary(self):
+        """Tests that writes are sent to the primary, and searches spread over the nodes"""
+        self.replica.reset()
+        client = meilisearch.Client([BASE_URL, self.replica_url], MASTER_KEY, load_balancing='least_outstanding')
+        index = client.create_index('nodesUID', {'primaryKey': 'id'})
+        response = index.add_documents(self.dataset_json)
+        index.wait_for_pending_update(response['updateId'])
+        assert not self.replica.requests
+        for _ in range(30):
+            index.search('How to Train Your Dragon')
+        primary, replica = client.config.nodes.stats()
+        assert primary['requests'] > 3
+        assert replica['requests'] > 0
+        assert all(path.endswith('/search') for _, path in self.replica.requests)
+        index.delete()
+
+    def test_failover_and_ejection(self):
+        """Tests that reads fail over to a healthy node, and that a failing node is ejected"""
+        client = meilisearch.Client([BASE_URL, UNREACHABLE_URL], MASTER_KEY, load_balancing='least_outstanding')
+        index = client.create_index('failoverUID', {'primaryKey': 'id'})
+        response = index.add_documents(self.dataset_json)
+        index.wait_for_pending_update(response['updateId'])
+        for _ in range(50):
+            assert index.search('How to Train Your Dragon')['hits'][0]['id'] == '166428'
+        replica = client.config.nodes.stats()[1]
+        assert replica['ejected']
+        assert replica['failures'] == 3
+        client.close()
+        index.delete()
+
+    def test_probe_readmits_node(self):
+        """Tests that an ejected node is re-admitted once its health probe succeeds"""
+        nodes = NodePool([BASE_URL, self.replica_url], max_failures=2, probe_interval_in_ms=20)
+        replica = nodes.nodes[1]
+        for _ in range(2):
+            nodes.finish(replica, nodes.start(replica), failed=True)
+        assert replica.ejected
+        assert nodes.select(True) is nodes.primary
+        deadline = time.monotonic() + 2
+        while replica.ejected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not replica.ejected
+        nodes.close()
+
+    def test_ewma_prefers_fast_node(self):
+        """Tests that the EWMA selection favors the node with the lowest latency"""
+        nodes = NodePool([BASE_URL, self.replica_url])
+        primary, replica = nodes.nodes
+        nodes.finish(primary, time.monotonic() - 0.5, failed=False)
+        nodes.finish(replica, time.monotonic() - 0.001, failed=False)
+        primary.outstanding = replica.outstanding = 0
+        assert all(nodes.select(True) is replica for _ in range(10))
+        assert nodes.select(False) is primary
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import pytest
+import meilisearch
+from meilisearch.errors import MeiliSearchReplicationError
+from meilisearch.replication import ReplicatedResponse, ReplicationPolicy
+from meilisearch.retry import RetryPolicy
+from meilisearch.tests import BASE_URL, MASTER_KEY, UNREACHABLE_URL, FakeNode, clear_all_indexes
+
+# Status of the updates of the follower, or 'error' for a follower failing to answer it
+FOLLOWER = {'status': 'processed'}
+
+def follower_answer(method, _path):
+    """Follower accepting every write as update 7"""
+    if method != 'GET':
+        return 202, {'updateId': 7}
+    if FOLLOWER['status'] == 'error':
+        return 500, {'message': 'Internal error', 'errorCode': 'internal', 'errorLink': ''}
+    return 200, {'updateId': 7, 'status': FOLLOWER['status']}
+
+class TestReplication:
+
+    """ TESTS: replicated writes """
+
+    follower = None
+    follower_url = None
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+        meilisearch.Client(BASE_URL, MASTER_KEY).create_index('replicatedUID', {'primaryKey': 'id'})
+        self.follower = FakeNode(follower_answer)
+        self.follower_url = self.follower.url
+        with open('./datasets/small_movies.json', 'r') as dataset_file:
+            self.dataset_json = json.loads(dataset_file.read())
+
+    def teardown_class(self):
+        self.follower.close()
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+
+    def follower_writes(self):
+        return [request for request in self.follower.requests if request[0] != 'GET']
+
+    def client(self, quorum=None, unreachable=False):
+        urls = [BASE_URL, self.follower_url] + ([UNREACHABLE_URL] if unreachable else [])
+        return meilisearch.Client(urls, MASTER_KEY, replication=ReplicationPolicy(quorum=quorum))
+
+    def test_write_sent_to_every_node(self):
+        """Tests that a write reaches every node, and that its update is awaited on each one"""
+        self.follower.reset()
+        FOLLOWER['status'] = 'processed'
+        index = self.client().get_index('replicatedUID')
+        response = index.add_documents(self.dataset_json)
+        assert isinstance(response, ReplicatedResponse)
+        assert isinstance(response['updateId'], int)
+        assert response.update_ids[self.follower_url] == 7
+        assert self.follower_writes() == [('POST', '/indexes/replicatedUID/documents')]
+        update = index.wait_for_pending_update(response)
+        assert update['status'] == 'processed'
+        assert update.responses[self.follower_url]['status'] == 'processed'
+        assert not update.lagging
+        primary = meilisearch.Client(BASE_URL, MASTER_KEY).get_index('replicatedUID')
+        assert primary.search('How to Train Your Dragon')['hits']
+
+    def test_quorum_tolerates_failed_node(self):
+        """Tests that a write accepted by a quorum succeeds, and that the failed node is reported"""
+        FOLLOWER['status'] = 'processed'
+        client = self.client(quorum=2, unreachable=True)
+        response = client.get_index('replicatedUID').update_documents([{'id': 1, 'title': 'Replicated'}])
+        assert UNREACHABLE_URL in response.errors
+        assert response.lagging == [UNREACHABLE_URL]
+        update = client.get_index('replicatedUID').wait_for_pending_update(response)
+        assert update['status'] == 'processed'
+        lagging = client.config.replication.lagging()
+        assert lagging[UNREACHABLE_URL]['failedWrites'] == 1
+        assert self.follower_url not in lagging
+        client.config.replication.repaired(UNREACHABLE_URL)
+        assert not client.config.replication.lagging()
+
+    def test_quorum_not_reached(self):
+        """Tests that a write accepted by fewer nodes than the quorum raises"""
+        client = self.client(quorum=3, unreachable=True)
+        with pytest.raises(MeiliSearchReplicationError) as err:
+            client.get_index('replicatedUID').add_documents([{'id': 2, 'title': 'Lost'}])
+        assert list(err.value.errors) == [UNREACHABLE_URL]
+
+    def test_retries_stay_on_the_node(self):
+        """Tests that a node failing a replicated write is retried, not replaced by another node"""
+        self.follower.reset()
+        client = meilisearch.Client(
+            [self.follower_url, UNREACHABLE_URL],
+            MASTER_KEY,
+            replication=ReplicationPolicy(quorum=2),
+            retry_policy=RetryPolicy(backoff_in_ms=1)
+        )
+        with pytest.raises(MeiliSearchReplicationError) as err:
+            client.get_index('replicatedUID').add_documents([{'id': 2, 'title': 'Retried'}])
+        assert list(err.value.errors) == [UNREACHABLE_URL]
+        assert self.follower_writes() == [('POST', '/indexes/replicatedUID/documents')]
+
+    def test_slow_node_reported(self):
+        """Tests that the nodes still processing an update once the quorum is reached are reported"""
+        FOLLOWER['status'] = 'enqueued'
+        client = self.client(quorum=1)
+        index = client.get_index('replicatedUID')
+        update = index.wait_for_pending_update(index.add_documents([{'id': 3, 'title': 'Slow'}]))
+        assert update.lagging == [self.follower_url]
+        assert client.config.replication.lagging()[self.follower_url]['unprocessedUpdates'] == 1
+
+    def test_polling_error_tolerated(self):
+        """Tests that a node failing while its update is polled is reported, and the quorum awaited"""
+        FOLLOWER['status'] = 'error'
+        client = self.client(quorum=1)
+        index = client.get_index('replicatedUID')
+        update = index.wait_for_pending_update(index.add_documents([{'id': 4, 'title': 'Polled'}]))
+        assert update['status'] == 'processed'
+        assert update.lagging == [self.follower_url]
+        assert client.config.replication.lagging()[self.follower_url]['unprocessedUpdates'] == 1
+
+    def test_polling_error_without_quorum(self):
+        """Tests that the wait fails once too many nodes failed to process the update"""
+        FOLLOWER['status'] = 'error'
+        index = self.client(quorum=2).get_index('replicatedUID')
+        response = index.add_documents([{'id': 5, 'title': 'Unpolled'}])
+        with pytest.raises(MeiliSearchReplicationError) as err:
+            index.wait_for_pending_update(response)
+        assert list(err.value.errors) == [self.follower_url]
+
+    def test_async_polling_error_tolerated(self):
+        """Tests that the async client awaits the quorum when a node fails while its update is polled"""
+        FOLLOWER['status'] = 'error'
+        policy = ReplicationPolicy(quorum=1)
+        async def run():
+            async with meilisearch.AsyncClient([BASE_URL, self.follower_url], MASTER_KEY, replication=policy) as client:
+                index = client.get_index('replicatedUID')
+                return await index.wait_for_pending_update(await index.add_documents([{'id': 6, 'title': 'Async'}]))
+        update = asyncio.run(run())
+        assert update['status'] == 'processed'
+        assert update.lagging == [self.follower_url]
+        assert policy.lagging()[self.follower_url]['unprocessedUpdates'] == 1
+
+    def test_reads_not_replicated(self):
+        """Tests that reads are not sent to every node"""
+        self.follower.reset()
+        FOLLOWER['status'] = 'processed'
+        index = self.client().get_index('replicatedUID')
+        assert isinstance(index.get_settings(), dict)
+        assert not isinstance(index.get_settings(), ReplicatedResponse)
+        assert not self.follower_writes()
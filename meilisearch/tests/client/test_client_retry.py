@@ -0,0 +1,89 @@
+import pytest
+import meilisearch
+from meilisearch.errors import MeiliSearchApiError, MeiliSearchCommunicationError
+from meilisearch.retry import RetryPolicy
+from meilisearch.tests import MASTER_KEY, UNREACHABLE_URL, FakeNode
+
+class TestRetry:
+
+    """ TESTS: retry policy """
+
+    node = None
+    failures = 0
+
+    def setup_class(self):
+        # Answers 503 to the first `failures` requests, then 200
+        self.node = FakeNode(lambda method, path: (
+            (503, None, {'Retry-After': '0'}) if len(self.node.requests) <= self.failures else (200, {'updateId': 0})
+        ))
+
+    def teardown_class(self):
+        self.node.close()
+
+    def flaky_client(self, failures, policy):
+        type(self).failures = failures
+        self.node.reset()
+        return meilisearch.Client(self.node.url, MASTER_KEY, retry_policy=policy)
+
+    @staticmethod
+    def test_no_retry_by_default():
+        """Tests that a connection error is raised at once without a retry policy"""
+        client = meilisearch.Client(UNREACHABLE_URL, MASTER_KEY)
+        with pytest.raises(MeiliSearchCommunicationError):
+            client.get_version()
+
+    @staticmethod
+    def test_retry_connection_refused():
+        """Tests that a refused connection is retried up to max_attempts"""
+        policy = RetryPolicy(max_attempts=3, backoff_in_ms=1)
+        client = meilisearch.Client(UNREACHABLE_URL, MASTER_KEY, retry_policy=policy)
+        with pytest.raises(MeiliSearchCommunicationError):
+            client.get_version()
+        with pytest.raises(MeiliSearchCommunicationError):
+            client.get_index('indexUID').add_documents([{'id': 1}])
+        assert policy.stats()['retries'] == 4
+        assert policy.stats()['exhausted'] == 2
+
+    @staticmethod
+    def test_retry_budget():
+        """Tests that retries stop once the budget is spent"""
+        policy = RetryPolicy(max_attempts=5, backoff_in_ms=1, budget=2)
+        client = meilisearch.Client(UNREACHABLE_URL, MASTER_KEY, retry_policy=policy)
+        with pytest.raises(MeiliSearchCommunicationError):
+            client.get_version()
+        assert policy.stats()['retries'] == 2
+        assert policy.stats()['budgetExhausted'] == 1
+
+    @staticmethod
+    def test_stream_not_replayed():
+        """Tests that a streamed body is never sent twice"""
+        policy = RetryPolicy(max_attempts=3, backoff_in_ms=1, retry_writes=True)
+        client = meilisearch.Client(UNREACHABLE_URL, MASTER_KEY, retry_policy=policy)
+        with open('./datasets/small_movies.json', 'rb') as dataset_file:
+            with pytest.raises(MeiliSearchCommunicationError):
+                client.get_index('indexUID').add_documents(dataset_file)
+        assert policy.stats()['retries'] == 0
+
+    def test_retry_read_on_status(self):
+        """Tests that a read answered with 503 is retried"""
+        policy = RetryPolicy(max_attempts=3, backoff_in_ms=1)
+        client = self.flaky_client(2, policy)
+        assert client.get_index('indexUID').get_documents() == {'updateId': 0}
+        assert len(self.node.requests) == 3
+        assert policy.stats()['retries'] == 2
+
+    def test_write_not_retried_on_status(self):
+        """Tests that a write answered with 503 is not replayed without opt-in"""
+        policy = RetryPolicy(max_attempts=3, backoff_in_ms=1)
+        client = self.flaky_client(1, policy)
+        with pytest.raises(MeiliSearchApiError) as error:
+            client.get_index('indexUID').add_documents([{'id': 1}])
+        assert error.value.status_code == 503
+        assert len(self.node.requests) == 1
+
+    def test_write_retried_with_opt_in(self):
+        """Tests that a write is replayed when retry_writes is True"""
+        policy = RetryPolicy(max_attempts=3, backoff_in_ms=1, retry_writes=True)
+        client = self.flaky_client(1, policy)
+        assert client.get_index('indexUID').add_documents([{'id': 1}]) == {'updateId': 0}
+        assert len(self.node.requests) == 2
@@ -0,0 +1,86 @@
+import asyncio
+import time
+import pytest
+import meilisearch
+from meilisearch.errors import MeiliSearchCommunicationError, MeiliSearchTimeoutError
+from meilisearch.retry import RetryPolicy
+from meilisearch.tests import MASTER_KEY, FakeNode
+
+class TestTimeout:
+
+    """ TESTS: request timeouts and deadlines """
+
+    node = None
+    url = None
+
+    def setup_class(self):
+        # Answers with an enqueued update after the delay of the node
+        self.node = FakeNode(lambda method, path: (200, {'updateId': 0, 'status': 'enqueued'}))
+        self.url = self.node.url
+
+    def teardown_class(self):
+        self.node.close()
+
+    def test_client_timeout(self):
+        """Tests that a request slower than the timeout of the client fails"""
+        self.node.delay = 0.3
+        client = meilisearch.Client(self.url, MASTER_KEY, timeout=0.05)
+        with pytest.raises(MeiliSearchTimeoutError):
+            client.get_index('indexUID').search('')
+
+    def test_timeout_per_call(self):
+        """Tests that the timeout of a call overrides the timeout of the client"""
+        self.node.delay = 0.1
+        client = meilisearch.Client(self.url, MASTER_KEY, timeout=0.02)
+        assert client.get_index('indexUID').search('', timeout=(1, 1))['updateId'] == 0
+
+    def test_deadline(self):
+        """Tests that a request fails once the deadline is exceeded"""
+        self.node.delay = 0.5
+        client = meilisearch.Client(self.url, MASTER_KEY)
+        start = time.monotonic()
+        with pytest.raises(MeiliSearchTimeoutError):
+            with client.deadline(0.1):
+                client.get_index('indexUID').get_documents()
+        assert time.monotonic() - start < 0.4
+
+    @staticmethod
+    def test_deadline_caps_retries():
+        """Tests that no retry is attempted past the deadline"""
+        policy = RetryPolicy(max_attempts=10, backoff_in_ms=100)
+        client = meilisearch.Client('http://127.0.0.1:1', MASTER_KEY, retry_policy=policy)
+        start = time.monotonic()
+        with pytest.raises(MeiliSearchCommunicationError):
+            with client.deadline(0.25):
+                client.get_index('indexUID').get_documents()
+        assert time.monotonic() - start < 0.25
+        assert policy.stats()['retries'] < 3
+
+    def test_deadline_caps_polling(self):
+        """Tests that wait_for_pending_update stops at the deadline"""
+        self.node.delay = 0.0
+        client = meilisearch.Client(self.url, MASTER_KEY)
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            with client.deadline(0.2):
+                client.get_index('indexUID').wait_for_pending_update(0, timeout_in_ms=5000)
+        assert time.monotonic() - start < 1
+
+    def test_nested_deadline(self):
+        """Tests that the earliest of nested deadlines wins"""
+        client = meilisearch.Client(self.url, MASTER_KEY)
+        with client.deadline(0.1) as outer:
+            with client.deadline(10) as inner:
+                assert inner.expires_at == outer.expires_at
+
+    def test_async_deadline(self):
+        """Tests the deadline with the async client"""
+        self.node.delay = 0.5
+        async def run():
+            async with meilisearch.AsyncClient(self.url, MASTER_KEY) as client:
+                with client.deadline(0.1):
+                    await client.get_index('indexUID').get_documents()
+        start = time.monotonic()
+        with pytest.raises(MeiliSearchTimeoutError):
+            asyncio.run(run())
+        assert time.monotonic() - start < 0.4
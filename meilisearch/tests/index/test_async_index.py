@@ -0,0 +1,180 @@
+import asyncio
+import json
+import pytest
+import meilisearch
+from meilisearch.errors import MeiliSearchCommunicationError
+from meilisearch.replication import ReplicationPolicy
+from meilisearch.retry import RetryPolicy
+from meilisearch.search_cache import SearchCache
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestAsyncIndex:
+
+    """ TESTS: AsyncIndex class """
+
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+        with open('./datasets/small_movies.json', 'r') as dataset_file:
+            self.dataset_json = json.loads(dataset_file.read())
+
+    def teardown_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+
+    def test_async_add_documents_and_search(self):
+        """Tests adding documents, waiting for the update and searching"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                index = await client.create_index('asyncIndexUID')
+                response = await index.add_documents(self.dataset_json, primary_key='id')
+                update = await index.wait_for_pending_update(response['updateId'])
+                search = await index.search('How to Train Your Dragon')
+                document = await index.get_document('166428')
+                return update, search, document
+        update, search, document = asyncio.run(run())
+        assert update['status'] == 'processed'
+        assert search['hits'][0]['id'] == '166428'
+        assert document['id'] == '166428'
+
+    def test_async_add_documents_concurrently(self):
+        """Tests sending several batches with a bounded concurrency"""
+        batches = [self.dataset_json[i:i + 5] for i in range(0, len(self.dataset_json), 5)]
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                index = await client.create_index('asyncBatchesUID', {'primaryKey': 'id'})
+                updates = await index.add_documents_concurrently(batches, concurrency=2)
+                for update in updates:
+                    await index.wait_for_pending_update(update['updateId'])
+                return updates, await index.get_stats()
+        updates, stats = asyncio.run(run())
+        assert len(updates) == len(batches)
+        assert stats['numberOfDocuments'] == len(self.dataset_json)
+
+    @staticmethod
+    def test_async_settings():
+        """Tests updating and getting settings with the async index"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                index = await client.create_index('asyncSettingsUID')
+                response = await index.update_stop_words(['the'])
+                await index.wait_for_pending_update(response['updateId'])
+                return await index.get_stop_words()
+        assert asyncio.run(run()) == ['the']
+
+    def test_async_add_documents_in_batches(self):
+        """Tests splitting documents in batches with the async index"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                index = await client.create_index('asyncInBatchesUID', {'primaryKey': 'id'})
+                updates = await index.add_documents_in_batches(self.dataset_json, batch_size=10)
+                for update in updates:
+                    await index.wait_for_pending_update(update['updateId'])
+                return updates, await index.get_stats()
+        updates, stats = asyncio.run(run())
+        assert len(updates) == (len(self.dataset_json) + 9) // 10
+        assert stats['numberOfDocuments'] == len(self.dataset_json)
+
+    def test_async_wait_for_updates(self):
+        """Tests waiting for several updates without blocking the event loop"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                index = await client.create_index('asyncWaitUID', {'primaryKey': 'id'})
+                updates = await index.add_documents_in_batches(self.dataset_json, batch_size=10)
+                update_ids = [update['updateId'] for update in updates]
+                return update_ids, [update async for update in index.wait_for_updates(update_ids)]
+        update_ids, updates = asyncio.run(run())
+        assert sorted(update['updateId'] for update in updates) == sorted(update_ids)
+
+    @staticmethod
+    def test_async_search_cache():
+        """Tests that the async index uses the search cache of the client"""
+        cache = SearchCache()
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY, search_cache=cache) as client:
+                index = await client.create_index('asyncCacheUID', {'primaryKey': 'id'})
+                await index.search('Dragon')
+                await index.search('Dragon')
+                await index.add_documents([{'id': 1, 'title': 'Dragon'}])
+        asyncio.run(run())
+        assert cache.stats()['hits'] == 1
+        assert len(cache) == 0
+
+    def test_async_add_documents_raw_payload(self):
+        """Tests sending documents as JSON bytes and streaming them from a file object"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                index = await client.create_index('asyncRawUID', {'primaryKey': 'id'})
+                response = await index.add_documents(json.dumps(self.dataset_json[:10]).encode('utf-8'))
+                await index.wait_for_pending_update(response['updateId'])
+                first = (await index.get_stats())['numberOfDocuments']
+                with open('./datasets/small_movies.json', 'rb') as dataset_file:
+                    response = await index.add_documents(dataset_file)
+                await index.wait_for_pending_update(response['updateId'])
+                return first, (await index.get_stats())['numberOfDocuments']
+        assert asyncio.run(run()) == (10, len(self.dataset_json))
+
+    @staticmethod
+    def test_async_str_setting_serialized():
+        """Tests that a str setting is serialized to JSON, unlike documents given as a str"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                index = await client.create_index('asyncDistinctUID')
+                response = await index.update_distinct_attribute('title')
+                await index.wait_for_pending_update(response['updateId'])
+                return await index.get_distinct_attribute()
+        assert asyncio.run(run()) == 'title'
+
+    def test_async_add_documents_compressed(self):
+        """Tests adding documents with a compressed body, from a list and from a file object"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY, compression='gzip') as client:
+                index = await client.create_index('asyncGzipUID', {'primaryKey': 'id'})
+                response = await index.add_documents(self.dataset_json[:10])
+                await index.wait_for_pending_update(response['updateId'])
+                with open('./datasets/small_movies.json', 'rb') as dataset_file:
+                    response = await index.add_documents(dataset_file)
+                await index.wait_for_pending_update(response['updateId'])
+                return (await index.get_stats())['numberOfDocuments'], client.config.compression.stats()
+        count, stats = asyncio.run(run())
+        assert count == len(self.dataset_json)
+        assert stats['bodies'] == 2
+
+    @staticmethod
+    def test_async_retry_connection_refused():
+        """Tests that the async client retries a refused connection"""
+        policy = RetryPolicy(max_attempts=2, backoff_in_ms=1)
+        async def run():
+            async with meilisearch.AsyncClient('http://127.0.0.1:1', MASTER_KEY, retry_policy=policy) as client:
+                await client.get_version()
+        with pytest.raises(MeiliSearchCommunicationError):
+            asyncio.run(run())
+        assert policy.stats()['retries'] == 1
+
+    def test_async_failover(self):
+        """Tests that async reads fail over from an unreachable replica"""
+        async def run():
+            urls = [BASE_URL, 'http://127.0.0.1:1']
+            async with meilisearch.AsyncClient(urls, MASTER_KEY, load_balancing='least_outstanding') as client:
+                index = await client.create_index('asyncFailoverUID', {'primaryKey': 'id'})
+                response = await index.add_documents(self.dataset_json)
+                await index.wait_for_pending_update(response['updateId'])
+                results = [await index.search('How to Train Your Dragon') for _ in range(20)]
+                return results, client.config.nodes.stats()
+        results, stats = asyncio.run(run())
+        assert all(result['hits'][0]['id'] == '166428' for result in results)
+        assert stats[1]['failures'] > 0
+
+    def test_async_replicated_write(self):
+        """Tests that async writes are sent to every node, and tolerate a failed node within the quorum"""
+        policy = ReplicationPolicy(quorum=1)
+        async def run():
+            urls = [BASE_URL, 'http://127.0.0.1:1']
+            async with meilisearch.AsyncClient(urls, MASTER_KEY, replication=policy) as client:
+                index = await client.create_index('asyncReplicatedUID', {'primaryKey': 'id'})
+                response = await index.add_documents(self.dataset_json)
+                return response, await index.wait_for_pending_update(response)
+        response, update = asyncio.run(run())
+        assert response.lagging == ['http://127.0.0.1:1']
+        assert update['status'] == 'processed'
+        assert policy.lagging()['http://127.0.0.1:1']['failedWrites'] == 2
@@ -0,0 +1,75 @@
+import json
+import meilisearch
+from meilisearch.bulk import BulkIndexer
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestBulkIndexer:
+
+    """ TESTS: BulkIndexer class """
+
+    client = meilisearch.Client(BASE_URL, MASTER_KEY)
+    index = None
+    dataset_file = None
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(self.client)
+        self.index = self.client.create_index(uid='indexUID', options={'primaryKey': 'id'})
+        self.dataset_file = open('./datasets/small_movies.json', 'r')
+        self.dataset_json = json.loads(self.dataset_file.read())
+        self.dataset_file.close()
+
+    def teardown_class(self):
+        self.index.delete()
+
+    def test_bulk_indexer_add_documents(self):
+        """Tests indexing documents with several workers and a bounded update queue"""
+        indexer = BulkIndexer(self.index, batch_size=5, workers=3, max_pending_updates=2)
+        stats = indexer.index_documents(iter(self.dataset_json))
+        assert stats.documents == len(self.dataset_json)
+        assert stats.batches == (len(self.dataset_json) + 4) // 5
+        assert stats.failed_batches == 0
+        assert stats.bytes > 0
+        assert stats.documents_per_second > 0
+        assert self.index.get_stats()['numberOfDocuments'] == len(self.dataset_json)
+        for update in self.index.get_all_update_status():
+            assert update['status'] != 'enqueued'
+
+    def test_bulk_indexer_max_batch_bytes(self):
+        """Tests that the batches too big are split by the workers, each update within the limit"""
+        indexer = BulkIndexer(self.index, batch_size=10, max_batch_bytes=2048, workers=2)
+        stats = indexer.index_documents(self.dataset_json)
+        assert stats.documents == len(self.dataset_json)
+        assert stats.batches > (len(self.dataset_json) + 9) // 10
+        assert stats.failed_batches == 0
+        assert stats.bytes <= stats.batches * 2048
+
+    def test_bulk_indexer_update_documents(self):
+        """Tests partially updating documents"""
+        documents = [{'id': document['id'], 'title': 'Bulk'} for document in self.dataset_json]
+        stats = BulkIndexer(self.index, batch_size=10, update=True).index_documents(documents)
+        assert stats.failed_batches == 0
+        document = self.index.get_document(self.dataset_json[0]['id'])
+        assert document['title'] == 'Bulk'
+        assert document['overview'] == self.dataset_json[0]['overview']
+
+    def test_bulk_indexer_failed_batches(self):
+        """Tests that the failed batches are reported"""
+        index = self.client.create_index(uid='failedBulkUID', options={'primaryKey': 'id'})
+        documents = [{'title': 'Missing id'}, {'id': 1, 'title': 'Le Petit Prince'}]
+        stats = BulkIndexer(index, batch_size=1).index_documents(documents)
+        assert stats.failed_batches == 1
+        assert len(stats.errors) == 1
+        assert stats.to_dict()['failedBatches'] == 1
+        index.delete()
+
+    def test_bulk_indexer_generated_dataset(self):
+        """Tests indexing a synthetic dataset streamed lazily"""
+        index = self.client.create_index(uid='generatedUID', options={'primaryKey': 'id'})
+        indexer = BulkIndexer(index, batch_size=2000, workers=2, max_pending_updates=2)
+        documents = ({'id': position, 'title': 'Movie {}'.format(position)} for position in range(10000))
+        stats = indexer.index_documents(documents)
+        assert stats.documents == 10000
+        assert stats.failed_batches == 0
+        assert index.get_stats()['numberOfDocuments'] == 10000
+        index.delete()
@@ -0,0 +1,77 @@
+import asyncio
+import gzip
+import pytest
+import meilisearch
+from meilisearch.capture import SearchRecorder, read_capture
+from meilisearch.errors import MeiliSearchApiError
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestSearchCapture:
+
+    """ TESTS: capture and replay of the searches """
+
+    def setup_class(self):
+        client = meilisearch.Client(BASE_URL, MASTER_KEY)
+        clear_all_indexes(client)
+        index = client.create_index('captureUID', {'primaryKey': 'id'})
+        index.wait_for_pending_update(index.add_documents([
+            {'id': 1, 'title': 'Kung Fu Panda'},
+            {'id': 2, 'title': 'Dragon Ball'},
+        ])['updateId'])
+
+    def teardown_class(self):
+        clear_all_indexes(meilisearch.Client(BASE_URL, MASTER_KEY))
+
+    @staticmethod
+    def test_record_searches(tmp_path):
+        """Tests that the searches and their errors are recorded and read back"""
+        path = str(tmp_path / 'searches.ndjson.gz')
+        with SearchRecorder(path) as recorder:
+            client = meilisearch.Client(BASE_URL, MASTER_KEY, search_recorder=recorder)
+            client.get_index('captureUID').search('panda', {'limit': 5})
+            with pytest.raises(MeiliSearchApiError):
+                client.get_index('unknownCaptureUID').search('panda')
+            client.get_index('captureUID').search('dragon')
+        searches = list(read_capture(path))
+        assert [search['indexUid'] for search in searches] == ['captureUID', 'unknownCaptureUID', 'captureUID']
+        assert searches[0]['body'] == {'q': 'panda', 'limit': 5}
+        assert [search['error'] for search in searches] == [None, 'index_not_found', None]
+        assert all(search['latency'] > 0 for search in searches)
+        assert searches[0]['time'] <= searches[1]['time'] <= searches[2]['time']
+
+    @staticmethod
+    def test_record_async_searches(tmp_path):
+        """Tests that the searches of an AsyncClient are recorded"""
+        path = str(tmp_path / 'searches.ndjson.gz')
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY, search_recorder=recorder) as client:
+                await asyncio.gather(*(client.get_index('captureUID').search(query) for query in ('fu', 'ball')))
+        with SearchRecorder(path) as recorder:
+            asyncio.run(run())
+        assert sorted(search['body']['q'] for search in read_capture(path)) == ['ball', 'fu']
+
+    @staticmethod
+    def test_sample_rate_and_max_records(tmp_path):
+        """Tests that the recording is sampled and stopped after max_records"""
+        path = str(tmp_path / 'searches.ndjson.gz')
+        with SearchRecorder(path, sample_rate=0) as recorder:
+            recorder.record('captureUID', {'q': 'panda'}, 0, 0.01)
+        assert not list(read_capture(path))
+        with SearchRecorder(path, max_records=3) as recorder:
+            for _ in range(10):
+                recorder.record('captureUID', {'q': 'panda'}, 0, 0.01)
+        assert len(list(read_capture(path))) == 3
+
+    @staticmethod
+    def test_read_truncated_capture(tmp_path):
+        """Tests that a capture cut short is read up to its last complete search"""
+        path = str(tmp_path / 'searches.ndjson.gz')
+        with SearchRecorder(path) as recorder:
+            for query in ('panda', 'dragon', 'ball'):
+                recorder.record('captureUID', {'q': query}, 0, 0.01)
+        with gzip.open(path, 'rb') as capture_file:
+            content = capture_file.read()
+        with open(path, 'wb') as capture_file:
+            capture_file.write(gzip.compress(content)[:-30])
+        queries = [search['body']['q'] for search in read_capture(path)]
+        assert queries == ['panda', 'dragon', 'ball'][:len(queries)]
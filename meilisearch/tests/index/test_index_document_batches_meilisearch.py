@@ -0,0 +1,62 @@
+import json
+import meilisearch
+from meilisearch._batching import document_batches, encoded_batches
+from meilisearch.json_codec import JsonCodec
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestDocumentBatches:
+
+    """ TESTS: add and update documents in batches """
+
+    client = meilisearch.Client(BASE_URL, MASTER_KEY)
+    index = None
+    dataset_file = None
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(self.client)
+        self.index = self.client.create_index(uid='indexUID', options={'primaryKey': 'id'})
+        self.dataset_file = open('./datasets/small_movies.json', 'r')
+        self.dataset_json = json.loads(self.dataset_file.read())
+        self.dataset_file.close()
+
+    def teardown_class(self):
+        self.index.delete()
+
+    def test_batches_by_count(self):
+        """Tests splitting documents by number of documents"""
+        batches = list(document_batches(iter(self.dataset_json), batch_size=7))
+        assert [len(batch) for batch in batches[:-1]] == [7] * (len(batches) - 1)
+        assert sum(len(batch) for batch in batches) == len(self.dataset_json)
+
+    def test_encoded_batches(self):
+        """Tests that the encoded batches are the JSON arrays sent, sized exactly"""
+        max_batch_bytes = 4096
+        batches = list(encoded_batches(self.dataset_json, JsonCodec().dumps, max_batch_bytes=max_batch_bytes))
+        assert all(batch.documents == 1 or len(batch) <= max_batch_bytes for batch in batches)
+        assert max(len(batch) for batch in batches) > max_batch_bytes - 512
+        documents = [document for batch in batches for document in json.loads(batch)]
+        assert documents == self.dataset_json
+        assert sum(batch.documents for batch in batches) == len(self.dataset_json)
+
+    def test_add_documents_in_batches(self):
+        """Tests adding documents from a generator in several updates"""
+        documents = (document for document in self.dataset_json)
+        response = self.index.add_documents_in_batches(documents, batch_size=10)
+        assert isinstance(response, list)
+        assert len(response) == (len(self.dataset_json) + 9) // 10
+        for update in response:
+            assert 'updateId' in update
+            assert self.index.wait_for_pending_update(update['updateId'])['status'] == 'processed'
+        assert self.index.get_stats()['numberOfDocuments'] == len(self.dataset_json)
+
+    def test_update_documents_in_batches(self):
+        """Tests updating documents in several updates bounded by size"""
+        documents = [{'id': document['id'], 'title': 'Updated'} for document in self.dataset_json]
+        response = self.index.update_documents_in_batches(documents, max_batch_bytes=512)
+        assert len(response) > 1
+        for update in response:
+            assert self.index.wait_for_pending_update(update['updateId'])['status'] == 'processed'
+        document = self.index.get_document(self.dataset_json[0]['id'])
+        assert document['title'] == 'Updated'
+        assert document['overview'] == self.dataset_json[0]['overview']
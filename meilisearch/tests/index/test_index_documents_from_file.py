@@ -0,0 +1,117 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+import threading
+import pytest
+import meilisearch
+from meilisearch._streaming import iter_json_array
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestDocumentsFromFile:
+
+    """ TESTS: add documents from JSON, NDJSON and CSV files """
+
+    client = meilisearch.Client(BASE_URL, MASTER_KEY)
+    dataset_file = None
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(self.client)
+        self.dataset_file = open('./datasets/small_movies.json', 'r')
+        self.dataset_json = json.loads(self.dataset_file.read())
+        self.dataset_file.close()
+
+    def teardown_class(self):
+        clear_all_indexes(self.client)
+
+    def add_and_wait(self, uid, path, **options):
+        index = self.client.create_index(uid=uid, options={'primaryKey': 'id'})
+        progress = []
+        updates = index.add_documents_from_file(str(path), progress=progress.append, **options)
+        for update in updates:
+            assert index.wait_for_pending_update(update['updateId'])['status'] == 'processed'
+        return index, updates, progress
+
+    def test_add_documents_from_json_file(self):
+        """Tests adding the documents of a JSON array file in batches"""
+        index, updates, progress = self.add_and_wait(
+            'jsonFileUID', './datasets/small_movies.json', batch_size=10
+        )
+        assert len(updates) == (len(self.dataset_json) + 9) // 10
+        assert index.get_stats()['numberOfDocuments'] == len(self.dataset_json)
+        assert progress[-1]['documents'] == len(self.dataset_json)
+        assert progress[-1]['bytes'] > 0
+        assert 'megabytesPerSecond' in progress[-1]
+
+    def test_add_documents_from_gzipped_ndjson_file(self, tmp_path):
+        """Tests adding the documents of a gzipped NDJSON file"""
+        path = tmp_path / 'movies.ndjson.gz'
+        with gzip.open(path, 'wt') as ndjson_file:
+            for document in self.dataset_json:
+                ndjson_file.write(json.dumps(document) + '\n')
+        index, _, _ = self.add_and_wait('ndjsonFileUID', path)
+        assert index.get_stats()['numberOfDocuments'] == len(self.dataset_json)
+
+    def test_add_documents_from_csv_file(self, tmp_path):
+        """Tests adding the documents of a CSV file with typed columns"""
+        path = tmp_path / 'movies.csv'
+        with open(path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['id', 'title', 'release_date:number'])
+            for document in self.dataset_json:
+                writer.writerow([document['id'], document['title'], document['release_date']])
+        index, _, _ = self.add_and_wait('csvFileUID', path, csv_types={'id': str})
+        document = index.get_document(self.dataset_json[0]['id'])
+        assert document['title'] == self.dataset_json[0]['title']
+        assert document['release_date'] == self.dataset_json[0]['release_date']
+
+    def test_csv_number_not_finite(self, tmp_path):
+        """Tests that a number column holding inf or nan raises a clear error"""
+        path = tmp_path / 'prices.csv'
+        with open(path, 'w', newline='') as csv_file:
+            csv_file.write('id,price:number\n1,9.5\n2,inf\n')
+        index = self.client.create_index(uid='priceFileUID', options={'primaryKey': 'id'})
+        with pytest.raises(ValueError, match="'inf' in CSV column 'price'"):
+            index.add_documents_from_file(str(path))
+
+    def test_json_documents_over_chunks(self):
+        """Tests parsing documents split over many chunks, with brackets and escapes in their strings"""
+        documents = self.dataset_json[:5] + [{'id': 'big', 'overview': 'a "}" \\ [{' * 1000}]
+        text_file = io.StringIO(json.dumps(documents))
+        assert list(iter_json_array(text_file, chunk_size=7)) == documents
+
+    def test_add_documents_with_format(self, tmp_path):
+        """Tests adding the documents of a file whose format is not given by its extension"""
+        path = tmp_path / 'movies.feed'
+        with open(path, 'w') as ndjson_file:
+            for document in self.dataset_json:
+                ndjson_file.write(json.dumps(document) + '\n')
+        index, _, _ = self.add_and_wait('formatFileUID', path, format='ndjson')
+        assert index.get_stats()['numberOfDocuments'] == len(self.dataset_json)
+
+    def test_async_add_documents_from_file(self, tmp_path):
+        """Tests that the async client parses the file out of the event loop thread"""
+        path = tmp_path / 'movies.csv'
+        with open(path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['id', 'title'])
+            for document in self.dataset_json:
+                writer.writerow([document['id'], document['title']])
+        parsing_threads = set()
+        def parse_id(value):
+            parsing_threads.add(threading.current_thread())
+            return value
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                index = await client.create_index('asyncCsvFileUID', {'primaryKey': 'id'})
+                updates = await index.add_documents_from_file(
+                    str(path), format='csv', batch_size=10, csv_types={'id': parse_id}
+                )
+                for update in updates:
+                    await index.wait_for_pending_update(update['updateId'])
+                return (await index.get_stats())['numberOfDocuments'], threading.current_thread()
+        count, loop_thread = asyncio.run(run())
+        assert count == len(self.dataset_json)
+        assert parsing_threads and loop_thread not in parsing_threads
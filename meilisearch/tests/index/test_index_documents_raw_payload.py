@@ -0,0 +1,62 @@
+import io
+import json
+import meilisearch
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestRawPayload:
+
+    """ TESTS: add and update documents already serialized to JSON """
+
+    client = meilisearch.Client(BASE_URL, MASTER_KEY)
+    index = None
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(self.client)
+        self.index = self.client.create_index(uid='indexUID', options={'primaryKey': 'id'})
+        with open('./datasets/small_movies.json', 'r') as dataset_file:
+            self.dataset_json = json.loads(dataset_file.read())
+
+    def teardown_class(self):
+        self.index.delete()
+
+    def wait_and_count(self, response):
+        update = self.index.wait_for_pending_update(response['updateId'])
+        assert update['status'] == 'processed'
+        return self.index.get_stats()['numberOfDocuments']
+
+    def test_add_documents_bytes(self):
+        """Tests adding documents from a JSON bytes payload"""
+        payload = json.dumps(self.dataset_json[:10]).encode('utf-8')
+        assert self.wait_and_count(self.index.add_documents(payload)) == 10
+
+    def test_add_documents_str(self):
+        """Tests that a JSON string is sent as is, with non ASCII characters"""
+        payload = json.dumps([{'id': '1000', 'title': 'Amélie'}], ensure_ascii=False)
+        self.wait_and_count(self.index.add_documents(payload))
+        assert self.index.get_document('1000')['title'] == 'Amélie'
+
+    def test_add_documents_memoryview(self):
+        """Tests adding documents from a memoryview, without copying it to bytes"""
+        payload = bytearray(json.dumps(self.dataset_json[10:20]).encode('utf-8'))
+        self.wait_and_count(self.index.add_documents(memoryview(payload)))
+        assert self.index.get_document(self.dataset_json[15]['id'])['title'] == self.dataset_json[15]['title']
+
+    def test_add_documents_file(self):
+        """Tests streaming documents from a binary file object"""
+        with open('./datasets/small_movies.json', 'rb') as dataset_file:
+            count = self.wait_and_count(self.index.add_documents(dataset_file))
+        assert count == len(self.dataset_json) + 1
+
+    def test_update_documents_text_file(self):
+        """Tests streaming a document update from a text file object"""
+        payload = io.StringIO(json.dumps([{'id': '1000', 'title': 'Le Fabuleux Destin d\'Amélie Poulain'}]))
+        self.wait_and_count(self.index.update_documents(payload))
+        assert self.index.get_document('1000')['title'] == 'Le Fabuleux Destin d\'Amélie Poulain'
+
+    def test_str_setting_serialized(self):
+        """Tests that a str body other than documents is serialized to JSON, not sent as is"""
+        response = self.index.update_distinct_attribute('title')
+        self.index.wait_for_pending_update(response['updateId'])
+        assert self.index.get_distinct_attribute() == 'title'
+        self.index.wait_for_pending_update(self.index.reset_distinct_attribute()['updateId'])
@@ -0,0 +1,59 @@
+import gzip
+import io
+import json
+import meilisearch
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestExport:
+
+    """ TESTS: export of all the documents of an index """
+
+    client = meilisearch.Client(BASE_URL, MASTER_KEY)
+    index = None
+    dataset_file = None
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(self.client)
+        self.index = self.client.create_index(uid='indexUID')
+        self.dataset_file = open('./datasets/small_movies.json', 'r')
+        self.dataset_json = json.loads(self.dataset_file.read())
+        self.dataset_file.close()
+        response = self.index.add_documents(self.dataset_json, primary_key='id')
+        self.index.wait_for_pending_update(response['updateId'])
+
+    def teardown_class(self):
+        self.index.delete()
+
+    def test_export_ndjson(self, tmp_path):
+        """Tests exporting the documents to an NDJSON file"""
+        path = tmp_path / 'export.ndjson'
+        progress = []
+        exported = self.index.export(str(path), workers=3, batch_size=7, progress=progress.append)
+        with open(path, 'r') as export_file:
+            documents = [json.loads(line) for line in export_file]
+        assert exported == len(self.dataset_json)
+        assert len(documents) == len(self.dataset_json)
+        assert progress[-1] == len(self.dataset_json)
+        assert progress == sorted(progress)
+
+    def test_export_keeps_index_order(self):
+        """Tests that the concurrent export writes the documents in index order"""
+        output = io.StringIO()
+        self.index.export(output, workers=4, batch_size=3)
+        exported_ids = [json.loads(line)['id'] for line in output.getvalue().splitlines()]
+        assert exported_ids == [document['id'] for document in self.index.iter_documents(prefetch=0)]
+
+    def test_export_json_gzip(self):
+        """Tests exporting the documents as a gzipped JSON array"""
+        output = io.BytesIO()
+        self.index.export(output, format='json', compression='gzip', batch_size=10)
+        documents = json.loads(gzip.decompress(output.getvalue()))
+        assert len(documents) == len(self.dataset_json)
+
+    def test_export_attributes_to_retrieve(self):
+        """Tests exporting a subset of the attributes"""
+        output = io.StringIO()
+        self.index.export(output, attributes_to_retrieve=['id'])
+        for line in output.getvalue().splitlines():
+            assert list(json.loads(line)) == ['id']
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import meilisearch
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestIterDocuments:
+
+    """ TESTS: iterate over all the documents of an index """
+
+    client = meilisearch.Client(BASE_URL, MASTER_KEY)
+    index = None
+    dataset_file = None
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(self.client)
+        self.index = self.client.create_index(uid='indexUID')
+        self.dataset_file = open('./datasets/small_movies.json', 'r')
+        self.dataset_json = json.loads(self.dataset_file.read())
+        self.dataset_file.close()
+        response = self.index.add_documents(self.dataset_json, primary_key='id')
+        self.index.wait_for_pending_update(response['updateId'])
+
+    def teardown_class(self):
+        self.index.delete()
+
+    def test_iter_documents(self):
+        """Tests iterating over all the documents with read-ahead"""
+        documents = list(self.index.iter_documents(batch_size=7, prefetch=2))
+        assert len(documents) == len(self.dataset_json)
+        assert {document['id'] for document in documents} == {document['id'] for document in self.dataset_json}
+
+    def test_iter_documents_without_prefetch(self):
+        """Tests iterating page by page without fetching ahead"""
+        documents = list(self.index.iter_documents(batch_size=len(self.dataset_json), prefetch=0))
+        assert len(documents) == len(self.dataset_json)
+
+    def test_iter_documents_attributes_to_retrieve(self):
+        """Tests iterating over a subset of the attributes"""
+        for document in self.index.iter_documents(batch_size=10, attributes_to_retrieve=['id', 'title']):
+            assert set(document) == {'id', 'title'}
+
+    def test_iter_documents_early_exit(self):
+        """Tests that the iteration can be stopped before the end"""
+        iterator = self.index.iter_documents(batch_size=5, prefetch=3)
+        first_documents = [next(iterator) for _ in range(3)]
+        iterator.close()
+        assert len(first_documents) == 3
+
+    def test_async_iter_documents(self):
+        """Tests iterating over all the documents with the async index"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                index = client.get_index(self.index.uid)
+                return [document async for document in index.iter_documents(batch_size=7, prefetch=2)]
+        assert len(asyncio.run(run())) == len(self.dataset_json)
@@ -0,0 +1,85 @@
+import json
+import time
+import meilisearch
+from meilisearch.search_cache import SearchCache
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestSearchCache:
+
+    """ TESTS: search results cache """
+
+    client = meilisearch.Client(BASE_URL, MASTER_KEY, search_cache=SearchCache(max_entries=3, ttl_in_ms=60000))
+    index = None
+    dataset_file = None
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(self.client)
+        self.index = self.client.create_index(uid='indexUID')
+        self.dataset_file = open('./datasets/small_movies.json', 'r')
+        self.dataset_json = json.loads(self.dataset_file.read())
+        self.dataset_file.close()
+        response = self.index.add_documents(self.dataset_json, primary_key='id')
+        self.index.wait_for_pending_update(response['updateId'])
+
+    def setup_method(self):
+        self.client.config.search_cache.clear()
+
+    def teardown_class(self):
+        self.index.delete()
+
+    def test_search_cache_hit(self):
+        """Tests that an identical search is served from the cache"""
+        cache = self.client.config.search_cache
+        response = self.index.search('Dragon', {'limit': 5, 'offset': 0})
+        cached = self.index.search('Dragon', {'offset': 0, 'limit': 5})
+        assert cached == response
+        assert cache.stats()['misses'] == 1
+        assert cache.stats()['hits'] == 1
+
+    def test_search_cache_returns_copies(self):
+        """Tests that modifying a result does not modify the cached one"""
+        response = self.index.search('Dragon')
+        response['hits'].clear()
+        assert self.index.search('Dragon')['hits'] != []
+
+    def test_search_cache_eviction(self):
+        """Tests that the least recently used search is evicted"""
+        cache = self.client.config.search_cache
+        for query in ['a', 'b', 'c', 'd']:
+            self.index.search(query)
+        assert len(cache) == 3
+        assert cache.stats()['evictions'] == 1
+        self.index.search('a')
+        assert cache.stats()['hits'] == 0
+
+    def test_search_cache_ttl(self):
+        """Tests that an expired entry is not served"""
+        client = meilisearch.Client(BASE_URL, MASTER_KEY, search_cache=SearchCache(ttl_in_ms=10))
+        index = client.get_index(self.index.uid)
+        index.search('Dragon')
+        time.sleep(0.05)
+        index.search('Dragon')
+        assert client.config.search_cache.stats()['expirations'] == 1
+        assert client.config.search_cache.stats()['hits'] == 0
+
+    def test_search_cache_invalidated_by_writes(self):
+        """Tests that a write on the index drops its cached searches"""
+        cache = self.client.config.search_cache
+        self.index.search('Le Petit Prince')
+        assert len(cache) == 1
+        response = self.index.add_documents([{'id': '1', 'title': 'Le Petit Prince'}])
+        assert len(cache) == 0
+        self.index.search('Le Petit Prince')
+        self.index.wait_for_pending_update(response['updateId'])
+        assert len(cache) == 0
+        assert self.index.search('Le Petit Prince')['nbHits'] >= 1
+
+    def test_search_cache_invalidation_is_per_index(self):
+        """Tests that a write on another index keeps the cached searches"""
+        cache = self.client.config.search_cache
+        self.index.search('Dragon')
+        other_index = self.client.create_index(uid='otherIndexUID')
+        other_index.update_stop_words(['the'])
+        assert len(cache) == 1
+        other_index.delete()
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import threading
+import time
+import meilisearch
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+class TestSearchCoalescing:
+
+    """ TESTS: coalescing of identical searches in flight """
+
+    client = meilisearch.Client(BASE_URL, MASTER_KEY, coalesce_searches=True)
+    index = None
+    dataset_file = None
+    dataset_json = None
+
+    def setup_class(self):
+        clear_all_indexes(self.client)
+        self.index = self.client.create_index(uid='indexUID')
+        self.dataset_file = open('./datasets/small_movies.json', 'r')
+        self.dataset_json = json.loads(self.dataset_file.read())
+        self.dataset_file.close()
+        response = self.index.add_documents(self.dataset_json, primary_key='id')
+        self.index.wait_for_pending_update(response['updateId'])
+
+    def teardown_class(self):
+        self.index.delete()
+
+    def test_identical_searches_share_one_request(self):
+        """Tests that concurrent identical searches send a single request"""
+        index = self.client.get_index(self.index.uid)
+        post = index.http.post
+        sent = []
+        def slow_post(path, body=None, timeout=None):
+            sent.append(body)
+            time.sleep(0.2)
+            return post(path, body, timeout)
+        index.http.post = slow_post
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(index.search('Dragon', {'limit': 3})))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(sent) == 1
+        assert len(results) == 10
+        assert all(result == results[0] for result in results)
+        assert self.client.config.search_coalescer.stats()['coalesced'] >= 9
+
+    def test_different_searches_are_not_coalesced(self):
+        """Tests that different searches are sent separately"""
+        index = self.client.get_index(self.index.uid)
+        assert index.search('Dragon') != index.search('Prince')
+
+    def test_searches_are_not_cached(self):
+        """Tests that a search sent after the previous one completed is sent again"""
+        leaders = self.client.config.search_coalescer.stats()['leaders']
+        self.index.search('Dragon')
+        self.index.search('Dragon')
+        assert self.client.config.search_coalescer.stats()['leaders'] == leaders + 2
+
+    def test_async_identical_searches_share_one_request(self):
+        """Tests coalescing with the async index"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY, coalesce_searches=True) as client:
+                index = client.get_index(self.index.uid)
+                results = await asyncio.gather(*(index.search('Dragon') for _ in range(10)))
+                return results, client.config.search_coalescer.stats()
+        results, stats = asyncio.run(run())
+        assert all(result == results[0] for result in results)
+        assert stats['leaders'] == 1
+        assert stats['coalesced'] == 9
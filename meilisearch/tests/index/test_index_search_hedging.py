@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+import meilisearch
+from meilisearch.hedging import HedgePolicy
+from meilisearch.nodes import NodePool
+from meilisearch.tests import MASTER_KEY, FakeNode
+
+SLOW_DELAY = 0.5
+
+def start_node(name, delay):
+    """Node answering searches with its own name, after `delay` seconds"""
+    return FakeNode(lambda method, path: (200, {'hits': [], 'node': name}), delay)
+
+class TestSearchHedging:
+
+    """ TESTS: hedged searches """
+
+    fake_nodes = []
+
+    def setup_class(self):
+        self.fake_nodes = [start_node('slow', SLOW_DELAY), start_node('fast', 0)]
+
+    def teardown_class(self):
+        for node in self.fake_nodes:
+            node.close()
+
+    def node_pool(self):
+        """Nodes where the slow one is always picked first"""
+        urls = [node.url for node in self.fake_nodes]
+        nodes = NodePool(urls, decay_in_ms=10 ** 9)
+        fast = nodes.nodes[1]
+        nodes.finish(fast, nodes.start(fast) - 100, failed=False)
+        return nodes
+
+    def test_hedged_search(self):
+        """Tests that a slow search is hedged to another node, which answers first"""
+        policy = HedgePolicy(delay_in_ms=20, max_extra_load=1.0)
+        client = meilisearch.Client(self.node_pool(), MASTER_KEY, hedge_policy=policy)
+        index = client.get_index('indexUID')
+        start = time.monotonic()
+        assert index.search('')['node'] == 'fast'
+        assert time.monotonic() - start < SLOW_DELAY
+        assert policy.stats()['hedges'] == 1
+        assert policy.stats()['hedgeWins'] == 1
+
+    def test_hedging_budget(self):
+        """Tests that no hedge is sent once the extra load budget is spent"""
+        policy = HedgePolicy(delay_in_ms=20, max_extra_load=0.0)
+        client = meilisearch.Client(self.node_pool(), MASTER_KEY, hedge_policy=policy)
+        index = client.get_index('indexUID')
+        assert index.search('')['node'] == 'fast'
+        assert index.search('')['node'] == 'slow'
+        assert policy.stats()['hedges'] == 1
+        assert policy.stats()['budgetExhausted'] == 1
+
+    def test_threads_stopped_on_close(self):
+        """Tests that closing the client stops the threads of its hedging policy"""
+        def hedging_threads():
+            return [thread for thread in threading.enumerate() if thread.name.startswith('meilisearch-hedging')]
+        before = len(hedging_threads())
+        client = meilisearch.Client(self.node_pool(), MASTER_KEY, hedge_policy=HedgePolicy(delay_in_ms=20))
+        client.get_index('indexUID').search('')
+        assert len(hedging_threads()) > before
+        client.close()
+        deadline = time.monotonic() + SLOW_DELAY * 4
+        while len(hedging_threads()) > before and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(hedging_threads()) == before
+
+    def test_hedging_workers_busy(self):
+        """Tests that no hedge is sent while the threads of the policy are all busy"""
+        policy = HedgePolicy(delay_in_ms=20, max_extra_load=1.0, max_workers=1)
+        client = meilisearch.Client(self.node_pool(), MASTER_KEY, hedge_policy=policy)
+        assert client.get_index('indexUID').search('')['node'] == 'slow'
+        assert policy.stats()['hedges'] == 0
+        assert policy.stats()['saturated'] == 1
+        assert policy.reserve_worker()
+
+    @staticmethod
+    def test_adaptive_delay():
+        """Tests that the hedging delay follows the percentile of the observed latencies"""
+        policy = HedgePolicy(percentile=0.9, min_samples=10, initial_delay_in_ms=50)
+        assert policy.delay() == 0.05
+        for i in range(1, 33):
+            policy.record(i / 1000)
+        assert 0.028 <= policy.delay() <= 0.030
+
+    def test_async_hedged_search(self):
+        """Tests that the async client hedges a slow search and cancels the slower request"""
+        policy = HedgePolicy(delay_in_ms=20, max_extra_load=1.0)
+        async def run():
+            async with meilisearch.AsyncClient(self.node_pool(), MASTER_KEY, hedge_policy=policy) as client:
+                return await client.get_index('indexUID').search('')
+        start = time.monotonic()
+        assert asyncio.run(run())['node'] == 'fast'
+        assert time.monotonic() - start < SLOW_DELAY
+        assert policy.stats()['hedgeWins'] == 1
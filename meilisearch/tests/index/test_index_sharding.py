@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import meilisearch
+from meilisearch.sharding import AsyncShardedIndex, ShardedIndex, merge_search_results, shard_position
+from meilisearch.tests import BASE_URL, MASTER_KEY, clear_all_indexes
+
+SHARD_UIDS = ['shardA', 'shardB', 'shardC']
+
+class TestSharding:
+
+    """ TESTS: ShardedIndex class """
+
+    client = meilisearch.Client(BASE_URL, MASTER_KEY)
+    dataset_json = None
+    sharded = None
+    whole = None
+
+    def setup_class(self):
+        clear_all_indexes(self.client)
+        with open('./datasets/small_movies.json', 'r') as dataset_file:
+            self.dataset_json = json.loads(dataset_file.read())
+        self.sharded = ShardedIndex(
+            [self.client.create_index(uid, {'primaryKey': 'id'}) for uid in SHARD_UIDS],
+            'id'
+        )
+        self.sharded.wait_for_pending_update(self.sharded.add_documents(self.dataset_json))
+        self.whole = self.client.create_index('unshardedUID', {'primaryKey': 'id'})
+        self.whole.wait_for_pending_update(self.whole.add_documents(self.dataset_json)['updateId'])
+
+    def teardown_class(self):
+        self.sharded.close()
+        clear_all_indexes(self.client)
+
+    @staticmethod
+    def test_stable_routing():
+        """Tests that a document id always maps to the same shard"""
+        assert shard_position('166428', 3) == shard_position('166428', 3)
+        assert {shard_position(str(i), 3) for i in range(100)} == {0, 1, 2}
+
+    def test_documents_spread_over_shards(self):
+        """Tests that each document is stored on a single shard"""
+        stats = self.sharded.get_stats()
+        assert stats['numberOfDocuments'] == len(self.dataset_json)
+        assert all(shard_stats['numberOfDocuments'] > 0 for shard_stats in stats['shards'])
+        document = self.dataset_json[0]
+        assert self.sharded.get_document(document['id'])['title'] == document['title']
+
+    def test_search_merges_shards(self):
+        """Tests that a search runs on every shard, and finds the hits of the whole corpus"""
+        results = self.sharded.search('the', {'limit': 50})
+        expected = self.whole.search('the', {'limit': 50})
+        assert results['nbHits'] == expected['nbHits']
+        assert len(results['hits']) == len(expected['hits'])
+        assert {hit['id'] for hit in results['hits']} <= {document['id'] for document in self.dataset_json}
+        assert results['limit'] == 50
+        assert results['query'] == 'the'
+
+    def test_search_pages(self):
+        """Tests that offset and limit apply to the merged hits"""
+        first_page = self.sharded.search('the', {'limit': 10})
+        second_page = self.sharded.search('the', {'offset': 10, 'limit': 10})
+        both = self.sharded.search('the', {'limit': 20})
+        assert first_page['hits'] + second_page['hits'] == both['hits']
+        assert second_page['offset'] == 10
+
+    def test_delete_routed(self):
+        """Tests that a document is deleted from its shard only"""
+        document_id = self.dataset_json[1]['id']
+        updates = self.sharded.delete_document(document_id)
+        assert sum(update is not None for update in updates) == 1
+        self.sharded.wait_for_pending_update(updates)
+        assert self.sharded.get_stats()['numberOfDocuments'] == len(self.dataset_json) - 1
+        self.sharded.wait_for_pending_update(self.sharded.add_documents([self.dataset_json[1]]))
+
+    def test_raw_payload_rejected(self):
+        """Tests that serialized documents, which cannot be routed, are rejected"""
+        with pytest.raises(TypeError):
+            self.sharded.add_documents(json.dumps(self.dataset_json))
+        with pytest.raises(ValueError):
+            self.sharded.add_documents([{'title': 'No id'}])
+
+    def test_concurrent_searches(self):
+        """Tests concurrent searches with fewer threads than shards, one shard being queried by each caller"""
+        sharded = ShardedIndex(self.sharded.shards, 'id', workers=1)
+        with ThreadPoolExecutor(8) as callers:
+            results = list(callers.map(lambda _: sharded.search('the'), range(16)))
+        sharded.close()
+        assert all(result['hits'] == results[0]['hits'] for result in results)
+        assert results[0]['nbHits'] == self.whole.search('the')['nbHits']
+
+    @staticmethod
+    def test_calling_thread_queries_a_shard():
+        """Tests that the last shard is queried from the calling thread"""
+        threads = []
+        def call():
+            threads.append(threading.current_thread())
+        sharded = ShardedIndex([None, None, None], 'id')
+        sharded._scatter([(call,), (call,), (call,)]) # pylint: disable=protected-access
+        sharded.close()
+        assert len(threads) == 3
+        assert threading.current_thread() in threads
+
+    @staticmethod
+    def test_merge_facets():
+        """Tests that the facet counts of the shards are summed"""
+        results = merge_search_results([
+            {'hits': [{'id': 1}, {'id': 2}], 'nbHits': 2, 'facetsDistribution': {'genre': {'comedy': 2}}},
+            {'hits': [{'id': 3}], 'nbHits': 1, 'facetsDistribution': {'genre': {'comedy': 1, 'drama': 1}}},
+        ], offset=1, limit=2)
+        assert results['hits'] == [{'id': 3}, {'id': 2}]
+        assert results['nbHits'] == 3
+        assert results['facetsDistribution'] == {'genre': {'comedy': 3, 'drama': 1}}
+
+    def test_async_sharded_search(self):
+        """Tests the scatter-gather search over AsyncIndex shards"""
+        async def run():
+            async with meilisearch.AsyncClient(BASE_URL, MASTER_KEY) as client:
+                sharded = AsyncShardedIndex([client.get_index(uid) for uid in SHARD_UIDS], 'id')
+                return await sharded.search('the', {'limit': 50}), await sharded.get_stats()
+        results, stats = asyncio.run(run())
+        assert results['nbHits'] == self.whole.search('the', {'limit': 50})['nbHits']
+        assert stats['numberOfDocuments'] == len(self.dataset_json)
@@ -65,3 +65,20 @@ class TestUpdate:
         assert isinstance(wait_update, object)
         assert 'status' in wait_update
         assert wait_update['status'] != 'enqueued'
+
+    def test_wait_for_updates(self):
+        """Tests waiting for several updates at once"""
+        update_ids = [
+            update['updateId']
+            for update in self.index.add_documents_in_batches(self.dataset_json, batch_size=10)
+        ]
+        updates = list(self.index.wait_for_updates(update_ids, timeout_in_ms=10000))
+        assert sorted(update['updateId'] for update in updates) == sorted(update_ids)
+        for update in updates:
+            assert update['status'] in ('processed', 'failed')
+            assert 'duration' in update
+
+    def test_wait_for_updates_timeout(self):
+        """Tests timeout risen by waiting for updates"""
+        with pytest.raises(TimeoutError):
+            list(self.index.wait_for_updates([999999], timeout_in_ms=100))
@@ -7,6 +7,9 @@ setup(
     install_requires=[
         "requests"
     ],
+    extras_require={
+        "async": ["aiohttp"]
+    },
     name="meilisearch",
     version="0.12.4",
     author="Charlotte Vermandel",
@@ -15,19 +18,17 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/meilisearch/meilisearch-python",
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     project_urls={"Documentation": "https://docs.meilisearch.com/",},
     keywords="search python meilisearch",
     platform="any",
     classifiers=[
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.5",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
     include_package_data=True,
-    python_requires=">=3",
+    python_requires=">=3.7",
 )